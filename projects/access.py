@@ -0,0 +1,102 @@
+"""
+Resolución de acceso a proyectos.
+
+Calcula una sola vez qué proyectos puede ver un usuario y con qué rol
+(product owner, scrum master o miembro del equipo). El resultado se guarda en
+el request durante la petición y en la caché entre peticiones; las señales de
+signals.py lo invalidan cuando cambian los miembros, el PO o el SM. La
+invalidación sólo llega a otros procesos si la caché es compartida, por eso
+settings exige CACHE_BACKEND=file fuera de DEBUG.
+
+Mejores prácticas:
+- Una consulta (UNION) en lugar de un JOIN con DISTINCT por página
+- Verificaciones de acceso como búsquedas O(1) en un diccionario
+- Invalidación precisa por usuario afectado
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Value, CharField
+from . import routers
+from .models import Project
+
+ROLE_PRODUCT_OWNER = 'product_owner'
+ROLE_SCRUM_MASTER = 'scrum_master'
+ROLE_TEAM_MEMBER = 'team_member'
+
+MANAGER_ROLES = frozenset({ROLE_PRODUCT_OWNER, ROLE_SCRUM_MASTER})
+
+CACHE_KEY = 'project_access:{user_id}'
+
+
+class ProjectAccess:
+    """Roles de un usuario en cada proyecto visible: {project_id: {roles}}."""
+
+    def __init__(self, roles):
+        self.roles = roles
+
+    @property
+    def project_ids(self):
+        return self.roles.keys()
+
+    def roles_for(self, project_id):
+        return self.roles.get(project_id, frozenset())
+
+    def can_view(self, project_id):
+        return project_id in self.roles
+
+    def can_manage(self, project_id):
+        """Sólo el product owner o el scrum master pueden editar el proyecto."""
+        return bool(self.roles_for(project_id) & MANAGER_ROLES)
+
+
+def _role(name):
+    return Value(name, output_field=CharField())
+
+
+def _role_rows(user_id):
+    """Pares (project_id, rol) del usuario en una única consulta UNION."""
+    memberships = Project.team_members.through.objects.filter(user_id=user_id)
+    owned = Project.objects.filter(product_owner_id=user_id).annotate(role=_role(ROLE_PRODUCT_OWNER))
+    managed = Project.objects.filter(scrum_master_id=user_id).annotate(role=_role(ROLE_SCRUM_MASTER))
+    member = memberships.annotate(role=_role(ROLE_TEAM_MEMBER))
+    return owned.order_by().values_list('pk', 'role').union(
+        managed.order_by().values_list('pk', 'role'),
+        member.order_by().values_list('project_id', 'role'),
+        all=True,
+    )
+
+
+def load_project_roles(user_id):
+    """Roles por proyecto desde la caché o, si no están, desde la base de datos."""
+    key = CACHE_KEY.format(user_id=user_id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = {}
+        # La caché es compartida: se llena desde la primaria, no desde una
+        # réplica que puede estar atrasada
+        with routers.use_primary():
+            for project_id, role in _role_rows(user_id):
+                roles.setdefault(project_id, set()).add(role)
+        roles = {project_id: frozenset(names) for project_id, names in roles.items()}
+        cache.set(key, roles, getattr(settings, 'PROJECT_ACCESS_CACHE_TIMEOUT', 300))
+    return roles
+
+
+def get_project_access(request):
+    """Acceso del usuario del request, resuelto una vez por petición."""
+    access = getattr(request, '_project_access', None)
+    if access is None:
+        if request.user.is_authenticated:
+            access = ProjectAccess(load_project_roles(request.user.pk))
+        else:
+            access = ProjectAccess({})
+        request._project_access = access
+    return access
+
+
+def invalidate_users(user_ids):
+    """Descarta el acceso cacheado de los usuarios indicados."""
+    keys = [CACHE_KEY.format(user_id=user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        cache.delete_many(keys)
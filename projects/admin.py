@@ -1,5 +1,65 @@
-from django.contrib import admin
-from .models import Project, Sprint, UserStory, Task, Comment
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from . import bulk
+from .models import Project, Sprint, UserStory, Task, Comment, SprintSnapshot, Job
+
+
+class BulkActionForm(ActionForm):
+    """
+    Valores de las acciones de edición en bloque (ver bulk.py). Cada acción
+    usa sólo el campo que le corresponde.
+    """
+    value = forms.CharField(
+        label='Valor', required=False,
+        help_text='Id del sprint, estado, prioridad, usuario o estimación según la acción',
+    )
+
+
+class BulkActionsMixin:
+    """
+    Acciones del admin que aplican un cambio a todas las filas seleccionadas
+    con un único UPDATE validado (bulk.update_stories / bulk.update_tasks).
+    """
+    action_form = BulkActionForm
+    bulk_update = None
+
+    def apply_bulk(self, request, queryset, **changes):
+        try:
+            count = self.bulk_update(queryset, **changes)
+        except ValidationError as exc:
+            self.message_user(request, ' '.join(exc.messages), messages.ERROR)
+        else:
+            self.message_user(request, f'{count} filas actualizadas.')
+
+    def action_value(self, request):
+        return request.POST.get('value', '').strip()
+
+    def user_value(self, request):
+        """Id del usuario indicado por nombre; None (sin asignar) si está vacío."""
+        username = self.action_value(request)
+        if not username:
+            return None
+        user_id = User.objects.filter(username=username).values_list('pk', flat=True).first()
+        if user_id is None:
+            raise ValidationError(f'No existe el usuario "{username}".')
+        return user_id
+
+    @admin.action(description='Cambiar estado (valor: estado)', permissions=['change'])
+    def set_status(self, request, queryset):
+        self.apply_bulk(request, queryset, status=self.action_value(request))
+
+    @admin.action(description='Reasignar (valor: usuario; vacío quita la asignación)', permissions=['change'])
+    def reassign(self, request, queryset):
+        try:
+            user_id = self.user_value(request)
+        except ValidationError as exc:
+            self.message_user(request, ' '.join(exc.messages), messages.ERROR)
+            return
+        self.apply_bulk(request, queryset, assigned_to_id=user_id)
 
 
 @admin.register(Project)
@@ -60,14 +120,16 @@ class SprintAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserStory)
-class UserStoryAdmin(admin.ModelAdmin):
+class UserStoryAdmin(BulkActionsMixin, admin.ModelAdmin):
     """
-    Admin personalizado para UserStory.
+    Admin personalizado para UserStory, con acciones de edición en bloque.
     """
     list_display = ['title', 'project', 'sprint', 'priority', 'status', 'story_points', 'assigned_to']
     list_filter = ['status', 'priority', 'project', 'sprint', 'created_at']
     search_fields = ['title', 'description', 'project__name']
     readonly_fields = ['created_at', 'updated_at']
+    actions = ['move_to_sprint', 'set_status', 'set_priority', 'reassign', 're_estimate']
+    bulk_update = staticmethod(bulk.update_stories)
 
     fieldsets = (
         ('Información Básica', {
@@ -88,16 +150,34 @@ class UserStoryAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description='Mover al sprint (valor: id; vacío = Product Backlog)', permissions=['change'])
+    def move_to_sprint(self, request, queryset):
+        value = self.action_value(request)
+        if value and not value.isdigit():
+            self.message_user(request, 'Indique el id numérico del sprint.', messages.ERROR)
+            return
+        self.apply_bulk(request, queryset, sprint_id=int(value) if value else None)
+
+    @admin.action(description='Cambiar prioridad (valor: prioridad)', permissions=['change'])
+    def set_priority(self, request, queryset):
+        self.apply_bulk(request, queryset, priority=self.action_value(request))
+
+    @admin.action(description='Reestimar (valor: puntos; vacío quita la estimación)', permissions=['change'])
+    def re_estimate(self, request, queryset):
+        self.apply_bulk(request, queryset, story_points=self.action_value(request) or None)
+
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(BulkActionsMixin, admin.ModelAdmin):
     """
-    Admin personalizado para Task.
+    Admin personalizado para Task, con acciones de edición en bloque.
     """
     list_display = ['title', 'user_story', 'status', 'estimated_hours', 'actual_hours', 'assigned_to']
     list_filter = ['status', 'user_story__project', 'created_at']
     search_fields = ['title', 'description', 'user_story__title']
     readonly_fields = ['created_at', 'updated_at']
+    actions = ['set_status', 'reassign', 're_estimate']
+    bulk_update = staticmethod(bulk.update_tasks)
 
     fieldsets = (
         ('Información de la Tarea', {
@@ -115,6 +195,10 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description='Reestimar (valor: horas; vacío quita la estimación)', permissions=['change'])
+    def re_estimate(self, request, queryset):
+        self.apply_bulk(request, queryset, estimated_hours=self.action_value(request) or None)
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -141,3 +225,32 @@ class CommentAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(SprintSnapshot)
+class SprintSnapshotAdmin(admin.ModelAdmin):
+    """
+    Admin de solo lectura para los snapshots diarios de sprints.
+    """
+    list_display = ['sprint', 'date', 'story_points_total', 'story_points_done', 'story_done_count', 'story_count']
+    list_filter = ['date', 'sprint__project']
+    list_select_related = ['sprint__project']
+    readonly_fields = [field.name for field in SprintSnapshot._meta.fields]
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Admin de la cola de trabajos en segundo plano (ver jobs.py).
+    """
+    list_display = ['name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['attempts', 'locked_by', 'locked_at', 'result', 'last_error', 'created_at', 'finished_at']
+    actions = ['requeue']
+
+    @admin.action(description='Volver a encolar los trabajos seleccionados')
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status='RUNNING').update(
+            status='QUEUED', attempts=0, locked_by='', locked_at=None, run_at=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f'{count} trabajos encolados.')
@@ -0,0 +1,133 @@
+"""
+Analítica de sprints: burndown, burnup, velocidad y pronóstico.
+
+Los gráficos se construyen a partir de SprintSnapshot (una fila por sprint y
+día, copiada de los contadores desnormalizados de counters.py), por lo que
+leerlos cuesta una consulta acotada por la duración del sprint y no requiere
+recorrer el historial de historias ni tareas.
+
+Mejores prácticas:
+- Snapshots escritos con un único INSERT ... ON CONFLICT por lote
+- Días sin cambios completados con el último valor conocido
+- Pronóstico con regresión lineal de la biblioteca estándar
+"""
+
+import math
+import statistics
+from datetime import timedelta
+
+from django.utils import timezone
+from .models import Sprint, SprintSnapshot
+
+# Sprints completados que se usan para la velocidad promedio
+ROLLING_WINDOW = 3
+# Sprints completados que se leen para la serie de velocidad
+VELOCITY_HISTORY = 10
+
+SNAPSHOT_FIELDS = Sprint.counter_fields
+
+
+# ===== SNAPSHOTS =====
+
+def record_snapshots(sprint_ids, day=None):
+    """
+    Guarda la foto del día de los sprints indicados con sus contadores
+    actuales. Si ya existe la del día, la actualiza.
+    """
+    sprint_ids = [pk for pk in set(sprint_ids) if pk is not None]
+    if not sprint_ids:
+        return 0
+    day = day or timezone.localdate()
+    rows = Sprint.objects.filter(pk__in=sprint_ids).values('pk', *SNAPSHOT_FIELDS)
+    snapshots = [SprintSnapshot(sprint_id=row.pop('pk'), date=day, **row) for row in rows]
+    SprintSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['sprint', 'date'],
+        update_fields=[*SNAPSHOT_FIELDS, 'updated_at'],
+    )
+    return len(snapshots)
+
+
+# ===== BURNDOWN / BURNUP =====
+
+def sprint_progress(sprint, today=None):
+    """
+    Serie diaria del sprint desde su inicio hasta hoy (o su fin):
+    [{'date', 'total', 'done', 'remaining', 'ideal'}].
+    'remaining' es el burndown; 'done' y 'total' el burnup.
+    """
+    today = today or timezone.localdate()
+    last_day = min(sprint.end_date, today)
+    snapshots = list(
+        SprintSnapshot.objects.filter(sprint=sprint, date__lte=last_day).order_by('date')
+    )
+    if not snapshots or last_day < sprint.start_date:
+        return []
+
+    by_date = {snapshot.date: snapshot for snapshot in snapshots}
+    # Punto de partida: el último snapshot previo al inicio o el primero del sprint
+    current = next((s for s in reversed(snapshots) if s.date <= sprint.start_date), snapshots[0])
+    committed = current.story_points_total
+    duration = max((sprint.end_date - sprint.start_date).days, 1)
+
+    series = []
+    day = sprint.start_date
+    while day <= last_day:
+        current = by_date.get(day, current)
+        elapsed = (day - sprint.start_date).days
+        series.append({
+            'date': day,
+            'total': current.story_points_total,
+            'done': current.story_points_done,
+            'remaining': current.story_points_remaining,
+            'ideal': round(committed * (1 - elapsed / duration), 1),
+        })
+        day += timedelta(days=1)
+    return series
+
+
+# ===== VELOCIDAD Y PRONÓSTICO =====
+
+def velocity_series(project):
+    """
+    Velocidad de los últimos sprints completados, en orden cronológico:
+    [(número, puntos)]. Usa la velocidad cargada a mano si existe.
+    """
+    rows = list(project.sprints.filter(status='COMPLETED').order_by('-number').values_list(
+        'number', 'velocity', 'story_points_done'
+    )[:VELOCITY_HISTORY])
+    rows.reverse()
+    return [(number, velocity if velocity is not None else done) for number, velocity, done in rows]
+
+
+def project_velocity(project):
+    """
+    Velocidad promedio móvil, tendencia y pronóstico de sprints restantes
+    para completar el backlog del proyecto.
+    """
+    series = velocity_series(project)
+    points = [value for _, value in series]
+    recent = points[-ROLLING_WINDOW:]
+    average = statistics.fmean(recent) if recent else None
+
+    trend = None
+    next_velocity = average
+    if len(points) >= 2:
+        slope, intercept = statistics.linear_regression(range(len(points)), points)
+        trend = slope
+        next_velocity = max(slope * len(points) + intercept, 0)
+
+    remaining = project.story_points_total - project.story_points_done
+    sprints_left = None
+    if average:
+        sprints_left = math.ceil(remaining / average) if remaining > 0 else 0
+
+    return {
+        'series': series,
+        'average': average,
+        'trend': trend,
+        'next_velocity': next_velocity,
+        'remaining_points': remaining,
+        'sprints_left': sprints_left,
+    }
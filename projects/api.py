@@ -0,0 +1,358 @@
+"""
+API JSON de solo lectura (v1) del módulo de proyectos.
+
+Expone Project, Sprint, UserStory, Task y Comment bajo /api/v1/. Cada recurso
+declara sus campos, sus relaciones y los filtros que acepta; a partir de los
+parámetros de la petición se arma un único queryset:
+
+- ?fields=id,name,status  (sparse fieldset: sólo esas columnas con only())
+- ?expand=product_owner,team_members  (relación a uno -> select_related,
+  relación a muchos -> prefetch_related; sin expandir se devuelven ids)
+- ?limit=50&cursor=...  (paginación por cursor, ver pagination.py)
+- ?project=1&status=DONE  (filtros por igualdad declarados en el recurso)
+
+Las listas se devuelven con StreamingHttpResponse: las filas se leen con
+iterator(chunk_size) y se serializan de a una, así la respuesta nunca se arma
+completa en memoria. El siguiente cursor va al final del documento.
+
+Mejores prácticas:
+- Acceso resuelto una vez por petición (access.py) y aplicado en el queryset
+- Expansiones resueltas con JOIN o prefetch, nunca con consultas por fila
+- Errores de parámetros como JSON 400, sin sesión como JSON 401
+"""
+
+import json
+from functools import wraps
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from .access import get_project_access
+from .models import Project, Sprint, UserStory, Task, Comment
+from .pagination import KeysetPaginator
+
+API_VERSION = 'v1'
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# Filas por lectura del cursor de base de datos (y por lote de prefetch)
+CHUNK_SIZE = 200
+
+ONE, MANY = 'one', 'many'
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class ApiError(Exception):
+    """Parámetro inválido: se responde 400 con el mensaje."""
+
+
+# ===== RECURSOS =====
+
+class Resource:
+    """
+    Descripción de un modelo expuesto por la API.
+
+    fields: columnas escalares publicables.
+    relations: {nombre: (recurso relacionado, ONE | MANY)}.
+    default_fields: campos devueltos si no se pide ?fields= (por defecto todos).
+    filters: {parámetro: lookup} aceptados en las listas.
+    """
+
+    name = None
+    model = None
+    fields = ()
+    relations = {}
+    default_fields = None
+    filters = {}
+    access_lookup = None
+
+    def scope(self, queryset, project_ids):
+        """Restringe el queryset a los proyectos visibles para el usuario."""
+        return queryset.filter(**{f'{self.access_lookup}__in': project_ids})
+
+    # ----- Parámetros -----
+
+    def parse(self, params):
+        """Campos y expansiones pedidos: (campos, {relación: tipo})."""
+        available = set(self.fields) | set(self.relations)
+        requested = _split(params.get('fields')) or list(self.default_fields or (*self.fields, *self.relations))
+        unknown = set(requested) - available
+        if unknown:
+            raise ApiError(f'Campos desconocidos para {self.name}: {", ".join(sorted(unknown))}')
+        expand = _split(params.get('expand'))
+        unknown = set(expand) - set(self.relations)
+        if unknown:
+            raise ApiError(f'Relaciones desconocidas para {self.name}: {", ".join(sorted(unknown))}')
+        # Expandir una relación la incluye aunque no esté en ?fields=
+        fields = list(dict.fromkeys([*requested, *expand]))
+        return fields, set(expand)
+
+    # ----- Queryset -----
+
+    def queryset(self, fields, expand, extra_columns=()):
+        """Queryset con sólo las columnas necesarias y las relaciones resueltas."""
+        meta = self.model._meta
+        columns = {'pk', *extra_columns}
+        select, prefetch = [], []
+        for name in fields:
+            if name not in self.relations:
+                columns.add(name)
+                continue
+            resource, kind = self.relations[name]
+            if kind == ONE:
+                columns.add(name)
+                if name in expand:
+                    select.append(name)
+                    columns.update(f'{name}__{field}' for field in resource.output_fields())
+            else:
+                related = resource.model.objects.order_by(*resource.model._meta.ordering)
+                if name in expand:
+                    related = related.only(*resource.output_fields(), *resource.back_columns(meta, name))
+                else:
+                    related = related.only('pk', *resource.back_columns(meta, name))
+                prefetch.append(Prefetch(name, queryset=related))
+        queryset = self.model.objects.only(*columns)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+    def output_fields(self):
+        """Campos con los que se representa el recurso cuando se expande."""
+        return [name for name in (self.default_fields or self.fields) if name not in self.relations]
+
+    def back_columns(self, parent_meta, relation):
+        """Columna que une una relación a muchos con su padre (para prefetch)."""
+        field = parent_meta.get_field(relation)
+        if field.many_to_many:
+            return ()
+        return (field.field.name,)
+
+    # ----- Serialización -----
+
+    def serialize(self, obj, fields, expand):
+        data = {}
+        for name in fields:
+            if name not in self.relations:
+                data[name] = obj.pk if name == 'id' else getattr(obj, name)
+                continue
+            resource, kind = self.relations[name]
+            if kind == ONE:
+                if name in expand:
+                    related = getattr(obj, name)
+                    data[name] = resource.serialize(related, resource.output_fields(), ()) if related else None
+                else:
+                    data[name] = getattr(obj, self.model._meta.get_field(name).attname)
+            else:
+                related = getattr(obj, name).all()
+                if name in expand:
+                    data[name] = [resource.serialize(item, resource.output_fields(), ()) for item in related]
+                else:
+                    data[name] = [item.pk for item in related]
+        return data
+
+
+class UserResource(Resource):
+    name = 'user'
+    model = User
+    fields = ('id', 'username', 'first_name', 'last_name')
+
+
+class ProjectResource(Resource):
+    name = 'project'
+    model = Project
+    fields = (
+        'id', 'name', 'description', 'status', 'start_date', 'end_date',
+        *Project.counter_fields, 'created_at', 'updated_at',
+    )
+    default_fields = (
+        'id', 'name', 'status', 'start_date', 'end_date', 'product_owner', 'scrum_master',
+        'sprint_count', 'story_count', 'story_done_count', 'updated_at',
+    )
+    filters = {'status': 'status'}
+    access_lookup = 'pk'
+
+
+class SprintResource(Resource):
+    name = 'sprint'
+    model = Sprint
+    fields = (
+        'id', 'name', 'goal', 'number', 'status', 'start_date', 'end_date', 'velocity',
+        *Sprint.counter_fields, 'created_at', 'updated_at',
+    )
+    default_fields = (
+        'id', 'project', 'name', 'number', 'status', 'start_date', 'end_date', 'velocity',
+        'story_count', 'story_points_total', 'story_points_done',
+    )
+    filters = {'project': 'project_id', 'status': 'status'}
+    access_lookup = 'project_id'
+
+
+class UserStoryResource(Resource):
+    name = 'story'
+    model = UserStory
+    fields = (
+        'id', 'title', 'description', 'acceptance_criteria', 'story_points', 'priority', 'status',
+        'created_at', 'updated_at',
+    )
+    default_fields = (
+        'id', 'project', 'sprint', 'title', 'story_points', 'priority', 'status', 'assigned_to', 'updated_at',
+    )
+    filters = {
+        'project': 'project_id', 'sprint': 'sprint_id', 'status': 'status',
+        'priority': 'priority', 'assigned_to': 'assigned_to_id',
+    }
+    access_lookup = 'project_id'
+
+
+class TaskResource(Resource):
+    name = 'task'
+    model = Task
+    fields = (
+        'id', 'title', 'description', 'status', 'estimated_hours', 'actual_hours', 'created_at', 'updated_at',
+    )
+    default_fields = ('id', 'user_story', 'title', 'status', 'estimated_hours', 'actual_hours', 'assigned_to')
+    filters = {'user_story': 'user_story_id', 'status': 'status', 'assigned_to': 'assigned_to_id'}
+    access_lookup = 'user_story__project_id'
+
+
+class CommentResource(Resource):
+    name = 'comment'
+    model = Comment
+    fields = ('id', 'content', 'created_at', 'updated_at')
+    default_fields = ('id', 'user_story', 'author', 'content', 'created_at')
+    filters = {'user_story': 'user_story_id', 'author': 'author_id'}
+    access_lookup = 'user_story__project_id'
+
+
+USERS = UserResource()
+PROJECTS = ProjectResource()
+SPRINTS = SprintResource()
+STORIES = UserStoryResource()
+TASKS = TaskResource()
+COMMENTS = CommentResource()
+
+PROJECTS.relations = {'product_owner': (USERS, ONE), 'scrum_master': (USERS, ONE), 'team_members': (USERS, MANY)}
+SPRINTS.relations = {'project': (PROJECTS, ONE)}
+STORIES.relations = {
+    'project': (PROJECTS, ONE), 'sprint': (SPRINTS, ONE), 'assigned_to': (USERS, ONE),
+    'created_by': (USERS, ONE), 'tasks': (TASKS, MANY), 'comments': (COMMENTS, MANY),
+}
+TASKS.relations = {'user_story': (STORIES, ONE), 'assigned_to': (USERS, ONE)}
+COMMENTS.relations = {'user_story': (STORIES, ONE), 'author': (USERS, ONE)}
+
+RESOURCES = {resource.name: resource for resource in (PROJECTS, SPRINTS, STORIES, TASKS, COMMENTS)}
+
+
+def _split(value):
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def _limit(params):
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError('limit debe ser un número entero')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiError(f'limit debe estar entre 1 y {MAX_LIMIT}')
+    return limit
+
+
+# ===== VISTAS =====
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view):
+    """Sesión obligatoria (401 JSON), sólo GET/HEAD y errores de parámetros como 400."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _error('Autenticación requerida', 401)
+        if request.method not in ('GET', 'HEAD'):
+            return _error('Método no permitido', 405)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as exc:
+            return _error(str(exc), 400)
+    return wrapper
+
+
+def resource_list(resource):
+    @api_view
+    def view(request):
+        """Lista paginada por cursor, con campos, expansiones y filtros."""
+        params = request.GET
+        fields, expand = resource.parse(params)
+        limit = _limit(params)
+        paginator = KeysetPaginator(resource.model.objects.all(), limit)
+        ordering = [name.lstrip('-') for name in paginator.ordering]
+
+        queryset = resource.scope(resource.queryset(fields, expand, ordering), get_project_access(request).project_ids)
+        for param, lookup in resource.filters.items():
+            if param in params:
+                try:
+                    queryset = queryset.filter(**{lookup: params[param]})
+                except (ValueError, ValidationError):
+                    raise ApiError(f'Valor inválido para {param}')
+        paginator.queryset = queryset
+
+        page, _, forward = paginator.page_queryset(params)
+        if not forward:
+            # La API sólo emite cursores hacia adelante
+            raise ApiError('Cursor inválido')
+        response = StreamingHttpResponse(
+            _stream(request, resource, paginator, page.iterator(chunk_size=CHUNK_SIZE), fields, expand),
+            content_type='application/json',
+        )
+        response['X-API-Version'] = API_VERSION
+        return response
+    view.__name__ = f'{resource.name}_list'
+    return view
+
+
+def resource_detail(resource):
+    @api_view
+    def view(request, pk):
+        """Un objeto visible para el usuario, con campos y expansiones."""
+        fields, expand = resource.parse(request.GET)
+        queryset = resource.scope(resource.queryset(fields, expand), get_project_access(request).project_ids)
+        try:
+            obj = queryset.get(pk=pk)
+        except resource.model.DoesNotExist:
+            return _error('No encontrado', 404)
+        response = JsonResponse(
+            resource.serialize(obj, fields, expand),
+            encoder=DjangoJSONEncoder,
+            json_dumps_params={'ensure_ascii': False},
+        )
+        response['X-API-Version'] = API_VERSION
+        return response
+    view.__name__ = f'{resource.name}_detail'
+    return view
+
+
+def _stream(request, resource, paginator, rows, fields, expand):
+    """Documento {"results": [...], "next": url} escrito fila por fila."""
+    yield '{"results":['
+    last = None
+    has_next = False
+    for count, obj in enumerate(rows):
+        if count == paginator.per_page:
+            has_next = True
+            break
+        if count:
+            yield ','
+        yield _encoder.encode(resource.serialize(obj, fields, expand))
+        last = obj
+
+    next_url = None
+    if has_next:
+        query = request.GET.copy()
+        query[paginator.cursor_param] = paginator.encode_cursor(last, 'n')
+        next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+    yield f'],"next":{json.dumps(next_url)}}}'
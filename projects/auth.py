@@ -0,0 +1,92 @@
+"""
+Usuario autenticado cargado desde la caché.
+
+En cada petición AuthenticationMiddleware pide el usuario de la sesión al
+backend de autenticación; ModelBackend.get_user hace una consulta a
+auth_user. CachedModelBackend guarda los campos del usuario en la caché
+compartida y lo reconstruye sin consultar la base.
+
+El hash de la contraseña nunca entra en la caché (la caché de archivos por
+defecto es legible por otros usuarios del servidor). En su lugar se guarda
+get_session_auth_hash() ya calculado (un HMAC con SECRET_KEY), así que la
+verificación del hash de sesión sigue funcionando y cambiar la contraseña
+cierra las otras sesiones igual que antes. En el usuario reconstruido
+password es un campo diferido: check_password o set_password (cambio de
+contraseña) lo leen de la base con una consulta al usarlo, y a partir de ahí
+el hash de sesión se calcula con la contraseña real.
+
+signals.py descarta el usuario cacheado cuando se guarda o se borra (cambio
+de contraseña, desactivación, cambios de staff). Las escrituras con
+queryset.update() no emiten señales: ésas expiran con
+AUTH_USER_CACHE_TIMEOUT.
+
+Junto con SESSION_ENGINE cached_db o signed_cookies, una página se atiende
+sin consultar django_session ni auth_user. La invalidación sólo alcanza a la
+caché en la que se hace: con varios procesos la caché tiene que ser
+compartida, y con CACHE_BACKEND=locmem settings usa ModelBackend
+(AUTH_USER_CACHE=False).
+
+Mejores prácticas:
+- Misma regla de usuario activo que ModelBackend (user_can_authenticate)
+- Invalidación por señal en lugar de un timeout corto
+- Se cachean los campos del usuario, nunca sus permisos ni su contraseña
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+UserModel = get_user_model()
+
+CACHE_KEY = 'auth_user:v2:{user_id}'
+
+# Campos que no salen de la base: se cargan diferidos al usarlos
+UNCACHED_FIELDS = ('password',)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend que lee el usuario de la sesión desde la caché."""
+
+    def get_user(self, user_id):
+        key = CACHE_KEY.format(user_id=user_id)
+        cached = cache.get(key)
+        if cached is None:
+            try:
+                user = UserModel._default_manager.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, _to_cache(user), getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+        else:
+            user = _from_cache(cached)
+        return user if self.user_can_authenticate(user) else None
+
+
+def _to_cache(user):
+    fields = {
+        field.attname: getattr(user, field.attname)
+        for field in UserModel._meta.concrete_fields
+        if field.attname not in UNCACHED_FIELDS
+    }
+    return {'fields': fields, 'session_auth_hash': user.get_session_auth_hash()}
+
+
+def _from_cache(cached):
+    fields = cached['fields']
+    user = UserModel.from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+
+    def get_session_auth_hash():
+        # Con la contraseña ya leída (o cambiada) el hash cacheado no vale
+        if 'password' in user.get_deferred_fields():
+            return cached['session_auth_hash']
+        return UserModel.get_session_auth_hash(user)
+
+    user.get_session_auth_hash = get_session_auth_hash
+    return user
+
+
+def invalidate_user(user_id):
+    """Descarta el usuario cacheado (la próxima petición lo lee de la base)."""
+    if user_id is not None:
+        cache.delete(CACHE_KEY.format(user_id=user_id))
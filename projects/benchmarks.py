@@ -0,0 +1,467 @@
+"""
+Benchmarks de las rutas del módulo de proyectos.
+
+Cada escenario recorre una ruta con nombre de projects/urls.py a través del
+cliente de pruebas de Django y registra tiempo total, cantidad y tiempo de
+consultas SQL y memoria pico. Los resultados se guardan en JSON para poder
+compararlos entre commits (ver el comando `benchmark`).
+
+Mejores prácticas:
+- Un escenario por ruta con nombre (un test verifica que no falte ninguno)
+- Una petición de calentamiento antes de medir
+- La memoria se mide en una corrida aparte para no inflar los tiempos
+"""
+
+import asyncio
+import math
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from . import sqlite
+from .instrumentation import RequestMetrics
+from .models import Project, Sprint, UserStory, Task, Comment
+
+# Parámetros de generate_dataset para cada escala
+SCALES = {
+    'small': {
+        'projects': 2, 'users': 10, 'members': 5, 'sprints': 3,
+        'stories_per_sprint': 10, 'backlog_stories': 10, 'tasks_per_story': 3,
+    },
+    'medium': {
+        'projects': 5, 'users': 40, 'members': 8, 'sprints': 10,
+        'stories_per_sprint': 50, 'backlog_stories': 100, 'tasks_per_story': 4,
+    },
+    'large': {
+        'projects': 10, 'users': 100, 'members': 12, 'sprints': 20,
+        'stories_per_sprint': 200, 'backlog_stories': 1000, 'tasks_per_story': 5,
+    },
+}
+
+# Filas seleccionadas en los escenarios de edición en bloque
+BULK_SIZE = 50
+
+
+class Scenario:
+    """
+    Una ruta a medir: método, URL y datos de POST según el contexto,
+    settings a sobrescribir durante la petición y el status esperado (200
+    para GET; 302 para POST, la redirección tras escribir).
+    """
+
+    def __init__(self, route, url, method='get', data=None, settings=None, status=None):
+        self.route = route
+        self.url = url
+        self.method = method
+        self.data = data
+        self.settings = settings or {}
+        self.status = status or (200 if method == 'get' else 302)
+
+    @property
+    def name(self):
+        return self.route if self.method == 'get' else f'{self.route} [POST]'
+
+    def request(self, client, ctx, iteration):
+        url = self.url(ctx)
+        with override_settings(**self.settings):
+            if self.method == 'get':
+                response = client.get(url)
+            else:
+                response = client.post(url, self.data(ctx, iteration))
+            if response.streaming:
+                # El cliente de pruebas no consume las respuestas en streaming
+                if response.is_async:
+                    async_to_sync(_drain)(response.streaming_content)
+                else:
+                    for _ in response.streaming_content:
+                        pass
+        return response
+
+
+async def _drain(chunks):
+    async for _ in chunks:
+        pass
+
+
+def _project_data(ctx, iteration):
+    project = ctx['project']
+    return {
+        'name': f'Benchmark {iteration}',
+        'description': 'Proyecto creado por el benchmark',
+        'status': 'PLANNING',
+        'start_date': '2024-01-01',
+        'product_owner': project.product_owner_id,
+        'scrum_master': project.scrum_master_id,
+        'team_members': ctx['member_ids'],
+    }
+
+
+def _sprint_data(ctx, iteration):
+    ctx['next_sprint_number'] += 1
+    return {
+        'name': f'Sprint benchmark {iteration}',
+        'number': ctx['next_sprint_number'],
+        'goal': 'Objetivo',
+        'status': 'PLANNED',
+        'start_date': '2024-01-01',
+        'end_date': '2024-01-14',
+    }
+
+
+def _story_data(ctx, iteration):
+    return {
+        'title': f'Historia benchmark {iteration}',
+        'description': 'Como usuario, quiero medir para mejorar',
+        'acceptance_criteria': 'Se mide',
+        'story_points': 3,
+        'priority': 'MEDIUM',
+        'status': 'TODO',
+        'sprint': ctx['sprint'].pk,
+        'assigned_to': ctx['assignee_id'],
+    }
+
+
+def _task_data(ctx, iteration):
+    return {
+        'title': f'Tarea benchmark {iteration}',
+        'description': '',
+        'status': 'TODO',
+        'estimated_hours': '2',
+        'assigned_to': ctx['assignee_id'],
+    }
+
+
+def _import_data(ctx, iteration):
+    rows = ['type,ref,story,title,description,acceptance_criteria,story_points,sprint,estimated_hours']
+    for n in range(20):
+        ref = f'B{iteration}-{n}'
+        rows.append(f'story,{ref},,Importada {ref},Como usuario quiero importar,Se importa,3,,')
+        rows.append(f'task,,{ref},Tarea {ref},,,,,2')
+    content = '\n'.join(rows).encode()
+    return {'format': 'csv', 'file': SimpleUploadedFile('backlog.csv', content, 'text/csv')}
+
+
+def _move_data(ctx, iteration):
+    statuses = ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']
+    return {'story': ctx['story'].pk, 'status': statuses[iteration % len(statuses)]}
+
+
+def _bulk_story_data(ctx, iteration):
+    statuses = ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']
+    return {'stories': ctx['bulk_story_ids'], 'status': statuses[iteration % len(statuses)]}
+
+
+def _bulk_task_data(ctx, iteration):
+    statuses = ['TODO', 'IN_PROGRESS', 'DONE']
+    return {'tasks': ctx['bulk_task_ids'], 'status': statuses[iteration % len(statuses)]}
+
+
+def _reverse(name, key=None):
+    if key is None:
+        return lambda ctx: reverse(name)
+    return lambda ctx: reverse(name, args=[ctx[key].pk])
+
+
+SCENARIOS = [
+    Scenario('dashboard', _reverse('dashboard')),
+    Scenario('project_list', _reverse('project_list')),
+    Scenario('project_detail', _reverse('project_detail', 'project')),
+    Scenario('sprint_list', _reverse('sprint_list', 'project')),
+    Scenario('sprint_detail', _reverse('sprint_detail', 'sprint')),
+    Scenario('sprint_board', _reverse('sprint_board', 'sprint')),
+    Scenario('user_story_list', _reverse('user_story_list', 'project')),
+    Scenario('user_story_detail', _reverse('user_story_detail', 'story')),
+    Scenario('dashboard_async', _reverse('dashboard_async')),
+    Scenario('project_detail_async', _reverse('project_detail_async', 'project')),
+    Scenario('user_story_detail_async', _reverse('user_story_detail_async', 'story')),
+    # Los streams SSE se cierran apenas conectan: se mide el costo de abrirlos
+    Scenario('sprint_events', _reverse('sprint_events', 'sprint'), settings={'EVENT_STREAM_MAX_SECONDS': 0}),
+    Scenario('user_story_events', _reverse('user_story_events', 'story'), settings={'EVENT_STREAM_MAX_SECONDS': 0}),
+    Scenario('search', lambda ctx: reverse('search') + f'?q={ctx["story"].title.split()[0]}'),
+    Scenario('backlog_export', lambda ctx: reverse('backlog_export', args=[ctx['project'].pk]) + '?format=csv'),
+    Scenario('project_create', _reverse('project_create'), 'post', _project_data),
+    Scenario('project_update', _reverse('project_update', 'project'), 'post', _project_data),
+    Scenario('sprint_create', _reverse('sprint_create', 'project'), 'post', _sprint_data),
+    # Respuesta JSON del tablero y página con el reporte de la importación
+    Scenario('sprint_board_move', _reverse('sprint_board_move', 'sprint'), 'post', _move_data, status=200),
+    Scenario('user_story_create', _reverse('user_story_create', 'project'), 'post', _story_data),
+    Scenario('user_story_update', _reverse('user_story_update', 'story'), 'post', _story_data),
+    Scenario('backlog_import', _reverse('backlog_import', 'project'), 'post', _import_data, status=200),
+    Scenario('user_story_bulk_update', _reverse('user_story_bulk_update', 'project'), 'post', _bulk_story_data),
+    Scenario('task_create', _reverse('task_create', 'story'), 'post', _task_data),
+    Scenario('task_update', _reverse('task_update', 'task'), 'post', _task_data),
+    Scenario('task_bulk_update', _reverse('task_bulk_update', 'project'), 'post', _bulk_task_data),
+    Scenario('api_project_list', lambda ctx: reverse('api_project_list') + '?expand=product_owner,team_members'),
+    Scenario('api_project_detail', _reverse('api_project_detail', 'project')),
+    Scenario('api_sprint_list', lambda ctx: reverse('api_sprint_list') + f'?project={ctx["project"].pk}'),
+    Scenario('api_sprint_detail', _reverse('api_sprint_detail', 'sprint')),
+    Scenario('api_story_list', lambda ctx: reverse('api_story_list') + f'?project={ctx["project"].pk}&limit=200'),
+    Scenario('api_story_detail', lambda ctx: reverse('api_story_detail', args=[ctx['story'].pk]) + '?expand=tasks'),
+    Scenario('api_task_list', lambda ctx: reverse('api_task_list') + '?expand=user_story&limit=200'),
+    Scenario('api_task_detail', _reverse('api_task_detail', 'task')),
+    Scenario('api_comment_list', lambda ctx: reverse('api_comment_list') + '?expand=author'),
+    Scenario('api_comment_detail', _reverse('api_comment_detail', 'comment')),
+]
+
+
+def build_context():
+    """Objetos de referencia: el proyecto con más historias y su sprint activo."""
+    project = Project.objects.order_by('-story_count', 'pk').first()
+    if project is None:
+        raise ValueError('No hay datos: ejecute generate_dataset antes del benchmark')
+    # El último sprint con historias: los POST de sprint_create agregan sprints vacíos
+    sprints = project.sprints.order_by('-number')
+    sprint = sprints.filter(story_count__gt=0).first() or sprints.first()
+    story = UserStory.objects.filter(sprint=sprint).order_by('pk').first()
+    member_ids = list(project.team_members.order_by('pk').values_list('pk', flat=True))
+    return {
+        'user': project.product_owner,
+        'project': project,
+        'sprint': sprint,
+        'story': story,
+        'task': Task.objects.filter(user_story=story).order_by('pk').first(),
+        'comment': Comment.objects.filter(user_story__project=project).order_by('pk').first(),
+        'member_ids': member_ids,
+        # Los formularios sólo aceptan asignar a miembros del equipo
+        'assignee_id': member_ids[0] if member_ids else '',
+        # Selección de la edición en bloque: las historias del sprint y sus tareas
+        'bulk_story_ids': list(
+            UserStory.objects.filter(sprint=sprint).order_by('pk').values_list('pk', flat=True)[:BULK_SIZE]
+        ),
+        'bulk_task_ids': list(
+            Task.objects.filter(user_story__sprint=sprint).order_by('pk').values_list('pk', flat=True)[:BULK_SIZE]
+        ),
+        'next_sprint_number': Sprint.objects.filter(project=project).order_by('-number').values_list(
+            'number', flat=True
+        ).first() or 0,
+    }
+
+
+def measure(scenario, client, ctx, repeat):
+    """Mide un escenario: calentamiento, memoria pico y `repeat` corridas."""
+    cache.clear()
+    scenario.request(client, ctx, 0)
+
+    tracemalloc.start()
+    scenario.request(client, ctx, 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall, query_time = [], []
+    for iteration in range(2, repeat + 2):
+        timer = RequestMetrics()
+        with connection.execute_wrapper(timer):
+            started = time.perf_counter()
+            response = scenario.request(client, ctx, iteration)
+            wall.append((time.perf_counter() - started) * 1000)
+        query_time.append(timer.db_seconds * 1000)
+
+    return {
+        'status': response.status_code,
+        'wall_ms': round(statistics.median(wall), 3),
+        'wall_ms_min': round(min(wall), 3),
+        'wall_ms_p95': round(sorted(wall)[math.ceil(len(wall) * 0.95) - 1], 3),
+        'queries': timer.query_count,
+        'query_ms': round(statistics.median(query_time), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run(repeat=10, scenarios=None):
+    """Corre los escenarios sobre los datos actuales de la base."""
+    ctx = build_context()
+    client = Client()
+    client.force_login(ctx['user'])
+    results = {}
+    for scenario in scenarios or SCENARIOS:
+        results[scenario.name] = measure(scenario, client, ctx, repeat)
+    return results
+
+
+# (ruta síncrona, ruta asíncrona, objeto del contexto) comparadas bajo carga
+ASYNC_PAIRS = [
+    ('dashboard', 'dashboard_async', None),
+    ('project_detail', 'project_detail_async', 'project'),
+    ('user_story_detail', 'user_story_detail_async', 'story'),
+]
+
+
+async def _load(client, url, total, concurrency):
+    """`total` GETs a `url` con hasta `concurrency` en vuelo a la vez."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return statuses, latencies, time.perf_counter() - started
+
+
+def run_concurrent(concurrency=8, total=40, pairs=None):
+    """
+    Latencia de las vistas síncronas y asíncronas bajo carga concurrente, a
+    través del handler ASGI de Django (AsyncClient). Las vistas síncronas se
+    ejecutan como en un servidor ASGI: de a una en el hilo de sync_to_async.
+    """
+    ctx = build_context()
+    client = AsyncClient()
+    client.force_login(ctx['user'])
+    results = {}
+    for pair in pairs or ASYNC_PAIRS:
+        key = pair[2]
+        for route in pair[:2]:
+            cache.clear()
+            url = _reverse(route, key)(ctx)
+            # Calentamiento: fragmentos en caché para ambas versiones
+            async_to_sync(_load)(client, url, 1, 1)
+            statuses, latencies, elapsed = async_to_sync(_load)(client, url, total, concurrency)
+            latencies.sort()
+            results[route] = {
+                'status': max(statuses),
+                'concurrency': concurrency,
+                'latency_ms': round(statistics.median(latencies), 3),
+                'latency_ms_p95': round(latencies[math.ceil(len(latencies) * 0.95) - 1], 3),
+                'requests_per_second': round(total / elapsed, 1),
+            }
+    return results
+
+
+# ===== SQLITE: LECTORES Y ESCRITORES CONCURRENTES =====
+
+# Perfiles comparados (settings.DATABASE_PROFILE)
+SQLITE_PROFILES = ('development', 'production')
+
+# Lectura representativa: la página del backlog de un proyecto
+_SQLITE_READ = (
+    'SELECT s.id, s.title, s.status, s.priority, p.name FROM projects_userstory s '
+    'INNER JOIN projects_project p ON p.id = s.project_id WHERE s.project_id = ? '
+    'ORDER BY s.priority DESC, s.created_at DESC, s.id DESC LIMIT 25'
+)
+
+
+def _sqlite_connect(path, profile):
+    """Conexión como la abriría Django con el perfil indicado."""
+    if profile == 'production':
+        conn = sqlite3.connect(
+            path, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False
+        )
+        for statement in sqlite.pragma_statements(settings.SQLITE_PRAGMAS):
+            conn.execute(statement)
+    else:
+        # Valores por defecto de Django: timeout de 5 s y journal DELETE
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    return conn
+
+
+def _sqlite_write(conn, profile, story_id):
+    """Transacción de escritura típica: lee la fila y la actualiza."""
+    conn.execute('BEGIN IMMEDIATE' if profile == 'production' else 'BEGIN')
+    try:
+        conn.execute('SELECT status FROM projects_userstory WHERE id = ?', [story_id]).fetchone()
+        conn.execute('UPDATE projects_userstory SET updated_at = ? WHERE id = ?', [time.time(), story_id])
+        conn.execute('COMMIT')
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+
+
+def _sqlite_worker(path, profile, kind, ids, deadline, stats):
+    conn = _sqlite_connect(path, profile)
+    rng = random.Random()
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if kind == 'read':
+                conn.execute(_SQLITE_READ, [rng.choice(ids)]).fetchall()
+            elif profile == 'production':
+                with sqlite.write_lock:
+                    sqlite.retry_on_busy(_sqlite_write, conn, profile, rng.choice(ids))
+            else:
+                _sqlite_write(conn, profile, rng.choice(ids))
+        except sqlite3.OperationalError as exc:
+            if not sqlite.is_busy(exc):
+                raise
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    conn.close()
+    stats.append((kind, latencies, errors))
+
+
+def run_sqlite_concurrency(readers=4, writers=2, seconds=3.0):
+    """
+    Operaciones por segundo de `readers` hilos lectores y `writers` hilos
+    escritores sobre una copia en disco de la base actual, con la
+    configuración por defecto y con el perfil de producción (WAL, pragmas,
+    BEGIN IMMEDIATE, lock de escritura y reintentos). Cuenta los errores
+    "database is locked" que verían los usuarios.
+    """
+    if connection.vendor != 'sqlite':
+        raise ValueError('El benchmark de concurrencia de SQLite requiere una base SQLite')
+    project_ids = list(Project.objects.values_list('pk', flat=True))
+    story_ids = list(UserStory.objects.values_list('pk', flat=True))
+    if not story_ids:
+        raise ValueError('No hay datos: ejecute generate_dataset antes del benchmark')
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'concurrency.sqlite3')
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+
+        for profile in SQLITE_PROFILES:
+            setup = sqlite3.connect(path, isolation_level=None)
+            setup.execute(f'PRAGMA journal_mode = {"WAL" if profile == "production" else "DELETE"}')
+            setup.close()
+
+            stats = []
+            deadline = time.perf_counter() + seconds
+            threads = [
+                threading.Thread(target=_sqlite_worker, args=(path, profile, kind, ids, deadline, stats))
+                for kind, ids, count in (('read', project_ids, readers), ('write', story_ids, writers))
+                for _ in range(count)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            row = {'readers': readers, 'writers': writers, 'busy_errors': sum(errors for _, _, errors in stats)}
+            for kind in ('read', 'write'):
+                latencies = sorted(ms for name, values, _ in stats if name == kind for ms in values)
+                row[f'{kind}s_per_second'] = round(len(latencies) / seconds, 1)
+                row[f'{kind}_ms_p95'] = (
+                    round(latencies[math.ceil(len(latencies) * 0.95) - 1], 3) if latencies else None
+                )
+            results[profile] = row
+    return results
+
+
+def seed(scale, seed=42):
+    """Vacía la base y genera el dataset de la escala indicada."""
+    call_command('flush', interactive=False, verbosity=0)
+    call_command('generate_dataset', seed=seed, stdout=StringIO(), **SCALES[scale])
@@ -0,0 +1,49 @@
+"""
+Tablero Kanban de un sprint.
+
+Las historias del sprint se cargan con un plan fijo de consultas
+(queries.sprint_board_stories) y se reparten en las columnas de
+UserStory.STATUS_CHOICES en una sola pasada, acumulando puntos y tareas de
+cada columna. Al mover una tarjeta sólo se recargan las dos columnas
+afectadas.
+
+Mejores prácticas:
+- Cantidad de consultas constante (historias + tareas)
+- Agrupación en memoria en O(n), sin una consulta por estado
+- Totales calculados con las filas ya cargadas
+"""
+
+from .models import UserStory
+from . import queries
+
+
+class BoardColumn:
+    """Una columna del tablero: un estado con sus historias y totales."""
+
+    def __init__(self, status, label):
+        self.status = status
+        self.label = label
+        self.stories = []
+        self.points = 0
+
+    def add(self, story):
+        tasks = story.tasks.all()
+        story.task_total = len(tasks)
+        story.task_done = sum(1 for task in tasks if task.status == 'DONE')
+        self.stories.append(story)
+        self.points += story.story_points or 0
+
+
+def load_board(sprint, statuses=None):
+    """
+    Columnas del tablero en el orden de STATUS_CHOICES. Con `statuses` sólo
+    se cargan (y devuelven) esas columnas.
+    """
+    columns = {
+        status: BoardColumn(status, label)
+        for status, label in UserStory.STATUS_CHOICES
+        if statuses is None or status in statuses
+    }
+    for story in queries.sprint_board_stories(sprint, statuses):
+        columns[story.status].add(story)
+    return list(columns.values())
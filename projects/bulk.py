@@ -0,0 +1,167 @@
+"""
+Edición en bloque de historias de usuario y tareas.
+
+Mover historias a un sprint, cambiar estado o prioridad, reasignar o
+reestimar: los cambios se validan una vez y se aplican con un único UPDATE
+sobre todas las filas seleccionadas, en lugar de un save() (con sus
+formularios y señales) por fila. Lo usan la vista de edición en bloque y las
+acciones del admin.
+
+queryset.update() no emite señales, así que este módulo hace lo que harían
+signals.py por cada fila: ajusta los contadores de proyectos y sprints con
+CounterDelta (un UPDATE por padre afectado), guarda los snapshots y publica
+los eventos en vivo. Ninguno de los campos editables está en el índice de
+búsqueda.
+
+Mejores prácticas:
+- Validación de permisos en bloque: una consulta por regla, no por fila
+- Una sola sentencia UPDATE por lote dentro de una transacción
+- Contadores ajustados con deltas, sin recalcular los proyectos completos
+"""
+
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+from . import analytics, counters, events
+from .models import Project, Sprint, UserStory, Task
+
+# Campos que se pueden cambiar en bloque (por attname)
+STORY_FIELDS = ('sprint_id', 'status', 'priority', 'assigned_to_id', 'story_points')
+TASK_FIELDS = ('status', 'assigned_to_id', 'estimated_hours')
+
+# Campos de la historia que cambian su aporte a los snapshots del sprint
+STORY_SNAPSHOT_FIELDS = frozenset({'sprint_id', 'status', 'story_points'})
+
+
+# ===== VALIDACIÓN =====
+
+def _clean_changes(model, changes, allowed):
+    """Valida cada valor con las reglas del campo del modelo (choices, validators)."""
+    unknown = set(changes) - set(allowed)
+    if unknown:
+        raise ValidationError(f'Campos no editables en bloque: {", ".join(sorted(unknown))}.')
+    cleaned = {}
+    for name, value in changes.items():
+        field = model._meta.get_field(name)
+        cleaned[name] = value if field.is_relation else field.clean(value, None)
+    return cleaned
+
+
+def _check_sprint(sprint_id, project_ids):
+    """El sprint destino debe pertenecer al proyecto de todas las historias."""
+    if sprint_id is None:
+        return
+    project_id = Sprint.objects.filter(pk=sprint_id).values_list('project_id', flat=True).first()
+    if project_id is None or set(project_ids) != {project_id}:
+        raise ValidationError('El sprint debe pertenecer al proyecto de todas las historias seleccionadas.')
+
+
+def _check_assignee(user_id, project_ids):
+    """El usuario asignado debe ser miembro del equipo de todos los proyectos."""
+    if user_id is None:
+        return
+    # NOT EXISTS: la base responde con una fila, sin devolver las membresías
+    membership = Project.team_members.through.objects.filter(project_id=OuterRef('pk'), user_id=user_id)
+    if Project.objects.filter(pk__in=project_ids).exclude(Exists(membership)).exists():
+        raise ValidationError('El usuario asignado no es miembro del equipo de todos los proyectos seleccionados.')
+
+
+# ===== HISTORIAS =====
+
+def _story_task_totals(story_ids):
+    """Aporte de las tareas de cada historia: {story_id: Counter}."""
+    rows = Task.objects.filter(user_story_id__in=story_ids).values('user_story_id').order_by().annotate(
+        task_count=Count('pk'),
+        task_done_count=Count('pk', filter=Q(status=counters.TASK_DONE)),
+    )
+    return {row.pop('user_story_id'): Counter(row) for row in rows}
+
+
+def update_stories(stories, **changes):
+    """
+    Aplica `changes` (attname: valor) a las historias del queryset con un solo
+    UPDATE. Lanza ValidationError si algún valor no es válido para alguna de
+    ellas. Devuelve la cantidad de historias actualizadas.
+    """
+    changes = _clean_changes(UserStory, changes, STORY_FIELDS)
+    with transaction.atomic():
+        rows = list(stories.select_for_update().values(
+            'pk', 'project_id', 'sprint_id', 'status', 'story_points'
+        ))
+        if not rows or not changes:
+            return 0
+        project_ids = {row['project_id'] for row in rows}
+        _check_sprint(changes.get('sprint_id'), project_ids)
+        _check_assignee(changes.get('assigned_to_id'), project_ids)
+
+        ids = [row['pk'] for row in rows]
+        UserStory.objects.filter(pk__in=ids).update(updated_at=timezone.now(), **changes)
+
+        moved = 'sprint_id' in changes
+        tasks = _story_task_totals(ids) if moved else {}
+        delta = counters.CounterDelta()
+        sprint_ids = set()
+        for row in rows:
+            new = {**row, **{name: value for name, value in changes.items() if name in row}}
+            old_contribution = counters.story_contribution(row['status'], row['story_points'])
+            new_contribution = counters.story_contribution(new['status'], new['story_points'])
+            delta.add(Project, row['project_id'], old_contribution, sign=-1)
+            delta.add(Sprint, row['sprint_id'], old_contribution, sign=-1)
+            delta.add(Project, row['project_id'], new_contribution)
+            delta.add(Sprint, new['sprint_id'], new_contribution)
+            if moved and row['sprint_id'] != new['sprint_id']:
+                delta.add(Sprint, row['sprint_id'], tasks.get(row['pk'], ()), sign=-1)
+                delta.add(Sprint, new['sprint_id'], tasks.get(row['pk'], ()))
+            sprint_ids.update((row['sprint_id'], new['sprint_id']))
+        delta.apply()
+
+        if STORY_SNAPSHOT_FIELDS & set(changes):
+            analytics.record_snapshots(sprint_ids)
+
+        previous_sprints = {row['pk']: row['sprint_id'] for row in rows}
+        for story in UserStory.objects.filter(pk__in=ids).only('pk', 'sprint', 'title', 'status', 'story_points'):
+            events.story_changed(story, 'saved', previous_sprints[story.pk])
+    return len(rows)
+
+
+# ===== TAREAS =====
+
+def update_tasks(tasks, **changes):
+    """
+    Aplica `changes` (attname: valor) a las tareas del queryset con un solo
+    UPDATE. Lanza ValidationError si algún valor no es válido para alguna de
+    ellas. Devuelve la cantidad de tareas actualizadas.
+    """
+    changes = _clean_changes(Task, changes, TASK_FIELDS)
+    with transaction.atomic():
+        rows = list(tasks.select_for_update(of=('self',)).values(
+            'pk', 'status', project_id=F('user_story__project_id'), sprint_id=F('user_story__sprint_id'),
+        ))
+        if not rows or not changes:
+            return 0
+        _check_assignee(changes.get('assigned_to_id'), {row['project_id'] for row in rows})
+
+        ids = [row['pk'] for row in rows]
+        Task.objects.filter(pk__in=ids).update(updated_at=timezone.now(), **changes)
+
+        delta = counters.CounterDelta()
+        status = changes.get('status')
+        for row in rows:
+            contribution = Counter()
+            if status is not None:
+                contribution.update(counters.task_contribution(status))
+                contribution.subtract(counters.task_contribution(row['status']))
+            delta.add(Project, row['project_id'], contribution)
+            delta.add(Sprint, row['sprint_id'], contribution)
+        delta.apply()
+
+        if status is not None:
+            analytics.record_snapshots(row['sprint_id'] for row in rows)
+
+        sprints = {row['pk']: row['sprint_id'] for row in rows}
+        for task in Task.objects.filter(pk__in=ids).only('pk', 'user_story', 'title', 'status'):
+            events.task_changed(task, 'saved', sprints[task.pk])
+    return len(rows)
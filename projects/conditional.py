@@ -0,0 +1,190 @@
+"""
+GET condicional (ETag / Last-Modified) para las vistas de lectura.
+
+Cada vista declara una función de estado que, con una sola consulta, lee las
+marcas de versión de los objetos de los que depende la página: updated_at y
+content_version de Project/Sprint (que counters.touch() adelanta cuando cambian
+sus historias, tareas o miembros) y máximos/conteos de las filas hijas que no
+tienen versión propia (tareas y comentarios de una historia). Si el cliente ya
+tiene esa versión se responde 304 sin ejecutar la vista ni la plantilla.
+
+Las filas relacionadas que la página muestra también cuentan: el sprint de
+una historia (sprint.updated_at), las historias de las tareas asignadas en el
+dashboard, y los nombres de usuario, que no tienen versión propia:
+signals.py adelanta los proyectos en los que aparece un usuario cuando
+cambia su nombre.
+
+Mejores prácticas:
+- Validadores calculados sin renderizar la página
+- ETag privado: incluye al usuario, su token CSRF y los parámetros de la URL
+- Sin 304 cuando hay mensajes pendientes (la página los mostraría)
+- Cache-Control private, no-cache: el navegador revalida en cada navegación
+"""
+
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Max, Sum, Subquery, Value
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .access import get_project_access
+from .models import Project, Sprint, UserStory, Task, Comment
+
+
+def _scalar(queryset, aggregate):
+    """Subconsulta escalar con un agregado sobre todo el queryset."""
+    return Subquery(
+        queryset.order_by().annotate(_all=Value(1)).values('_all').annotate(value=aggregate).values('value')
+    )
+
+
+def _first(queryset, *fields, **expressions):
+    """Una fila de valores (o None) de un queryset de un solo objeto."""
+    return queryset.values(*fields, **expressions).first()
+
+
+# ===== ESTADO DE CADA PÁGINA =====
+
+def dashboard_state(request):
+    project_ids = sorted(get_project_access(request).project_ids)
+    projects = Project.objects.filter(pk__in=project_ids)
+    return _first(
+        User.objects.filter(pk=request.user.pk),
+        projects_modified=_scalar(projects, Max('updated_at')),
+        projects_version=_scalar(projects, Sum('content_version')),
+        stories_modified=_scalar(UserStory.objects.filter(assigned_to=request.user), Max('updated_at')),
+        story_count=_scalar(UserStory.objects.filter(assigned_to=request.user), Count('pk')),
+        tasks_modified=_scalar(Task.objects.filter(assigned_to=request.user), Max('updated_at')),
+        task_count=_scalar(Task.objects.filter(assigned_to=request.user), Count('pk')),
+        # Título de la historia de cada tarea
+        task_stories_modified=_scalar(
+            UserStory.objects.filter(tasks__assigned_to=request.user), Max('updated_at'),
+        ),
+    ) | {'projects': project_ids}
+
+
+def project_list_state(request):
+    project_ids = sorted(get_project_access(request).project_ids)
+    return Project.objects.filter(pk__in=project_ids).aggregate(
+        modified=Max('updated_at'),
+        version=Sum('content_version'),
+    ) | {'projects': project_ids}
+
+
+def project_state(request, pk=None, project_pk=None):
+    """Páginas que sólo dependen del proyecto: detalle y listas de sprints e historias."""
+    pk = pk or project_pk
+    if not get_project_access(request).can_view(pk):
+        return None
+    return _first(Project.objects.filter(pk=pk), modified=F('updated_at'), version=F('content_version'))
+
+
+def sprint_state(request, pk):
+    state = _first(
+        Sprint.objects.filter(pk=pk),
+        'project_id',
+        modified=F('updated_at'),
+        version=F('content_version'),
+        project_modified=F('project__updated_at'),
+    )
+    if state is None or not get_project_access(request).can_view(state['project_id']):
+        return None
+    # El burndown avanza con el día aunque no haya escrituras
+    state['today'] = datetime.combine(timezone.localdate(), time.min, tzinfo=timezone.get_current_timezone())
+    return state
+
+
+def user_story_state(request, pk):
+    tasks = Task.objects.filter(user_story=pk)
+    comments = Comment.objects.filter(user_story=pk)
+    state = _first(
+        UserStory.objects.filter(pk=pk),
+        'project_id',
+        modified=F('updated_at'),
+        project_modified=F('project__updated_at'),
+        sprint_modified=F('sprint__updated_at'),
+        tasks_modified=_scalar(tasks, Max('updated_at')),
+        task_count=_scalar(tasks, Count('pk')),
+        comments_modified=_scalar(comments, Max('updated_at')),
+        comment_count=_scalar(comments, Count('pk')),
+    )
+    if state is None or not get_project_access(request).can_view(state['project_id']):
+        return None
+    return state
+
+
+# ===== DECORADOR =====
+
+def validators(request, state):
+    """ETag y Last-Modified (timestamp) de una página a partir de su estado."""
+    user = request.user
+    private = [
+        user.pk, user.get_username(), user.is_staff,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+        request.get_full_path(),
+    ]
+    digest = hashlib.md5(repr((private, sorted(state.items()))).encode(), usedforsecurity=False)
+    dates = [value for value in state.values() if isinstance(value, datetime)]
+    return quote_etag(digest.hexdigest()), int(max(dates).timestamp()) if dates else None
+
+
+def _evaluate(request, state_func, args, kwargs):
+    """
+    (etag, last_modified, respuesta 304/412 o None) para la petición, o None
+    si no corresponde un GET condicional.
+    """
+    if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+        return None
+    state = state_func(request, *args, **kwargs)
+    if state is None:
+        return None
+    etag, last_modified = validators(request, state)
+    return etag, last_modified, get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _add_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        if last_modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(state_func):
+    """
+    Responde 304 a GET/HEAD cuando el ETag o Last-Modified del cliente
+    coinciden con el estado actual de la página. Si state_func devuelve None
+    (objeto inexistente o sin acceso) se ejecuta la vista normalmente.
+    Funciona con vistas síncronas y asíncronas (el estado se lee en un hilo).
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                conditional = await sync_to_async(_evaluate)(request, state_func, args, kwargs)
+                if conditional is None:
+                    return await view(request, *args, **kwargs)
+                etag, last_modified, response = conditional
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _add_validators(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            conditional = _evaluate(request, state_func, args, kwargs)
+            if conditional is None:
+                return view(request, *args, **kwargs)
+            etag, last_modified, response = conditional
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _add_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
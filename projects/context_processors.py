@@ -0,0 +1,17 @@
+"""
+Context processors del módulo de proyectos.
+"""
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def fragment_cache(request):
+    """
+    Variables usadas por los bloques {% cache %} de las plantillas:
+    duración configurable y fecha local (los burndown cambian por día).
+    """
+    return {
+        'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+        'today': timezone.localdate(),
+    }
@@ -0,0 +1,184 @@
+"""
+Contadores desnormalizados de Project y Sprint.
+
+Cada historia y cada tarea "aporta" a los contadores de su proyecto y de su
+sprint. Cuando una fila cambia, signals.py resta el aporte anterior y suma el
+nuevo con una sola sentencia UPDATE ... SET campo = campo + delta (F()) por
+padre afectado, así las listas leen números precalculados en lugar de agregar
+en cada petición.
+
+Las operaciones masivas (queryset.update, bulk_create) no disparan señales;
+después de usarlas hay que llamar a rebuild() o al comando rebuild_counters.
+Un save() completo de Project o Sprint no escribe los contadores (ver
+DenormalizedCountersMixin en models.py).
+
+Mejores prácticas:
+- Actualizaciones atómicas con F() sin leer el valor previo
+- Un único lugar que define qué aporta cada fila
+- Reconstrucción y verificación desde los datos reales
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Sum, Q, F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Project, Sprint, UserStory, Task
+
+SPRINT_COUNTERS = Sprint.counter_fields
+PROJECT_COUNTERS = Project.counter_fields
+
+STORY_DONE = 'DONE'
+TASK_DONE = 'DONE'
+
+
+def story_contribution(status, story_points):
+    """Aporte de una historia a los contadores de su proyecto y sprint."""
+    points = story_points or 0
+    done = status == STORY_DONE
+    return Counter({
+        'story_count': 1,
+        'story_done_count': int(done),
+        'story_points_total': points,
+        'story_points_done': points if done else 0,
+    })
+
+
+def task_contribution(status):
+    """Aporte de una tarea a los contadores de su proyecto y sprint."""
+    return Counter({'task_count': 1, 'task_done_count': int(status == TASK_DONE)})
+
+
+def touch(queryset, **changes):
+    """
+    Marca como modificados a los padres del queryset: incrementa
+    content_version y adelanta updated_at, de los que dependen la caché de
+    fragmentos y los validadores de GET condicional (conditional.py).
+    """
+    return queryset.update(content_version=F('content_version') + 1, updated_at=timezone.now(), **changes)
+
+
+class CounterDelta:
+    """Acumula deltas por (modelo, pk) y los aplica con un UPDATE por padre."""
+
+    def __init__(self):
+        self.deltas = {}
+
+    def add(self, model, pk, contribution=(), sign=1):
+        """
+        Suma un aporte al padre. Todo padre agregado, aunque el aporte neto
+        sea cero, queda marcado como modificado (ver touch()).
+        """
+        if pk is None:
+            return
+        delta = self.deltas.setdefault((model, pk), Counter())
+        for name, value in dict(contribution).items():
+            delta[name] += sign * value
+
+    def apply(self):
+        with transaction.atomic():
+            for (model, pk), delta in self.deltas.items():
+                changes = {name: F(name) + value for name, value in delta.items() if value}
+                touch(model.objects.filter(pk=pk), **changes)
+
+
+def story_task_totals(story_id):
+    """Aporte conjunto de las tareas de una historia (al cambiar de sprint)."""
+    totals = Task.objects.filter(user_story_id=story_id).aggregate(
+        task_count=Count('pk'),
+        task_done_count=Count('pk', filter=Q(status=TASK_DONE)),
+    )
+    return Counter(totals)
+
+
+# ===== RECONSTRUCCIÓN =====
+
+def _scoped(queryset, lookup, project_ids):
+    """Restringe el queryset a los proyectos indicados (None = todos)."""
+    if project_ids is None:
+        return queryset
+    return queryset.filter(**{f'{lookup}__in': project_ids})
+
+
+def _story_aggregates(group_field, project_ids=None):
+    stories = _scoped(UserStory.objects.exclude(**{f'{group_field}__isnull': True}), 'project_id', project_ids)
+    return {
+        row[group_field]: row
+        for row in stories.values(group_field).order_by().annotate(
+            story_count=Count('pk'),
+            story_done_count=Count('pk', filter=Q(status=STORY_DONE)),
+            story_points_total=Coalesce(Sum('story_points'), 0),
+            story_points_done=Coalesce(Sum('story_points', filter=Q(status=STORY_DONE)), 0),
+        )
+    }
+
+
+def _task_aggregates(group_field, project_ids=None):
+    lookup = f'user_story__{group_field}'
+    tasks = _scoped(Task.objects.exclude(**{f'{lookup}__isnull': True}), 'user_story__project_id', project_ids)
+    return {
+        row[lookup]: row
+        for row in tasks.values(lookup).order_by().annotate(
+            task_count=Count('pk'),
+            task_done_count=Count('pk', filter=Q(status=TASK_DONE)),
+        )
+    }
+
+
+# (modelo, campo que lo agrupa, contadores, lookup del proyecto)
+_PARENTS = (
+    (Project, 'project', PROJECT_COUNTERS, 'pk'),
+    (Sprint, 'sprint', SPRINT_COUNTERS, 'project_id'),
+)
+
+
+def expected_counters(project_ids=None):
+    """
+    Valores correctos de los contadores (de todos los proyectos o de los
+    indicados y sus sprints), calculados con una consulta agrupada por tipo
+    de agregado: {(modelo, pk): {campo: valor}}.
+    """
+    expected = {}
+    for model, group_field, fields, project_lookup in _PARENTS:
+        stories = _story_aggregates(group_field, project_ids)
+        tasks = _task_aggregates(group_field, project_ids)
+        sprints = {}
+        if model is Project:
+            sprints = dict(
+                _scoped(Sprint.objects, 'project_id', project_ids).values_list('project').order_by().annotate(
+                    total=Count('pk')
+                )
+            )
+        for pk in _scoped(model.objects, project_lookup, project_ids).values_list('pk', flat=True):
+            values = {name: 0 for name in fields}
+            for source in (stories.get(pk, {}), tasks.get(pk, {})):
+                values.update({name: source[name] for name in fields if name in source})
+            if model is Project:
+                values['sprint_count'] = sprints.get(pk, 0)
+            expected[(model, pk)] = values
+    return expected
+
+
+def rebuild(verify_only=False, project_ids=None):
+    """
+    Compara los contadores guardados con los reales y corrige los distintos.
+    Con project_ids se limita a esos proyectos y sus sprints.
+    Devuelve la lista de diferencias [(modelo, pk, campo, guardado, real)].
+    """
+    expected = expected_counters(project_ids)
+    stored = {}
+    for model, _, fields, project_lookup in _PARENTS:
+        for row in _scoped(model.objects, project_lookup, project_ids).values('pk', *fields):
+            stored[(model, row.pop('pk'))] = row
+
+    mismatches = []
+    with transaction.atomic():
+        for (model, pk), values in expected.items():
+            current = stored.get((model, pk), {})
+            changed = {name: value for name, value in values.items() if current.get(name) != value}
+            for name, value in changed.items():
+                mismatches.append((model, pk, name, current.get(name), value))
+            if changed and not verify_only:
+                model.objects.filter(pk=pk).update(**changed)
+    return mismatches
@@ -0,0 +1,220 @@
+"""
+Eventos de cambio en vivo (Server-Sent Events).
+
+Las señales publican un evento compacto por cada save/delete de Sprint,
+UserStory, Task y Comment en los canales de las páginas que lo muestran
+("sprint:<pk>" y "story:<pk>"). Las vistas de stream (ASGI) se suscriben a un
+canal y envían los eventos al navegador, que actualiza sólo los elementos
+afectados (static/js/live.js) en lugar de volver a pedir la página.
+
+El broker es intercambiable (settings.EVENT_BROKER). InProcessBroker reparte
+los eventos dentro del proceso: alcanza con un único proceso ASGI; con varios
+procesos se configura un broker que implemente la misma interfaz sobre un
+servicio compartido (p. ej. Redis pub/sub).
+
+Mejores prácticas:
+- Publicación después del commit (transaction.on_commit)
+- Eventos con los campos que la página muestra, sin HTML
+- Colas acotadas por suscriptor: un cliente lento pierde eventos viejos, no
+  frena a los demás
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# Eventos pendientes por suscriptor antes de descartar los más viejos
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_event_ids = itertools.count(1)
+
+
+# ===== BROKERS =====
+
+class Broker:
+    """Interfaz de un broker de eventos: publicar en canales y suscribirse."""
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        """Subscription sobre `channels`, ligada al event loop en curso."""
+        raise NotImplementedError
+
+
+class Subscription:
+    """Cola de eventos de un cliente; se alimenta desde cualquier hilo."""
+
+    def __init__(self, broker, channels, max_size=SUBSCRIBER_QUEUE_SIZE):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_size)
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # El event loop del cliente ya terminó
+            self.close()
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Siguiente evento, o None si no llega ninguno en `timeout` segundos."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker(Broker):
+    """Pub/sub en memoria para un único proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscribe(self, channels):
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker configurado en settings.EVENT_BROKER (uno por proceso)."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    global _broker
+    if setting == 'EVENT_BROKER':
+        _broker = None
+
+
+# ===== PUBLICACIÓN =====
+
+def sprint_channel(pk):
+    return f'sprint:{pk}'
+
+
+def story_channel(pk):
+    return f'story:{pk}'
+
+
+def publish(channels, event):
+    """Publica `event` en los canales cuando se confirma la transacción."""
+    channels = [channel for channel in channels if channel is not None]
+    if not channels:
+        return
+
+    def send():
+        broker = get_broker()
+        message = {'id': next(_event_ids), **event}
+        for channel in channels:
+            broker.publish(channel, message)
+    transaction.on_commit(send)
+
+
+def sprint_changed(sprint, action):
+    publish([sprint_channel(sprint.pk)], {
+        'model': 'sprint', 'action': action, 'pk': sprint.pk,
+        'name': sprint.name, 'status': sprint.status, 'status_display': sprint.get_status_display(),
+    })
+
+
+def story_changed(story, action, previous_sprint_id=None):
+    sprint_ids = {story.sprint_id, previous_sprint_id} - {None}
+    publish([story_channel(story.pk), *map(sprint_channel, sprint_ids)], {
+        'model': 'story', 'action': action, 'pk': story.pk, 'sprint': story.sprint_id,
+        'title': story.title, 'status': story.status, 'status_display': story.get_status_display(),
+        'story_points': story.story_points,
+    })
+
+
+def task_changed(task, action, sprint_id):
+    publish([story_channel(task.user_story_id), sprint_id and sprint_channel(sprint_id)], {
+        'model': 'task', 'action': action, 'pk': task.pk, 'story': task.user_story_id,
+        'title': task.title, 'status': task.status, 'status_display': task.get_status_display(),
+    })
+
+
+def comment_changed(comment, action, author):
+    publish([story_channel(comment.user_story_id)], {
+        'model': 'comment', 'action': action, 'pk': comment.pk, 'story': comment.user_story_id,
+        'author': author, 'content': comment.content, 'created_at': comment.created_at,
+    })
+
+
+# ===== STREAM =====
+
+def format_event(event):
+    """Un evento en el formato de texto de Server-Sent Events."""
+    data = json.dumps(event, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event["id"]}\nevent: change\ndata: {data}\n\n'
+
+
+async def stream(channels, max_seconds=None, heartbeat=None):
+    """
+    Generador asíncrono de texto SSE para los canales indicados. Envía un
+    comentario de latido cada `heartbeat` segundos y termina a los
+    `max_seconds` (el navegador se reconecta solo).
+    """
+    max_seconds = settings.EVENT_STREAM_MAX_SECONDS if max_seconds is None else max_seconds
+    heartbeat = settings.EVENT_STREAM_HEARTBEAT if heartbeat is None else heartbeat
+    subscription = get_broker().subscribe(channels)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        yield f'retry: {settings.EVENT_STREAM_RETRY_MS}\n: conectado\n\n'
+        while (remaining := deadline - loop.time()) > 0:
+            event = await subscription.get(min(heartbeat, remaining))
+            yield format_event(event) if event is not None else ': ping\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,103 @@
+"""
+Exportación del backlog completo de un proyecto en CSV o NDJSON.
+
+Una sola consulta devuelve cada historia con su sprint, responsable, puntos y
+los conteos de tareas y comentarios (subconsultas correlacionadas, sin JOIN
+que multiplique filas). Las filas se leen con iterator(chunk_size) y se
+escriben de a una, así la memoria es constante sin importar el tamaño del
+proyecto. La usan la vista backlog_export y el comando export_backlog.
+
+En PostgreSQL iterator() lee con un cursor del lado del servidor. El comando
+recorre el backlog dentro de postgres.streaming_reads(); la vista no, porque
+la respuesta en streaming se consume después de que la vista retorna (y bajo
+ASGI desde otro hilo), así que su cursor es WITH HOLD.
+
+Mejores prácticas:
+- values() en lugar de instancias: sin costo de armar modelos
+- Generadores de punta a punta (consulta -> serializador -> respuesta)
+- Columnas declaradas en un único lugar para ambos formatos
+"""
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from .models import UserStory, Task, Comment
+
+# Filas por lectura del cursor de base de datos
+EXPORT_CHUNK_SIZE = 2000
+
+# (columna exportada, campo de values())
+COLUMNS = [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('story_points', 'story_points'),
+    ('sprint_number', 'sprint__number'),
+    ('sprint_name', 'sprint__name'),
+    ('assigned_to', 'assigned_to__username'),
+    ('created_by', 'created_by__username'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('task_count', 'task_count'),
+    ('task_done_count', 'task_done_count'),
+    ('comment_count', 'comment_count'),
+]
+
+
+def _count(queryset, aggregate=Count('pk')):
+    """Conteo correlacionado por historia (0 si no hay filas)."""
+    subquery = queryset.filter(user_story=OuterRef('pk')).order_by().values('user_story').annotate(
+        total=aggregate
+    ).values('total')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+def backlog_rows(project, chunk_size=EXPORT_CHUNK_SIZE):
+    """Historias del proyecto como diccionarios, en el orden del backlog."""
+    queryset = UserStory.objects.filter(project=project).annotate(
+        task_count=_count(Task.objects),
+        task_done_count=_count(Task.objects, Count('pk', filter=Q(status='DONE'))),
+        comment_count=_count(Comment.objects),
+    ).order_by(*UserStory._meta.ordering, 'pk')
+    for row in queryset.values(*(field for _, field in COLUMNS)).iterator(chunk_size=chunk_size):
+        yield {column: row[field] for column, field in COLUMNS}
+
+
+class _Echo:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def to_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _ in COLUMNS])
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row.values()])
+
+
+def to_ndjson(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+# formato -> (content type, serializador)
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', to_csv),
+    'ndjson': ('application/x-ndjson; charset=utf-8', to_ndjson),
+}
+
+
+def export_backlog(project, format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Generador de fragmentos de texto del backlog en el formato pedido."""
+    _, serializer = FORMATS[format]
+    return serializer(backlog_rows(project, chunk_size))
@@ -188,3 +188,141 @@ class CommentForm(forms.ModelForm):
         labels = {
             'content': 'Comentario'
         }
+
+
+class BacklogImportForm(forms.Form):
+    """
+    Formulario para subir un archivo de importación de backlog.
+    """
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON (un objeto JSON por línea)'),
+    ]
+
+    file = forms.FileField(
+        label='Archivo',
+        help_text='Columnas: type (story/task/comment), ref, story, story_id, title, description, '
+                  'acceptance_criteria, story_points, priority, status, sprint, assigned_to, created_by, '
+                  'estimated_hours, actual_hours, author, content',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control'}),
+    )
+    format = forms.ChoiceField(
+        label='Formato',
+        choices=FORMAT_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    dry_run = forms.BooleanField(
+        label='Sólo validar (no importar)',
+        required=False,
+    )
+
+
+def _keep_choices(choices):
+    """Opciones de un campo de edición en bloque, empezando por "sin cambios"."""
+    return [('', 'Sin cambios'), *choices]
+
+
+class BulkForm(forms.Form):
+    """
+    Base de los formularios de edición en bloque (ver bulk.py). Cada campo
+    vacío significa "sin cambios"; NONE quita el sprint o la asignación.
+    Las opciones de sprint y usuario se cargan como pares (id, nombre), sin
+    instanciar modelos.
+    """
+
+    KEEP = ''
+    NONE = 'none'
+
+    # {campo del formulario: attname del modelo}
+    field_map = {}
+
+    def __init__(self, *args, project, **kwargs):
+        self.project = project
+        super().__init__(*args, **kwargs)
+        self.fields['assigned_to'].choices = _keep_choices([
+            (self.NONE, 'Sin asignar'),
+            *project.team_members.order_by('username').values_list('pk', 'username'),
+        ])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not self.errors and not self.changes():
+            raise forms.ValidationError('Indique al menos un cambio.')
+        return cleaned_data
+
+    def changes(self):
+        """Cambios elegidos como {attname: valor} para bulk.update_*."""
+        changes = {}
+        for name, attname in self.field_map.items():
+            value = self.cleaned_data.get(name)
+            if value in (self.KEEP, None):
+                continue
+            if attname.endswith('_id'):
+                value = None if value == self.NONE else int(value)
+            changes[attname] = value
+        return changes
+
+
+class UserStoryBulkForm(BulkForm):
+    """
+    Cambios en bloque sobre historias de un proyecto: sprint, estado,
+    prioridad, asignación y puntos.
+    """
+
+    field_map = {
+        'sprint': 'sprint_id',
+        'status': 'status',
+        'priority': 'priority',
+        'assigned_to': 'assigned_to_id',
+        'story_points': 'story_points',
+    }
+
+    sprint = forms.ChoiceField(label='Mover a', required=False, widget=forms.Select(attrs={'class': 'form-select'}))
+    status = forms.ChoiceField(
+        label='Estado', required=False, choices=_keep_choices(UserStory.STATUS_CHOICES),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    priority = forms.ChoiceField(
+        label='Prioridad', required=False, choices=_keep_choices(UserStory.PRIORITY_CHOICES),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    assigned_to = forms.ChoiceField(
+        label='Asignar a', required=False, widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    story_points = forms.IntegerField(
+        label='Puntos de historia', required=False, min_value=1, max_value=100,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['sprint'].choices = _keep_choices([
+            (self.NONE, 'Product Backlog'),
+            *Sprint.objects.filter(project=self.project).order_by('number').values_list('pk', 'name'),
+        ])
+
+
+class TaskBulkForm(BulkForm):
+    """
+    Cambios en bloque sobre tareas de un proyecto: estado, asignación y
+    horas estimadas.
+    """
+
+    field_map = {
+        'status': 'status',
+        'assigned_to': 'assigned_to_id',
+        'estimated_hours': 'estimated_hours',
+    }
+
+    status = forms.ChoiceField(
+        label='Estado', required=False, choices=_keep_choices(Task.STATUS_CHOICES),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    assigned_to = forms.ChoiceField(
+        label='Asignar a', required=False, widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    estimated_hours = forms.DecimalField(
+        label='Horas estimadas', required=False, min_value=0, max_digits=5, decimal_places=2,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'step': '0.5'}),
+    )
@@ -0,0 +1,357 @@
+"""
+Importación masiva de backlogs (historias, tareas y comentarios) desde CSV o
+NDJSON.
+
+Cada registro indica su tipo en la columna `type` (story, task o comment).
+Las historias pueden llevar una referencia externa `ref` que las tareas y
+comentarios del mismo archivo usan en la columna `story`; para colgarlos de
+una historia ya existente del proyecto se usa `story_id`. Sprints se indican
+por número y usuarios por nombre de usuario.
+
+El archivo se procesa como un pipeline en streaming, por lotes:
+
+1. parse: un registro por fila/línea, sin leer el archivo completo
+2. validación: reglas de UserStoryForm, TaskForm y CommentForm, sin sus
+   campos de relación (que harían una consulta por fila)
+3. resolución: usuarios, sprints e historias existentes con una consulta por
+   tipo y por lote; assigned_to debe ser miembro del equipo, como en los forms
+4. escritura: bulk_create de cada lote dentro de su propia transacción
+
+Al terminar se recalculan los contadores del proyecto (counters.rebuild), los
+snapshots de los sprints afectados y el índice de búsqueda, ya que
+bulk_create no emite señales. Con background=True (la vista web) ese
+recálculo se encola como trabajo refresh_project (jobs.py) y la petición
+sólo adelanta las versiones del proyecto y sus sprints, así las páginas
+cacheadas muestran enseguida las filas importadas.
+
+Mejores prácticas:
+- Memoria acotada por el tamaño de lote, no por el del archivo
+- Errores por fila con número de línea; las filas válidas se importan igual
+- Reporte de filas por segundo
+"""
+
+import csv
+import json
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from . import analytics, counters, jobs, search
+from .forms import UserStoryForm, TaskForm, CommentForm
+from .models import Project, Sprint, UserStory, Task, Comment
+
+BATCH_SIZE = 1000
+# Errores que se conservan con detalle (se cuentan todos)
+MAX_ERRORS = 1000
+
+
+class RowError(Exception):
+    """Registro inválido: se informa con su línea y no se importa."""
+
+
+class ImportReport:
+    """Resultado de una importación: filas leídas, creadas y errores."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = Counter()
+        self.error_count = 0
+        self.errors = []
+        self.elapsed = 0.0
+        # Job del recálculo cuando se encoló (BacklogImporter con background)
+        self.refresh_job = None
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def created_counts(self):
+        """[(modelo, filas creadas)] para las plantillas (Counter no se itera ahí)."""
+        return list(self.created.items())
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+# ===== PARSERS =====
+
+def parse_csv(lines):
+    """(línea, registro) por fila; la primera fila es el encabezado."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, {key.strip(): value or '' for key, value in row.items() if key}
+
+
+def parse_ndjson(lines):
+    """(línea, registro) por línea no vacía; None si no es un objeto JSON."""
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            yield line, None
+            continue
+        yield line, {key: '' if value is None else value for key, value in record.items()}
+
+
+PARSERS = {'csv': parse_csv, 'ndjson': parse_ndjson}
+
+
+def _batches(records, size):
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def _text(record, name):
+    return str(record.get(name, '')).strip()
+
+
+# ===== VALIDACIÓN =====
+
+def _form_defaults(form_class):
+    """Valores por defecto del modelo para los campos que el archivo puede omitir."""
+    model = form_class._meta.model
+    return {
+        name: model._meta.get_field(name).get_default()
+        for name in form_class._meta.fields
+        if model._meta.get_field(name).has_default()
+    }
+
+
+class _Validator:
+    """
+    Valida registros con las reglas de un ModelForm, sin sus relaciones.
+
+    El form se construye una sola vez y se reutiliza para cada registro: la
+    copia profunda de los campos que hace Form.__init__ era el costo dominante
+    de la importación. Antes de cada registro se reinician los datos, los
+    errores y la instancia.
+    """
+
+    def __init__(self, form_class, relations):
+        self.defaults = _form_defaults(form_class)
+        self.form = form_class(data={})
+        for name in relations:
+            del self.form.fields[name]
+
+    def instance(self, record):
+        form = self.form
+        form.data = {**self.defaults, **{key: value for key, value in record.items() if value != ''}}
+        form.instance = form._meta.model()
+        form._errors = None
+        form._bound_fields_cache = {}
+        if not form.is_valid():
+            raise RowError('; '.join(
+                f'{field}: {" ".join(messages)}' for field, messages in form.errors.items()
+            ))
+        return form.save(commit=False)
+
+
+# ===== IMPORTADOR =====
+
+class BacklogImporter:
+    """
+    Importa registros (línea, dict) en un proyecto. `user` es el autor por
+    defecto de historias y comentarios. Con dry_run sólo valida.
+    """
+
+    def __init__(self, project, user, batch_size=BATCH_SIZE, dry_run=False, background=False):
+        self.project = project
+        self.user = user
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.background = background
+        self.report = ImportReport()
+        self.members = dict(project.team_members.values_list('username', 'pk'))
+        self.refs = {}
+        self.sprint_ids = set()
+        self.existing_story_ids = set()
+        self.validators = {
+            'story': _Validator(UserStoryForm, ('sprint', 'assigned_to')),
+            'task': _Validator(TaskForm, ('assigned_to',)),
+            'comment': _Validator(CommentForm, ()),
+        }
+
+    def run(self, records):
+        started = time.perf_counter()
+        try:
+            for batch in _batches(records, self.batch_size):
+                self.import_batch(batch)
+        finally:
+            # Cada lote ya confirmó su transacción: si el archivo falla a mitad
+            # (bytes que no son UTF-8, p. ej.) lo importado igual se recalcula
+            if sum(self.report.created.values()) and not self.dry_run:
+                self.refresh_project()
+            self.report.elapsed = time.perf_counter() - started
+        return self.report
+
+    # ----- Lote -----
+
+    def import_batch(self, batch):
+        self.report.rows += len(batch)
+        lookups = self.resolve(record for _, record in batch if record is not None)
+        rows = {'story': [], 'task': [], 'comment': []}
+        builders = {'story': self.build_story, 'task': self.build_task, 'comment': self.build_comment}
+
+        for line, record in batch:
+            if record is None:
+                self.report.add_error(line, 'JSON inválido: se esperaba un objeto por línea')
+                continue
+            kind = _text(record, 'type') or 'story'
+            if kind not in builders:
+                self.report.add_error(line, f'type: tipo desconocido "{kind}"')
+                continue
+            try:
+                rows[kind].append((line, record, builders[kind](record, lookups)))
+            except RowError as exc:
+                self.report.add_error(line, str(exc))
+
+        with transaction.atomic():
+            self.save_stories(rows['story'])
+            for kind, model in (('task', Task), ('comment', Comment)):
+                children = [obj for line, record, obj in rows[kind] if self.attach(line, record, obj)]
+                if not self.dry_run:
+                    model.objects.bulk_create(children)
+                self.report.created[model.__name__] += len(children)
+
+    def resolve(self, records):
+        """Usuarios, sprints e historias existentes del lote: una consulta por tipo."""
+        usernames, numbers, story_ids = set(), set(), set()
+        for record in records:
+            usernames.update(filter(None, (_text(record, 'created_by'), _text(record, 'author'))))
+            if _text(record, 'sprint').isdigit():
+                numbers.add(int(_text(record, 'sprint')))
+            if _text(record, 'story_id').isdigit():
+                story_ids.add(int(_text(record, 'story_id')))
+        return {
+            'users': dict(User.objects.filter(username__in=usernames).values_list('username', 'pk')),
+            'sprints': dict(
+                Sprint.objects.filter(project=self.project, number__in=numbers).values_list('number', 'pk')
+            ),
+            'stories': set(
+                UserStory.objects.filter(project=self.project, pk__in=story_ids).values_list('pk', flat=True)
+            ),
+        }
+
+    # ----- Construcción de filas -----
+
+    def member(self, record, name='assigned_to'):
+        username = _text(record, name)
+        if not username:
+            return None
+        if username not in self.members:
+            raise RowError(f'{name}: "{username}" no es miembro del equipo')
+        return self.members[username]
+
+    def author(self, record, name, lookups):
+        username = _text(record, name)
+        if not username:
+            return self.user.pk
+        if username not in lookups['users']:
+            raise RowError(f'{name}: no existe el usuario "{username}"')
+        return lookups['users'][username]
+
+    def build_story(self, record, lookups):
+        story = self.validators['story'].instance(record)
+        story.project_id = self.project.pk
+        story.assigned_to_id = self.member(record)
+        story.created_by_id = self.author(record, 'created_by', lookups)
+        number = _text(record, 'sprint')
+        if number:
+            if not number.isdigit() or int(number) not in lookups['sprints']:
+                raise RowError(f'sprint: no existe el sprint {number} en el proyecto')
+            story.sprint_id = lookups['sprints'][int(number)]
+        ref = _text(record, 'ref')
+        if ref:
+            if ref in self.refs:
+                raise RowError(f'ref: referencia duplicada "{ref}"')
+            # Se reserva ya para detectar duplicados dentro del mismo lote
+            self.refs[ref] = None
+        return story
+
+    def build_task(self, record, lookups):
+        task = self.validators['task'].instance(record)
+        task.assigned_to_id = self.member(record)
+        task.user_story_id = self.existing_story(record, lookups)
+        return task
+
+    def build_comment(self, record, lookups):
+        comment = self.validators['comment'].instance(record)
+        comment.author_id = self.author(record, 'author', lookups)
+        comment.user_story_id = self.existing_story(record, lookups)
+        return comment
+
+    def existing_story(self, record, lookups):
+        story_id = _text(record, 'story_id')
+        if not story_id:
+            if not _text(record, 'story'):
+                raise RowError('story: indique la referencia (story) o el id (story_id) de la historia')
+            return None
+        if not story_id.isdigit() or int(story_id) not in lookups['stories']:
+            raise RowError(f'story_id: no existe la historia {story_id} en el proyecto')
+        self.existing_story_ids.add(int(story_id))
+        return int(story_id)
+
+    # ----- Escritura -----
+
+    def save_stories(self, rows):
+        stories = [obj for _, _, obj in rows]
+        if not self.dry_run:
+            UserStory.objects.bulk_create(stories)
+        for _, record, story in rows:
+            ref = _text(record, 'ref')
+            if ref:
+                self.refs[ref] = story.pk
+            self.sprint_ids.add(story.sprint_id)
+        self.report.created['UserStory'] += len(stories)
+
+    def attach(self, line, record, obj):
+        """Resuelve la referencia a una historia importada; False si no existe."""
+        if obj.user_story_id is not None:
+            return True
+        ref = _text(record, 'story')
+        if ref not in self.refs:
+            self.report.add_error(line, f'story: no hay una historia importada con ref "{ref}"')
+            return False
+        obj.user_story_id = self.refs[ref]
+        return True
+
+    def refresh_project(self):
+        """Recalcula (o encola) lo derivado de los sprints tocados por la importación."""
+        sprint_ids = set(self.sprint_ids)
+        sprint_ids.update(
+            UserStory.objects.filter(pk__in=self.existing_story_ids).values_list('sprint_id', flat=True)
+        )
+        sprint_ids.discard(None)
+        if self.background:
+            touch_project(self.project.pk, sprint_ids)
+            self.report.refresh_job = jobs.enqueue(
+                'refresh_project', priority=10, project=self.project.pk, sprint_ids=sorted(sprint_ids),
+            )
+        else:
+            refresh_project(self.project.pk, sprint_ids)
+
+
+# ===== RECÁLCULO =====
+
+def touch_project(project_id, sprint_ids):
+    """Adelanta content_version del proyecto y sus sprints (invalida las páginas cacheadas)."""
+    counters.touch(Project.objects.filter(pk=project_id))
+    counters.touch(Sprint.objects.filter(pk__in=sprint_ids))
+
+
+def refresh_project(project_id, sprint_ids):
+    """Contadores, versiones, snapshots e índice: bulk_create no emite señales."""
+    counters.rebuild(project_ids=[project_id])
+    touch_project(project_id, sprint_ids)
+    analytics.record_snapshots(sprint_ids)
+    search.rebuild_index(project_ids=[project_id])
@@ -0,0 +1,81 @@
+"""
+Instrumentación de peticiones: consultas SQL y tiempo de plantillas.
+
+RequestMetrics se instala como execute_wrapper de las conexiones mientras dura
+una petición (ver middleware.py) y acumula cantidad y tiempo de consultas,
+huellas de consultas repetidas (típico N+1) y la sentencia más lenta. El
+tiempo de render de plantillas se mide envolviendo una sola vez el render de
+nivel superior del backend de plantillas de Django.
+
+Mejores prácticas:
+- Sin dependencias externas ni profiler adjunto
+- Huella de SQL con los parámetros ya separados por Django
+- Estado por petición en un ContextVar (seguro con hilos y async)
+"""
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.template.backends.django import Template as DjangoTemplate
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+# "IN (%s, %s, %s)" -> "IN (...)" para que listas de distinto largo coincidan
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)*\s*%s\s*\)')
+
+
+def fingerprint(sql):
+    """Forma normalizada de una sentencia para agrupar consultas repetidas."""
+    return _PLACEHOLDER_LIST.sub('(...)', ' '.join(sql.split()))
+
+
+class RequestMetrics:
+    """Métricas de una petición; también funciona como execute_wrapper."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.fingerprints = Counter()
+        self.slowest_seconds = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.db_seconds += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            if elapsed > self.slowest_seconds:
+                self.slowest_seconds = elapsed
+                self.slowest_sql = sql
+
+    def duplicates(self):
+        """Huellas ejecutadas más de una vez, de la más repetida a la menos."""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+def _timed_render(render):
+    def wrapper(self, *args, **kwargs):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return render(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            metrics.template_seconds += time.perf_counter() - started
+    wrapper.instrumented = True
+    return wrapper
+
+
+def install_template_timing():
+    """Envuelve Template.render del backend de Django (una sola vez)."""
+    if not getattr(DjangoTemplate.render, 'instrumented', False):
+        DjangoTemplate.render = _timed_render(DjangoTemplate.render)
@@ -0,0 +1,232 @@
+"""
+Cola de trabajos en segundo plano respaldada por la base de datos.
+
+Las operaciones costosas (generar datos, exportar, recalcular agregados) se
+encolan con enqueue() y las ejecuta `manage.py runworker`, así la petición
+web o el comando que las pide no se bloquea. Cada trabajo es una función
+registrada con @register(nombre) que recibe los kwargs guardados en Job y
+devuelve un resultado serializable en JSON.
+
+Toma de trabajos (claim):
+- PostgreSQL/MySQL/Oracle: SELECT ... FOR UPDATE SKIP LOCKED, así varios
+  workers toman trabajos distintos sin esperarse
+- SQLite: un UPDATE atómico sobre los ids listos (la base serializa las
+  escrituras)
+
+En ambos casos locked_by guarda un token único de la toma (worker + azar).
+
+Mejores prácticas:
+- Prioridad y fecha de ejecución en un índice parcial de trabajos en cola
+- Reintentos con espera exponencial; el error queda guardado en el trabajo
+- Trabajos de un worker caído se devuelven a la cola (requeue_stale)
+
+Mientras un trabajo corre, un hilo de latido renueva locked_at cada
+JOB_HEARTBEAT_INTERVAL segundos: sólo los trabajos de un worker caído dejan
+de renovarlo y superan JOB_LOCK_TIMEOUT; los workers vivos los devuelven a
+la cola en cada vuelta de su ciclo (a lo sumo una vez por intervalo). Si aun
+así el trabajo se devolvió a la cola y se volvió a tomar (aunque sea el
+mismo worker), el resultado de la corrida anterior se descarta: cada UPDATE
+final exige que locked_by siga siendo el token de la toma que lo corrió.
+"""
+
+import os
+import socket
+import threading
+import traceback
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from . import analytics, counters, imports, search, sqlite
+from .models import Job, Project
+
+# Segundos de espera antes del reintento n: RETRY_BASE_SECONDS * 2 ** (n - 1)
+RETRY_BASE_SECONDS = 30
+
+_registry = {}
+
+
+class UnknownJob(Exception):
+    """No hay ninguna función registrada con ese nombre."""
+
+
+def register(name):
+    """Registra una función como trabajo en segundo plano."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def registered():
+    return sorted(_registry)
+
+
+def enqueue(name, priority=0, max_attempts=3, run_at=None, **kwargs):
+    """Encola el trabajo `name` con sus kwargs y devuelve el Job creado."""
+    if name not in _registry:
+        raise UnknownJob(name)
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ===== TOMA DE TRABAJOS =====
+
+def _ready():
+    return Job.objects.filter(status='QUEUED', run_at__lte=timezone.now()).order_by('-priority', 'run_at', 'id')
+
+
+def claim(worker, limit=1):
+    """Marca como RUNNING hasta `limit` trabajos listos y los devuelve."""
+    now = timezone.now()
+    # Token único por toma: si el trabajo vuelve a la cola y este mismo worker
+    # lo toma de nuevo, la corrida anterior ya no pasa el control de _locked()
+    token = f'{worker}:{uuid.uuid4().hex[:8]}'
+    changes = {'status': 'RUNNING', 'locked_by': token, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(_ready().select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**changes)
+    else:
+        # Sin SKIP LOCKED: la condición status='QUEUED' dentro del mismo UPDATE
+        # evita que dos workers tomen el mismo trabajo; si la base está ocupada
+        # por otro worker se reintenta
+        def claim_by_update():
+            ids = list(_ready().values_list('pk', flat=True)[:limit])
+            Job.objects.filter(pk__in=ids, status='QUEUED').update(**changes)
+
+        sqlite.retry_on_busy(claim_by_update)
+    return list(Job.objects.filter(locked_by=token, status='RUNNING').order_by('-priority', 'run_at', 'id'))
+
+
+def requeue_stale(timeout=None):
+    """Devuelve a la cola los trabajos RUNNING sin latido hace más de `timeout` segundos."""
+    timeout = settings.JOB_LOCK_TIMEOUT if timeout is None else timeout
+    limit = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status='RUNNING', locked_at__lt=limit).update(
+        status='QUEUED', locked_by='', locked_at=None,
+    )
+
+
+# ===== EJECUCIÓN =====
+
+def _locked(job):
+    """El trabajo mientras siga tomado por el worker que lo corre."""
+    return Job.objects.filter(pk=job.pk, status='RUNNING', locked_by=job.locked_by)
+
+
+def heartbeat(job):
+    """Renueva locked_at; 0 si el trabajo ya no pertenece a este worker."""
+    return _locked(job).update(locked_at=timezone.now())
+
+
+class _Heartbeat(threading.Thread):
+    """Hilo que llama a heartbeat() mientras el trabajo corre."""
+
+    def __init__(self, job):
+        super().__init__(name=f'heartbeat-{job.pk}', daemon=True)
+        self.job = job
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                heartbeat(self.job)
+        finally:
+            # Conexión propia del hilo
+            connections.close_all()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.join()
+
+
+def run(job):
+    """Ejecuta un trabajo tomado y registra el resultado o el error."""
+    try:
+        func = _registry.get(job.name)
+        if func is None:
+            raise UnknownJob(job.name)
+        with _Heartbeat(job):
+            result = func(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            _locked(job).update(
+                status='QUEUED', locked_by='', locked_at=None, last_error=error,
+                run_at=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            _locked(job).update(status='FAILED', last_error=error, finished_at=timezone.now())
+        return False
+
+    _locked(job).update(status='DONE', result=result, finished_at=timezone.now())
+    return True
+
+
+def run_by_id(job_id):
+    """Punto de entrada de los procesos del pool: el trabajo ya está tomado."""
+    job = Job.objects.filter(pk=job_id, status='RUNNING').first()
+    return run(job) if job is not None else False
+
+
+# ===== TRABAJOS =====
+
+@register('rebuild_counters')
+def rebuild_counters(project_ids=None):
+    return {'mismatches': len(counters.rebuild(project_ids=project_ids))}
+
+
+@register('rebuild_search_index')
+def rebuild_search_index(project_ids=None):
+    search.rebuild_index(project_ids=project_ids)
+    return None
+
+
+@register('record_snapshots')
+def record_snapshots(sprint_ids):
+    return {'snapshots': analytics.record_snapshots(sprint_ids)}
+
+
+@register('refresh_project')
+def refresh_project(project, sprint_ids):
+    """Recálculo posterior a una importación desde la web (imports.py)."""
+    imports.refresh_project(project, sprint_ids)
+    return None
+
+
+@register('generate_dataset')
+def generate_dataset(**options):
+    call_command('generate_dataset', stdout=StringIO(), **options)
+    return None
+
+
+@register('export_backlog')
+def export_backlog(project, format='csv'):
+    """Exporta el backlog a JOB_OUTPUT_DIR y devuelve la ruta del archivo."""
+    project = Project.objects.get(pk=project)
+    os.makedirs(settings.JOB_OUTPUT_DIR, exist_ok=True)
+    name = f'backlog-{project.pk}-{timezone.now():%Y%m%d%H%M%S}.{format}'
+    path = os.path.join(settings.JOB_OUTPUT_DIR, name)
+    call_command('export_backlog', project.pk, format=format, output=path, stderr=StringIO())
+    return {'path': path}
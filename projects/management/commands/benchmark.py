@@ -0,0 +1,169 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from projects import benchmarks
+
+
+class Command(BaseCommand):
+    """
+    Mide todas las rutas de projects/urls.py sobre datasets de distinta escala.
+    Mejores practicas:
+    - Se ejecuta en una base de pruebas descartable (no toca los datos reales)
+    - Resultados en JSON comparables entre commits
+    - Comparacion contra una corrida anterior para detectar regresiones
+    """
+    help = 'Benchmark de las rutas del modulo de proyectos (tiempo, consultas y memoria)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='append',
+            choices=list(benchmarks.SCALES),
+            help='Escala a medir (se puede repetir); por defecto small y medium',
+        )
+        parser.add_argument('--repeat', type=int, default=10, help='Corridas medidas por ruta')
+        parser.add_argument('--route', action='append', help='Limita la corrida a estas rutas')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=0,
+            help='Compara vistas sincronas y asincronas con N peticiones simultaneas (0 = no)',
+        )
+        parser.add_argument(
+            '--sqlite-concurrency',
+            type=int,
+            default=0,
+            help='Compara el perfil de SQLite por defecto y el de produccion con N hilos lectores '
+                 'y N/2 escritores (0 = no)',
+        )
+        parser.add_argument('--sqlite-seconds', type=float, default=3.0, help='Duracion de cada corrida de SQLite')
+        parser.add_argument('--output', help='Archivo JSON donde guardar los resultados')
+        parser.add_argument('--compare', help='JSON de una corrida anterior para comparar')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=20.0,
+            help='Porcentaje de aumento de tiempo considerado regresion (por defecto 20)',
+        )
+
+    def handle(self, *args, **options):
+        scales = options['scale'] or ['small', 'medium']
+        scenarios = benchmarks.SCENARIOS
+        if options['route']:
+            scenarios = [s for s in scenarios if s.route in options['route']]
+            if not scenarios:
+                raise CommandError('Ninguna ruta coincide con --route')
+
+        report = {'meta': self.meta(options['repeat']), 'results': {}}
+        if options['concurrency']:
+            report['concurrent'] = {}
+        if options['sqlite_concurrency']:
+            if connection.vendor != 'sqlite':
+                raise CommandError('--sqlite-concurrency requiere una base SQLite')
+            report['sqlite_concurrency'] = {}
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for scale in scales:
+                self.stdout.write(f'Generando dataset {scale}...')
+                benchmarks.seed(scale)
+                self.stdout.write(f'Midiendo {len(scenarios)} rutas ({options["repeat"]} corridas)...')
+                report['results'][scale] = benchmarks.run(options['repeat'], scenarios)
+                self.print_table(scale, report['results'][scale])
+                if options['concurrency']:
+                    results = benchmarks.run_concurrent(options['concurrency'], options['concurrency'] * 5)
+                    report['concurrent'][scale] = results
+                    self.print_concurrent(scale, results)
+                if options['sqlite_concurrency']:
+                    readers = options['sqlite_concurrency']
+                    results = benchmarks.run_sqlite_concurrency(
+                        readers, max(1, readers // 2), options['sqlite_seconds']
+                    )
+                    report['sqlite_concurrency'][scale] = results
+                    self.print_sqlite_concurrency(scale, results)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["output"]}'))
+
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+            regressions = self.compare(baseline, report, options['threshold'])
+            if regressions:
+                raise CommandError(f'{regressions} regresiones detectadas')
+
+    def meta(self, repeat):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+        }
+
+    def print_table(self, scale, results):
+        self.stdout.write(f'\n[{scale}]')
+        self.stdout.write(f'{"ruta":32} {"ms":>9} {"p95":>9} {"consultas":>9} {"sql ms":>9} {"KiB":>9}')
+        for name, row in results.items():
+            self.stdout.write(
+                f'{name:32} {row["wall_ms"]:9.2f} {row["wall_ms_p95"]:9.2f} '
+                f'{row["queries"]:9d} {row["query_ms"]:9.2f} {row["peak_kib"]:9.1f}'
+            )
+
+    def print_concurrent(self, scale, results):
+        self.stdout.write(f'\n[{scale}] sincronas vs asincronas (ASGI, carga concurrente)')
+        self.stdout.write(f'{"ruta":32} {"ms":>9} {"p95":>9} {"req/s":>9}')
+        for name, row in results.items():
+            self.stdout.write(
+                f'{name:32} {row["latency_ms"]:9.2f} {row["latency_ms_p95"]:9.2f} {row["requests_per_second"]:9.1f}'
+            )
+
+    def print_sqlite_concurrency(self, scale, results):
+        self.stdout.write(f'\n[{scale}] SQLite: perfil por defecto vs produccion (lectores y escritores concurrentes)')
+        self.stdout.write(
+            f'{"perfil":14} {"lect/s":>9} {"p95 ms":>9} {"escr/s":>9} {"p95 ms":>9} {"locked":>9}'
+        )
+        for profile, row in results.items():
+            self.stdout.write(
+                f'{profile:14} {row["reads_per_second"]:9.1f} {row["read_ms_p95"] or 0:9.2f} '
+                f'{row["writes_per_second"]:9.1f} {row["write_ms_p95"] or 0:9.2f} {row["busy_errors"]:9d}'
+            )
+
+    def compare(self, baseline, report, threshold):
+        """Muestra las diferencias con otra corrida y cuenta las regresiones."""
+        regressions = 0
+        self.stdout.write(f'\nComparacion con {baseline["meta"].get("commit")}:')
+        for scale, results in report['results'].items():
+            for name, row in results.items():
+                before = baseline['results'].get(scale, {}).get(name)
+                if not before:
+                    continue
+                change = (row['wall_ms'] - before['wall_ms']) / max(before['wall_ms'], 1e-9) * 100
+                more_queries = row['queries'] > before['queries']
+                line = (f'[{scale}] {name}: {before["wall_ms"]:.2f} -> {row["wall_ms"]:.2f} ms '
+                        f'({change:+.1f}%), consultas {before["queries"]} -> {row["queries"]}')
+                if change > threshold or more_queries:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        return regressions
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from projects import jobs, postgres
+from projects.exports import EXPORT_CHUNK_SIZE, FORMATS, export_backlog
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Exporta el backlog de un proyecto en CSV o NDJSON.
+    Mejores practicas:
+    - Escritura en streaming (memoria constante)
+    - Lectura por lotes con iterator(chunk_size); en PostgreSQL con un
+      cursor del lado del servidor dentro de una transaccion
+    - Pensado para reportes nocturnos (cron)
+    """
+    help = 'Exporta las historias de un proyecto con sprint, responsable, puntos y conteos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project', type=int, help='ID del proyecto')
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help='Formato de salida')
+        parser.add_argument('--output', help='Archivo de salida; por defecto la salida estandar')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help='Filas leidas por lote de la base de datos')
+        parser.add_argument('--background', action='store_true',
+                            help='Encola la exportacion para runworker (archivo en JOB_OUTPUT_DIR)')
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(pk=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError(f'No existe el proyecto {options["project"]}')
+
+        if options['background']:
+            job = jobs.enqueue('export_backlog', project=project.pk, format=options['format'])
+            self.stderr.write(self.style.SUCCESS(f'Trabajo #{job.pk} encolado'))
+            return
+
+        started = time.perf_counter()
+        with postgres.streaming_reads():
+            lines = self.write(export_backlog(project, options['format'], options['chunk_size']), options['output'])
+        if not options['output']:
+            return
+
+        stories = lines - 1 if options['format'] == 'csv' else lines
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'{stories} historias exportadas a {options["output"]} en {elapsed:.2f} s'
+        ))
+
+    def write(self, chunks, path):
+        """Escribe las lineas en `path` (o en la salida estandar) y devuelve cuantas fueron."""
+        lines = 0
+        if not path:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+                lines += 1
+            return lines
+
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+                lines += 1
+        return lines
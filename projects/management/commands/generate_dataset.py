@@ -0,0 +1,202 @@
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from projects import counters, jobs, search
+from projects.models import Project, Sprint, UserStory, Task, Comment
+
+
+# Opciones que se guardan en el trabajo cuando se usa --background
+DATASET_OPTIONS = (
+    'projects', 'members', 'users', 'sprints', 'stories_per_sprint', 'backlog_stories', 'tasks_per_story',
+    'comments_per_story', 'batch_size', 'seed', 'prefix', 'clean',
+)
+
+
+class Command(BaseCommand):
+    """
+    Genera datasets sinteticos de gran volumen para pruebas de carga.
+    Mejores practicas:
+    - bulk_create en lotes dentro de transacciones
+    - Claves foraneas precalculadas (sin consultas por fila)
+    - Semilla fija para datasets reproducibles
+    - Reporte de filas por segundo
+    """
+    help = 'Genera un dataset sintetico configurable (10^5 - 10^7 filas) con bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=10, help='Cantidad de proyectos')
+        parser.add_argument('--members', type=int, default=8, help='Miembros por proyecto')
+        parser.add_argument('--users', type=int, default=50, help='Usuarios disponibles para asignar')
+        parser.add_argument('--sprints', type=int, default=10, help='Sprints por proyecto')
+        parser.add_argument('--stories-per-sprint', type=int, default=20, help='Historias por sprint')
+        parser.add_argument('--backlog-stories', type=int, default=50, help='Historias sin sprint por proyecto')
+        parser.add_argument('--tasks-per-story', type=int, default=4, help='Tareas por historia')
+        parser.add_argument('--comments-per-story', type=float, default=2.0,
+                            help='Promedio de comentarios por historia (distribucion exponencial)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por bulk_create')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador aleatorio')
+        parser.add_argument('--prefix', default='load', help='Prefijo de usuarios y proyectos generados')
+        parser.add_argument('--clean', action='store_true',
+                            help='Elimina antes los datos generados con el mismo prefijo')
+        parser.add_argument('--background', action='store_true',
+                            help='Encola la generacion para runworker en lugar de ejecutarla')
+
+    def handle(self, *args, **options):
+        if options['background']:
+            job = jobs.enqueue('generate_dataset', **{name: options[name] for name in DATASET_OPTIONS})
+            self.stdout.write(self.style.SUCCESS(f'Trabajo #{job.pk} encolado'))
+            return
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.options = options
+        self.created = Counter()
+        prefix = options['prefix']
+
+        if options['clean']:
+            self.stdout.write(self.style.WARNING('Eliminando datos generados anteriormente...'))
+            Project.objects.filter(name__startswith=f'{prefix} ').delete()
+            User.objects.filter(username__startswith=f'{prefix}_').delete()
+
+        started = time.perf_counter()
+        users = self.create_users(prefix, options['users'])
+        for index in range(options['projects']):
+            self.create_project(prefix, index, users)
+
+        self.stdout.write('Recalculando contadores...')
+        counters.rebuild()
+        self.stdout.write('Reindexando busqueda...')
+        search.rebuild_index()
+        elapsed = time.perf_counter() - started
+        self.print_report(elapsed)
+
+    # ===== USUARIOS =====
+
+    def create_users(self, prefix, count):
+        """Crea (o reutiliza) el pool de usuarios con una sola contraseña hasheada."""
+        password = make_password('demo1234')
+        usernames = [f'{prefix}_{i:06d}' for i in range(count)]
+        User.objects.bulk_create(
+            [User(username=name, email=f'{name}@example.com', password=password) for name in usernames],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.created['User'] += count
+        return list(User.objects.filter(username__in=usernames).values_list('pk', flat=True))
+
+    # ===== PROYECTOS =====
+
+    def create_project(self, prefix, index, users):
+        rng = self.rng
+        options = self.options
+        today = timezone.localdate()
+        start = today - timedelta(days=14 * options['sprints'])
+
+        with transaction.atomic():
+            members = rng.sample(users, min(options['members'], len(users)))
+            product_owner, scrum_master = members[0], members[-1]
+            project = Project.objects.create(
+                name=f'{prefix} Proyecto {index:04d}',
+                description='Proyecto generado para pruebas de carga.',
+                status='IN_PROGRESS',
+                start_date=start,
+                product_owner_id=product_owner,
+                scrum_master_id=scrum_master,
+            )
+            Project.team_members.through.objects.bulk_create([
+                Project.team_members.through(project_id=project.pk, user_id=user_id) for user_id in members
+            ])
+            self.created['Project'] += 1
+
+            sprints = []
+            for number in range(1, options['sprints'] + 1):
+                sprint_start = start + timedelta(days=14 * (number - 1))
+                status = 'COMPLETED' if number < options['sprints'] else 'ACTIVE'
+                sprints.append(Sprint(
+                    project=project,
+                    name=f'Sprint {number}',
+                    goal=f'Objetivo del sprint {number}',
+                    number=number,
+                    status=status,
+                    start_date=sprint_start,
+                    end_date=sprint_start + timedelta(days=13),
+                ))
+            sprints = Sprint.objects.bulk_create(sprints, batch_size=self.batch_size)
+            self.created['Sprint'] += len(sprints)
+
+        slots = [sprint for sprint in sprints for _ in range(options['stories_per_sprint'])]
+        slots += [None] * options['backlog_stories']
+        self.create_stories(project, members, slots)
+
+    def create_stories(self, project, members, slots):
+        """Crea historias por lotes y, por cada lote, sus tareas y comentarios."""
+        rng = self.rng
+        for offset in range(0, len(slots), self.batch_size):
+            with transaction.atomic():
+                batch = []
+                for position, sprint in enumerate(slots[offset:offset + self.batch_size], offset + 1):
+                    if sprint is None:
+                        status = 'BACKLOG'
+                    elif sprint.status == 'COMPLETED':
+                        status = 'DONE' if rng.random() < 0.9 else 'BLOCKED'
+                    else:
+                        status = rng.choice(['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE'])
+                    batch.append(UserStory(
+                        project_id=project.pk,
+                        sprint_id=sprint.pk if sprint else None,
+                        title=f'Historia {position}',
+                        description='Como usuario, quiero una funcionalidad para obtener un beneficio',
+                        acceptance_criteria='- Criterio 1\n- Criterio 2',
+                        story_points=rng.choice([1, 2, 3, 5, 8, 13]),
+                        priority=rng.choice(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']),
+                        status=status,
+                        assigned_to_id=rng.choice(members) if rng.random() < 0.8 else None,
+                        created_by_id=project.product_owner_id,
+                    ))
+                batch = UserStory.objects.bulk_create(batch)
+                self.created['UserStory'] += len(batch)
+                self.create_children(batch, members)
+
+    def create_children(self, stories, members):
+        rng = self.rng
+        tasks, comments = [], []
+        for story in stories:
+            for n in range(self.options['tasks_per_story']):
+                done = story.status == 'DONE' or rng.random() < 0.3
+                estimated = rng.choice([1, 2, 4, 8])
+                tasks.append(Task(
+                    user_story_id=story.pk,
+                    title=f'Tarea {n + 1}',
+                    status='DONE' if done else rng.choice(['TODO', 'IN_PROGRESS']),
+                    estimated_hours=estimated,
+                    actual_hours=estimated + rng.choice([-1, 0, 0, 1, 2]) if done else None,
+                    assigned_to_id=rng.choice(members) if rng.random() < 0.7 else None,
+                ))
+            mean = self.options['comments_per_story']
+            for n in range(int(rng.expovariate(1 / mean)) if mean > 0 else 0):
+                comments.append(Comment(
+                    user_story_id=story.pk,
+                    author_id=rng.choice(members),
+                    content=f'Comentario {n + 1} sobre la historia.',
+                ))
+        Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+        self.created['Task'] += len(tasks)
+        self.created['Comment'] += len(comments)
+
+    # ===== REPORTE =====
+
+    def print_report(self, elapsed):
+        total = sum(self.created.values())
+        self.stdout.write(self.style.SUCCESS('\nDataset generado:'))
+        for model, count in self.created.items():
+            self.stdout.write(f'  {model}: {count}')
+        self.stdout.write(f'  Total: {total} filas en {elapsed:.2f} s')
+        self.stdout.write(self.style.SUCCESS(f'  Throughput: {total / max(elapsed, 1e-9):,.0f} filas/s'))
@@ -0,0 +1,67 @@
+import codecs
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from projects.imports import BATCH_SIZE, PARSERS, BacklogImporter
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Importa historias, tareas y comentarios desde CSV o NDJSON.
+    Mejores practicas:
+    - Lectura en streaming y bulk_create por lotes en transacciones
+    - Validacion con las reglas de los forms existentes
+    - Reporte de filas por segundo y errores por linea
+    """
+    help = 'Importa un backlog (historias, tareas y comentarios) desde un archivo CSV o NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project', type=int, help='ID del proyecto destino')
+        parser.add_argument('file', help='Archivo a importar')
+        parser.add_argument('--format', choices=sorted(PARSERS),
+                            help='Formato del archivo; por defecto segun la extension')
+        parser.add_argument('--user', help='Usuario autor por defecto; por defecto el Product Owner')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Filas por lote')
+        parser.add_argument('--dry-run', action='store_true', help='Solo valida, no importa')
+        parser.add_argument('--max-errors', type=int, default=20, help='Errores a mostrar')
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.select_related('product_owner').get(pk=options['project'])
+        except Project.DoesNotExist:
+            raise CommandError(f'No existe el proyecto {options["project"]}')
+        user = project.product_owner
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f'No existe el usuario {options["user"]}')
+
+        path = Path(options['file'])
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format not in PARSERS:
+            raise CommandError('No se pudo inferir el formato; use --format csv|ndjson')
+
+        importer = BacklogImporter(project, user, options['batch_size'], options['dry_run'])
+        try:
+            with open(path, 'rb') as source:
+                report = importer.run(PARSERS[file_format](codecs.iterdecode(source, 'utf-8-sig')))
+        except FileNotFoundError:
+            raise CommandError(f'No existe el archivo {path}')
+        except UnicodeDecodeError:
+            raise CommandError('El archivo debe estar codificado en UTF-8')
+
+        self.print_report(report, options)
+
+    def print_report(self, report, options):
+        title = 'Validacion completada' if options['dry_run'] else 'Importacion completada'
+        self.stdout.write(self.style.SUCCESS(f'\n{title}:'))
+        for model, count in report.created.items():
+            self.stdout.write(f'  {model}: {count}')
+        self.stdout.write(f'  Filas: {report.rows} en {report.elapsed:.2f} s')
+        self.stdout.write(self.style.SUCCESS(f'  Throughput: {report.rows_per_second:,.0f} filas/s'))
+        if report.error_count:
+            self.stdout.write(self.style.WARNING(f'  {report.error_count} filas con errores:'))
+            for line, message in report.errors[:options['max_errors']]:
+                self.stdout.write(f'    linea {line}: {message}')
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from projects import counters, jobs
+
+
+class Command(BaseCommand):
+    """
+    Recalcula los contadores desnormalizados de Project y Sprint.
+    Mejores practicas:
+    - Modo de solo verificacion para monitoreo
+    - Corrige unicamente los valores distintos
+    """
+    help = 'Reconstruye o verifica los contadores desnormalizados de proyectos y sprints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Solo informa las diferencias, sin corregirlas (sale con error si hay alguna)',
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Encola la reconstruccion para runworker en lugar de ejecutarla',
+        )
+
+    def handle(self, *args, **options):
+        verify_only = options['verify']
+        if options['background'] and not verify_only:
+            job = jobs.enqueue('rebuild_counters')
+            self.stdout.write(self.style.SUCCESS(f'Trabajo #{job.pk} encolado'))
+            return
+        mismatches = counters.rebuild(verify_only=verify_only)
+
+        for model, pk, field, stored, expected in mismatches:
+            self.stdout.write(
+                f'{model.__name__} {pk}: {field} guardado={stored} real={expected}'
+            )
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('Todos los contadores son correctos'))
+        elif verify_only:
+            raise CommandError(f'{len(mismatches)} contadores desactualizados')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(mismatches)} contadores corregidos'))
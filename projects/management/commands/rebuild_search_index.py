@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from projects import jobs, search
+from projects.models import SearchEntry
+
+
+class Command(BaseCommand):
+    """
+    Reconstruye el índice de búsqueda de texto completo.
+    Mejores practicas:
+    - Lectura con iterator() y escritura por lotes
+    - Alcance opcional por proyecto
+    """
+    help = 'Reindexa historias, tareas y comentarios para la busqueda de texto completo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='ID de proyecto a reindexar (repetible); por defecto todos')
+        parser.add_argument('--background', action='store_true',
+                            help='Encola la reindexacion para runworker en lugar de ejecutarla')
+
+    def handle(self, *args, **options):
+        project_ids = options['projects']
+        if options['background']:
+            job = jobs.enqueue('rebuild_search_index', project_ids=project_ids)
+            self.stdout.write(self.style.SUCCESS(f'Trabajo #{job.pk} encolado'))
+            return
+        search.rebuild_index(project_ids=project_ids)
+        entries = SearchEntry.objects.all()
+        if project_ids:
+            entries = entries.filter(project_id__in=project_ids)
+        self.stdout.write(self.style.SUCCESS(f'{entries.count()} entradas indexadas'))
@@ -0,0 +1,102 @@
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from projects import jobs
+
+
+def _init_process():
+    # Cada proceso abre sus propias conexiones: no se heredan las del padre
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    """
+    Ejecuta los trabajos de la cola en segundo plano (projects/jobs.py).
+    Mejores practicas:
+    - El proceso principal toma trabajos; un pool de procesos los ejecuta
+    - Nunca toma mas trabajos que procesos libres
+    - Detencion ordenada con SIGINT/SIGTERM (termina los trabajos en curso)
+    - Devuelve a la cola los trabajos de workers caidos en cada vuelta, a lo
+      sumo una vez por JOB_HEARTBEAT_INTERVAL
+    """
+    help = 'Worker de la cola de trabajos en base de datos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2,
+                            help='Procesos del pool; 0 ejecuta los trabajos en este proceso')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Segundos de espera cuando la cola esta vacia')
+        parser.add_argument('--once', action='store_true',
+                            help='Ejecuta los trabajos listos y termina')
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        self.worker = jobs.worker_id()
+        self.options = options
+        self.requeued_at = None
+        self.stdout.write(f'Worker {self.worker} ({options["processes"]} procesos)')
+
+        try:
+            if options['processes'] > 0:
+                self.run_pool(options['processes'])
+            else:
+                self.run_inline()
+        except KeyboardInterrupt:
+            self.stdout.write('Deteniendo...')
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def requeue_stale(self):
+        now = time.monotonic()
+        if self.requeued_at is not None and now - self.requeued_at < settings.JOB_HEARTBEAT_INTERVAL:
+            return
+        self.requeued_at = now
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'{requeued} trabajos abandonados devueltos a la cola'))
+
+    def run_inline(self):
+        while not self.stopping:
+            self.requeue_stale()
+            claimed = jobs.claim(self.worker)
+            if not claimed:
+                if self.options['once']:
+                    return
+                time.sleep(self.options['poll_interval'])
+                continue
+            for job in claimed:
+                self.report(job, jobs.run(job))
+
+    def run_pool(self, processes):
+        connections.close_all()
+        running = {}
+        with ProcessPoolExecutor(processes, initializer=_init_process) as pool:
+            while not self.stopping:
+                self.requeue_stale()
+                for job in jobs.claim(self.worker, limit=processes - len(running)) if len(running) < processes else []:
+                    running[pool.submit(jobs.run_by_id, job.pk)] = job
+                if not running:
+                    if self.options['once']:
+                        return
+                    time.sleep(self.options['poll_interval'])
+                    continue
+                done, _ = wait(running, timeout=self.options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.report(running.pop(future), future.result())
+            wait(running)
+            for future, job in running.items():
+                self.report(job, future.result())
+
+    def report(self, job, ok):
+        if ok:
+            self.stdout.write(self.style.SUCCESS(f'{job.name} #{job.pk} terminado'))
+        else:
+            self.stdout.write(self.style.ERROR(f'{job.name} #{job.pk} fallo (intento {job.attempts})'))
@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from projects.analytics import record_snapshots
+from projects.models import Sprint
+
+
+class Command(BaseCommand):
+    """
+    Guarda la foto diaria de los sprints para burndown y velocidad.
+    Pensado para ejecutarse una vez por dia (cron); los cambios de estado
+    ya actualizan la foto del dia automaticamente.
+    """
+    help = 'Registra el snapshot diario de los sprints activos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Incluye todos los sprints, no solo los activos',
+        )
+        parser.add_argument(
+            '--date',
+            help='Fecha del snapshot (AAAA-MM-DD); por defecto hoy',
+        )
+
+    def handle(self, *args, **options):
+        day = None
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('Fecha invalida, use el formato AAAA-MM-DD')
+
+        sprints = Sprint.objects.all()
+        if not options['all']:
+            sprints = sprints.filter(status='ACTIVE')
+
+        total = record_snapshots(sprints.values_list('pk', flat=True), day=day)
+        self.stdout.write(self.style.SUCCESS(f'{total} snapshots registrados'))
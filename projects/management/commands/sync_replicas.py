@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    Copia la base primaria SQLite a las replicas de lectura configuradas.
+    Sirve para probar localmente la separacion de lecturas y escrituras
+    (projects/routers.py); con PostgreSQL las replicas se mantienen con la
+    replicacion del servidor.
+    Mejores practicas:
+    - API de backup de SQLite: copia consistente sin detener la primaria
+    - Cada replica se reemplaza completa, sin estados intermedios visibles
+    """
+    help = 'Copia la base primaria SQLite a las replicas de lectura (DATABASE_REPLICA_NAMES)'
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('No hay replicas configuradas (DATABASE_REPLICA_NAMES)')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('sync_replicas solo copia bases SQLite')
+
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias]
+            replica.ensure_connection()
+            primary.connection.backup(replica.connection)
+            replica.close()
+            self.stdout.write(self.style.SUCCESS(f'{alias}: copiada desde la primaria ({replica.settings_dict["NAME"]})'))
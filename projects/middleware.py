@@ -0,0 +1,254 @@
+"""
+Middlewares del módulo de proyectos.
+"""
+
+import json
+import logging
+import mimetypes
+import os
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from . import routers, sqlite, staticfiles
+from .instrumentation import RequestMetrics, current_metrics, install_template_timing
+
+slow_log = logging.getLogger('projects.slow_requests')
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Mide cada petición: vista, tiempo total, tiempo de plantillas, consultas,
+    consultas repetidas y sentencia más lenta.
+    Mejores prácticas:
+    - Métricas visibles en el navegador vía cabecera Server-Timing
+    - Log estructurado (JSON) sólo para peticiones sobre el umbral
+    - Configurable desde settings sin tocar el código
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Con ASGI y vistas asíncronas no se fuerza el paso por un hilo
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_template_timing()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', True):
+            return self.get_response(request)
+        with self.measure() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', True):
+            return await self.get_response(request)
+        with self.measure() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    @staticmethod
+    @contextmanager
+    def measure():
+        """Activa las métricas de la petición; total_ms se completa al salir."""
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                yield metrics
+        finally:
+            current_metrics.reset(token)
+            metrics.total_ms = (time.perf_counter() - started) * 1000
+
+    def report(self, request, response, metrics):
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            response['Server-Timing'] = self.server_timing(metrics, metrics.total_ms)
+        if metrics.total_ms >= getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500):
+            self.log_slow_request(request, response, metrics, metrics.total_ms)
+        return response
+
+    @staticmethod
+    def server_timing(metrics, total_ms):
+        return ', '.join([
+            f'total;dur={total_ms:.1f}',
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.query_count} queries"',
+            f'tpl;dur={metrics.template_seconds * 1000:.1f}',
+        ])
+
+    @staticmethod
+    def log_slow_request(request, response, metrics, total_ms):
+        match = request.resolver_match
+        record = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'template_ms': round(metrics.template_seconds * 1000, 1),
+            'db_ms': round(metrics.db_seconds * 1000, 1),
+            'queries': metrics.query_count,
+            'duplicates': [{'sql': sql, 'count': count} for sql, count in metrics.duplicates()[:5]],
+            'slowest_ms': round(metrics.slowest_seconds * 1000, 1),
+            'slowest_sql': metrics.slowest_sql,
+        }
+        slow_log.warning(json.dumps(record, ensure_ascii=False))
+
+
+class SQLiteWriteSerializationMiddleware:
+    """
+    Ejecuta la vista de cada petición de escritura (POST, PUT, PATCH, DELETE)
+    dentro de una transacción con el lock de escritura del proceso y la
+    reintenta si SQLite responde "database is locked" (ver sqlite.py). Las
+    lecturas no se serializan: en modo WAL no compiten con el escritor.
+
+    La vista se llama desde process_view y no desde __call__: Django envuelve
+    cada get_response en convert_exception_to_response, que convierte el
+    error en una respuesta 500 antes de que llegue al middleware, así que ni
+    se reintentaría ni se desharía lo ya escrito. Las escrituras de la sesión
+    y los mensajes (process_response) quedan fuera de la transacción: son
+    sentencias sueltas que espera el busy_timeout.
+    Mejores prácticas:
+    - Se desactiva solo (MiddlewareNotUsed) fuera de SQLite o sin
+      SQLITE_SERIALIZE_WRITES
+    - Va último en MIDDLEWARE: CSRF y autenticación corren antes de la vista
+    - Las vistas async quedan fuera (no pueden correr dentro del lock)
+    """
+
+    UNSAFE_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+    def __init__(self, get_response):
+        if not settings.SQLITE_SERIALIZE_WRITES or connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in self.UNSAFE_METHODS or iscoroutinefunction(view_func):
+            return None
+        return sqlite.serialized(view_func, request, *view_args, **view_kwargs)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Habilita las lecturas desde réplicas en las peticiones GET y HEAD (ver
+    routers.py). Una petición de escritura deja la cookie firmada PIN_COOKIE
+    que mantiene las lecturas de ese navegador en la primaria durante
+    READ_YOUR_WRITES_SECONDS.
+    Mejores prácticas:
+    - Se desactiva solo (MiddlewareNotUsed) si no hay réplicas configuradas
+    - La cookie lleva la fecha firmada: no se puede falsificar ni estirar
+    """
+
+    SAFE_METHODS = frozenset({'GET', 'HEAD'})
+
+    def __init__(self, get_response):
+        if not routers.replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in self.SAFE_METHODS:
+            response = self.get_response(request)
+            response.set_signed_cookie(
+                routers.PIN_COOKIE, '1', max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+            return response
+        if self.pinned(request):
+            return self.get_response(request)
+        with routers.use_replica():
+            return self.get_response(request)
+
+    @staticmethod
+    def pinned(request):
+        try:
+            request.get_signed_cookie(routers.PIN_COOKIE, max_age=settings.READ_YOUR_WRITES_SECONDS)
+        except (KeyError, signing.BadSignature):
+            return False
+        return True
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Sirve los archivos de STATIC_ROOT con la variante precomprimida (.br o
+    .gz, ver staticfiles.py) que acepta el navegador. Los nombres con hash
+    del manifiesto se cachean un año como immutable; el resto, unos minutos,
+    y al vencer se revalidan con ETag/Last-Modified (304 sin cuerpo).
+    Mejores prácticas:
+    - Se desactiva solo (MiddlewareNotUsed) sin STATIC_PIPELINE
+    - Va primero: los estáticos no pasan por sesión, base de datos ni métricas
+    - FileResponse: el archivo se envía por bloques, sin leerlo entero
+    - Vary: Accept-Encoding para que las cachés intermedias separen variantes
+    """
+
+    SAFE_METHODS = frozenset({'GET', 'HEAD'})
+    # Preferencia del servidor entre las codificaciones que acepta el navegador
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+    IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+    UNHASHED_CACHE_CONTROL = 'public, max-age=300'
+
+    def __init__(self, get_response):
+        if not settings.STATIC_PIPELINE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.immutable = staticfiles.immutable_names()
+
+    def __call__(self, request):
+        if request.method not in self.SAFE_METHODS or not request.path.startswith(settings.STATIC_URL):
+            return self.get_response(request)
+        name = request.path[len(settings.STATIC_URL):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return self.get_response(request)
+        if not os.path.isfile(path):
+            return self.get_response(request)
+
+        encoding, path = self.variant(request, path)
+        stat = os.stat(path)
+        # Cada variante tiene su propio ETag: son bytes distintos
+        etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            content_type, _ = mimetypes.guess_type(name)
+            response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+            # FileResponse la agrega con el nombre de la variante (.gz/.br)
+            del response['Content-Disposition']
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = (
+            self.IMMUTABLE_CACHE_CONTROL if name in self.immutable else self.UNHASHED_CACHE_CONTROL
+        )
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+    def variant(self, request, path):
+        """(codificación, ruta) de la mejor variante disponible para el navegador."""
+        accepted = {
+            part.split(';')[0].strip().lower() for part in request.headers.get('Accept-Encoding', '').split(',')
+        }
+        for encoding, suffix in self.ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return encoding, path + suffix
+        return None, path
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['user_story', 'created_at'], name='comment_story_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_at', 'id'], name='project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', '-created_at'], name='task_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user_story', 'status', '-created_at'], name='task_story_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['project', 'priority', 'created_at', 'id'], name='story_project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['project', 'status', 'priority', 'created_at', 'id'], name='story_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['sprint', 'priority', 'created_at', 'id'], name='story_sprint_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['assigned_to', 'priority', 'created_at', 'id'], name='story_assignee_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(condition=models.Q(('status', 'DONE'), _negated=True), fields=['project', 'priority', 'created_at', 'id'], name='story_open_idx'),
+        ),
+    ]
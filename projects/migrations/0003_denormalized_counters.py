@@ -0,0 +1,110 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:26
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """Calcula los contadores iniciales a partir de los datos existentes."""
+    Project = apps.get_model('projects', 'Project')
+    Sprint = apps.get_model('projects', 'Sprint')
+    UserStory = apps.get_model('projects', 'UserStory')
+    Task = apps.get_model('projects', 'Task')
+
+    for model, field in ((Project, 'project'), (Sprint, 'sprint')):
+        stories = UserStory.objects.filter(**{f'{field}__isnull': False}).values(field).order_by().annotate(
+            story_count=Count('pk'),
+            story_done_count=Count('pk', filter=Q(status='DONE')),
+            story_points_total=Coalesce(Sum('story_points'), 0),
+            story_points_done=Coalesce(Sum('story_points', filter=Q(status='DONE')), 0),
+        )
+        for row in stories:
+            model.objects.filter(pk=row.pop(field)).update(**row)
+
+        lookup = f'user_story__{field}'
+        tasks = Task.objects.filter(**{f'{lookup}__isnull': False}).values(lookup).order_by().annotate(
+            task_count=Count('pk'),
+            task_done_count=Count('pk', filter=Q(status='DONE')),
+        )
+        for row in tasks:
+            model.objects.filter(pk=row.pop(lookup)).update(**row)
+
+    for row in Sprint.objects.values('project').order_by().annotate(total=Count('pk')):
+        Project.objects.filter(pk=row['project']).update(sprint_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='sprint_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Sprints'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='story_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Historias'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='story_done_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Historias completadas'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='story_points_done',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Puntos completados'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='story_points_total',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Puntos totales'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tareas'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_done_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tareas completadas'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='story_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Historias'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='story_done_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Historias completadas'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='story_points_done',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Puntos completados'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='story_points_total',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Puntos totales'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tareas'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='task_done_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Tareas completadas'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
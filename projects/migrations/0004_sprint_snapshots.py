@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SprintSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Fecha')),
+                ('story_count', models.IntegerField(default=0, verbose_name='Historias')),
+                ('story_done_count', models.IntegerField(default=0, verbose_name='Historias completadas')),
+                ('story_points_total', models.IntegerField(default=0, verbose_name='Puntos totales')),
+                ('story_points_done', models.IntegerField(default=0, verbose_name='Puntos completados')),
+                ('task_count', models.IntegerField(default=0, verbose_name='Tareas')),
+                ('task_done_count', models.IntegerField(default=0, verbose_name='Tareas completadas')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+                ('sprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='projects.sprint', verbose_name='Sprint')),
+            ],
+            options={
+                'verbose_name': 'Snapshot de Sprint',
+                'verbose_name_plural': 'Snapshots de Sprint',
+                'ordering': ['sprint', 'date'],
+                'unique_together': {('sprint', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_sprint_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='content_version',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Versión de contenido'),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='content_version',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Versión de contenido'),
+        ),
+    ]
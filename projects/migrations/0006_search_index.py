@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SQLITE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE projects_searchentry_fts USING fts5(
+        title, body,
+        content='projects_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER projects_searchentry_ai AFTER INSERT ON projects_searchentry BEGIN
+        INSERT INTO projects_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_searchentry_ad AFTER DELETE ON projects_searchentry BEGIN
+        INSERT INTO projects_searchentry_fts(projects_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER projects_searchentry_au AFTER UPDATE ON projects_searchentry BEGIN
+        INSERT INTO projects_searchentry_fts(projects_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO projects_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS projects_searchentry_au',
+    'DROP TRIGGER IF EXISTS projects_searchentry_ad',
+    'DROP TRIGGER IF EXISTS projects_searchentry_ai',
+    'DROP TABLE IF EXISTS projects_searchentry_fts',
+]
+
+POSTGRES_INDEX = [
+    """
+    ALTER TABLE projects_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX projects_searchentry_vector_idx ON projects_searchentry USING GIN (search_vector)',
+]
+
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS projects_searchentry_vector_idx',
+    'ALTER TABLE projects_searchentry DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    """Índice invertido según el motor: FTS5 (SQLite) o tsvector + GIN (PostgreSQL)."""
+    _execute(schema_editor, {'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX})
+
+
+def drop_index(apps, schema_editor):
+    _execute(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+def populate_index(apps, schema_editor):
+    """Indexa las historias, tareas y comentarios existentes."""
+    SearchEntry = apps.get_model('projects', 'SearchEntry')
+    UserStory = apps.get_model('projects', 'UserStory')
+    Task = apps.get_model('projects', 'Task')
+    Comment = apps.get_model('projects', 'Comment')
+
+    entries = []
+    for story in UserStory.objects.iterator():
+        entries.append(SearchEntry(
+            kind='story', object_id=story.pk, project_id=story.project_id, user_story_id=story.pk,
+            title=story.title, body=f'{story.description}\n{story.acceptance_criteria}',
+        ))
+    for task in Task.objects.select_related('user_story').iterator(chunk_size=2000):
+        entries.append(SearchEntry(
+            kind='task', object_id=task.pk, project_id=task.user_story.project_id,
+            user_story_id=task.user_story_id, title=task.title, body=task.description,
+        ))
+    for comment in Comment.objects.select_related('user_story').iterator(chunk_size=2000):
+        entries.append(SearchEntry(
+            kind='comment', object_id=comment.pk, project_id=comment.user_story.project_id,
+            user_story_id=comment.user_story_id, title='', body=comment.content,
+        ))
+    SearchEntry.objects.bulk_create(entries, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_content_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('story', 'Historia'), ('task', 'Tarea'), ('comment', 'Comentario')], max_length=10, verbose_name='Tipo')),
+                ('object_id', models.BigIntegerField(verbose_name='ID del objeto')),
+                ('title', models.TextField(blank=True, verbose_name='Título')),
+                ('body', models.TextField(blank=True, verbose_name='Contenido')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.project', verbose_name='Proyecto')),
+                ('user_story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.userstory', verbose_name='Historia de usuario')),
+            ],
+            options={
+                'verbose_name': 'Entrada de búsqueda',
+                'verbose_name_plural': 'Entradas de búsqueda',
+                'indexes': [models.Index(fields=['project'], name='search_project_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(populate_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_job_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_assignee_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userstory',
+            name='story_sprint_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userstory',
+            name='story_assignee_order_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', False)), fields=['assigned_to', 'status', '-created_at'], name='task_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(condition=models.Q(('sprint__isnull', False)), fields=['sprint', 'priority', 'created_at', 'id'], name='story_sprint_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', False)), fields=['assigned_to', 'priority', 'created_at', 'id'], name='story_assignee_order_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+from django.db import migrations
+
+# Igual que search.ACCENTS / search.UNACCENTED: translate() es IMMUTABLE y
+# puede ir en una columna generada (unaccent() no, y requiere la extensión)
+ACCENTS = 'áàâäãåéèêëíìîïóòôöõúùûüñçý'
+UNACCENTED = 'aaaaaaeeeeiiiiooooouuuuncy'
+
+
+def _vector(config, column, weight):
+    if config == 'simple':
+        column = f"translate(lower(coalesce({column}, '')), '{ACCENTS}', '{UNACCENTED}')"
+    else:
+        column = f"coalesce({column}, '')"
+    return f"setweight(to_tsvector('{config}', {column}), '{weight}')"
+
+
+def _statements(config):
+    return [
+        'DROP INDEX IF EXISTS projects_searchentry_vector_idx',
+        'ALTER TABLE projects_searchentry DROP COLUMN IF EXISTS search_vector',
+        f"""
+        ALTER TABLE projects_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            {_vector(config, 'title', 'A')} || {_vector(config, 'body', 'B')}
+        ) STORED
+        """,
+        'CREATE INDEX projects_searchentry_vector_idx ON projects_searchentry USING GIN (search_vector)',
+    ]
+
+
+def _execute(schema_editor, config):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in _statements(config):
+            schema_editor.execute(statement)
+
+
+def unaccented_index(apps, schema_editor):
+    """
+    PostgreSQL: configuración simple sobre el texto sin tildes, como FTS5
+    unicode61 remove_diacritics en SQLite (sin stemming del español).
+    """
+    _execute(schema_editor, 'simple')
+
+
+def spanish_index(apps, schema_editor):
+    _execute(schema_editor, 'spanish')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(unaccented_index, spanish_index),
+    ]
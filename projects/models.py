@@ -4,7 +4,34 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 
 
-class Project(models.Model):
+class DenormalizedCountersMixin:
+    """
+    Evita que un save() completo pise los contadores desnormalizados, que se
+    mantienen con UPDATE ... F() desde counters.py y pueden haber cambiado
+    desde que se cargó la instancia.
+
+    content_version se incrementa (y updated_at se adelanta) cada vez que
+    cambian filas hijas; juntos forman la versión usada en las claves de caché
+    de fragmentos y en los validadores de GET condicional.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            maintained = {*self.counter_fields, 'content_version'}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in maintained
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def cache_version(self):
+        return f'{self.updated_at.timestamp()}:{self.content_version}'
+
+
+class Project(DenormalizedCountersMixin, models.Model):
     """
     Modelo que representa un proyecto Scrum.
     Mejores prácticas implementadas:
@@ -22,6 +49,11 @@ class Project(models.Model):
         ('CANCELLED', 'Cancelado'),
     ]
 
+    counter_fields = (
+        'sprint_count', 'story_count', 'story_done_count',
+        'story_points_total', 'story_points_done', 'task_count', 'task_done_count',
+    )
+
     name = models.CharField(
         max_length=200,
         verbose_name=_('Nombre'),
@@ -63,6 +95,15 @@ class Project(models.Model):
         verbose_name=_('Miembros del equipo'),
         blank=True
     )
+    # Contadores desnormalizados mantenidos por counters.py (no editar a mano)
+    sprint_count = models.IntegerField(default=0, editable=False, verbose_name=_('Sprints'))
+    story_count = models.IntegerField(default=0, editable=False, verbose_name=_('Historias'))
+    story_done_count = models.IntegerField(default=0, editable=False, verbose_name=_('Historias completadas'))
+    story_points_total = models.IntegerField(default=0, editable=False, verbose_name=_('Puntos totales'))
+    story_points_done = models.IntegerField(default=0, editable=False, verbose_name=_('Puntos completados'))
+    task_count = models.IntegerField(default=0, editable=False, verbose_name=_('Tareas'))
+    task_done_count = models.IntegerField(default=0, editable=False, verbose_name=_('Tareas completadas'))
+    content_version = models.IntegerField(default=0, editable=False, verbose_name=_('Versión de contenido'))
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_('Fecha de creación')
@@ -76,12 +117,20 @@ class Project(models.Model):
         verbose_name = _('Proyecto')
         verbose_name_plural = _('Proyectos')
         ordering = ['-created_at']
+        indexes = [
+            # Orden de project_list (recorrido hacia atrás para -created_at, -id)
+            models.Index(fields=['created_at', 'id'], name='project_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_status_display()})"
 
+    @property
+    def story_open_count(self):
+        return self.story_count - self.story_done_count
+
 
-class Sprint(models.Model):
+class Sprint(DenormalizedCountersMixin, models.Model):
     """
     Modelo que representa un Sprint dentro de un proyecto Scrum.
     """
@@ -93,6 +142,11 @@ class Sprint(models.Model):
         ('CANCELLED', 'Cancelado'),
     ]
 
+    counter_fields = (
+        'story_count', 'story_done_count',
+        'story_points_total', 'story_points_done', 'task_count', 'task_done_count',
+    )
+
     project = models.ForeignKey(
         Project,
         on_delete=models.CASCADE,
@@ -129,6 +183,14 @@ class Sprint(models.Model):
         verbose_name=_('Velocidad'),
         help_text='Puntos de historia completados'
     )
+    # Contadores desnormalizados mantenidos por counters.py (no editar a mano)
+    story_count = models.IntegerField(default=0, editable=False, verbose_name=_('Historias'))
+    story_done_count = models.IntegerField(default=0, editable=False, verbose_name=_('Historias completadas'))
+    story_points_total = models.IntegerField(default=0, editable=False, verbose_name=_('Puntos totales'))
+    story_points_done = models.IntegerField(default=0, editable=False, verbose_name=_('Puntos completados'))
+    task_count = models.IntegerField(default=0, editable=False, verbose_name=_('Tareas'))
+    task_done_count = models.IntegerField(default=0, editable=False, verbose_name=_('Tareas completadas'))
+    content_version = models.IntegerField(default=0, editable=False, verbose_name=_('Versión de contenido'))
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_('Fecha de creación')
@@ -147,6 +209,10 @@ class Sprint(models.Model):
     def __str__(self):
         return f"{self.project.name} - Sprint {self.number}"
 
+    @property
+    def story_open_count(self):
+        return self.story_count - self.story_done_count
+
 
 class UserStory(models.Model):
     """
@@ -240,6 +306,30 @@ class UserStory(models.Model):
         verbose_name = _('Historia de Usuario')
         verbose_name_plural = _('Historias de Usuario')
         ordering = ['-priority', '-created_at']
+        # Los índices siguen el Meta.ordering (recorridos hacia atrás) para que
+        # los filtros de las vistas no necesiten ordenar en memoria.
+        indexes = [
+            models.Index(fields=['project', 'priority', 'created_at', 'id'], name='story_project_order_idx'),
+            models.Index(fields=['project', 'status', 'priority', 'created_at', 'id'], name='story_project_status_idx'),
+            # Parciales: las historias del backlog sin sprint o sin asignar
+            # no se buscan por esas columnas
+            models.Index(
+                fields=['sprint', 'priority', 'created_at', 'id'],
+                condition=models.Q(sprint__isnull=False),
+                name='story_sprint_order_idx',
+            ),
+            models.Index(
+                fields=['assigned_to', 'priority', 'created_at', 'id'],
+                condition=models.Q(assigned_to__isnull=False),
+                name='story_assignee_order_idx',
+            ),
+            # Índice parcial: sólo historias abiertas
+            models.Index(
+                fields=['project', 'priority', 'created_at', 'id'],
+                condition=~models.Q(status='DONE'),
+                name='story_open_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_priority_display()})"
@@ -313,6 +403,14 @@ class Task(models.Model):
         verbose_name = _('Tarea')
         verbose_name_plural = _('Tareas')
         ordering = ['status', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['assigned_to', 'status', '-created_at'],
+                condition=models.Q(assigned_to__isnull=False),
+                name='task_assignee_status_idx',
+            ),
+            models.Index(fields=['user_story', 'status', '-created_at'], name='task_story_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
@@ -351,6 +449,198 @@ class Comment(models.Model):
         verbose_name = _('Comentario')
         verbose_name_plural = _('Comentarios')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user_story', 'created_at'], name='comment_story_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comentario de {self.author.username} en {self.user_story.title}"
+
+
+class SprintSnapshot(models.Model):
+    """
+    Fotografía diaria de los contadores de un Sprint.
+    Se actualiza en cada cambio de estado y con el comando snapshot_sprints;
+    analytics.py calcula burndown, burnup y velocidad a partir de estas filas.
+    """
+
+    sprint = models.ForeignKey(
+        Sprint,
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        verbose_name=_('Sprint')
+    )
+    date = models.DateField(
+        verbose_name=_('Fecha')
+    )
+    story_count = models.IntegerField(default=0, verbose_name=_('Historias'))
+    story_done_count = models.IntegerField(default=0, verbose_name=_('Historias completadas'))
+    story_points_total = models.IntegerField(default=0, verbose_name=_('Puntos totales'))
+    story_points_done = models.IntegerField(default=0, verbose_name=_('Puntos completados'))
+    task_count = models.IntegerField(default=0, verbose_name=_('Tareas'))
+    task_done_count = models.IntegerField(default=0, verbose_name=_('Tareas completadas'))
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Última actualización')
+    )
+
+    class Meta:
+        verbose_name = _('Snapshot de Sprint')
+        verbose_name_plural = _('Snapshots de Sprint')
+        ordering = ['sprint', 'date']
+        unique_together = [['sprint', 'date']]
+
+    def __str__(self):
+        return f"{self.sprint} - {self.date}"
+
+    @property
+    def story_points_remaining(self):
+        return self.story_points_total - self.story_points_done
+
+
+class SearchEntry(models.Model):
+    """
+    Documento del índice de búsqueda de texto completo (ver search.py).
+    Una fila por historia, tarea o comentario; se mantiene con señales.
+    El índice invertido vive en la base: FTS5 en SQLite, tsvector + GIN en
+    PostgreSQL (migración 0006).
+    """
+
+    KIND_CHOICES = [
+        ('story', 'Historia'),
+        ('task', 'Tarea'),
+        ('comment', 'Comentario'),
+    ]
+
+    kind = models.CharField(
+        max_length=10,
+        choices=KIND_CHOICES,
+        verbose_name=_('Tipo')
+    )
+    object_id = models.BigIntegerField(
+        verbose_name=_('ID del objeto')
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Proyecto')
+    )
+    user_story = models.ForeignKey(
+        UserStory,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Historia de usuario')
+    )
+    title = models.TextField(
+        blank=True,
+        verbose_name=_('Título')
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('Contenido')
+    )
+
+    class Meta:
+        verbose_name = _('Entrada de búsqueda')
+        verbose_name_plural = _('Entradas de búsqueda')
+        unique_together = [['kind', 'object_id']]
+        indexes = [
+            models.Index(fields=['project'], name='search_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_id}: {self.title}"
+
+
+class Job(models.Model):
+    """
+    Trabajo en segundo plano de la cola en base de datos (ver jobs.py).
+    Los workers (manage.py runworker) toman los trabajos listos por prioridad
+    y fecha; los fallidos se reintentan con espera exponencial hasta
+    max_attempts.
+    """
+
+    STATUS_CHOICES = [
+        ('QUEUED', 'En cola'),
+        ('RUNNING', 'En ejecución'),
+        ('DONE', 'Terminado'),
+        ('FAILED', 'Fallido'),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_('Trabajo')
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Argumentos')
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='QUEUED',
+        verbose_name=_('Estado')
+    )
+    priority = models.IntegerField(
+        default=0,
+        verbose_name=_('Prioridad'),
+        help_text='Los valores más altos se ejecutan primero'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Intentos')
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=3,
+        verbose_name=_('Intentos máximos')
+    )
+    run_at = models.DateTimeField(
+        verbose_name=_('Ejecutar desde')
+    )
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('Tomado por')
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Tomado el')
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_('Resultado')
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('Último error')
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Fecha de creación')
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Fecha de finalización')
+    )
+
+    class Meta:
+        verbose_name = _('Trabajo en segundo plano')
+        verbose_name_plural = _('Trabajos en segundo plano')
+        ordering = ['-created_at']
+        indexes = [
+            # Índice parcial con el orden en que los workers toman trabajos
+            models.Index(
+                fields=['-priority', 'run_at', 'id'],
+                condition=models.Q(status='QUEUED'),
+                name='job_ready_idx',
+            ),
+            models.Index(fields=['status', 'locked_at'], name='job_status_lock_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
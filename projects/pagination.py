@@ -0,0 +1,158 @@
+"""
+Paginación por cursor (keyset / seek) para las listas del módulo de proyectos.
+
+A diferencia de OFFSET, cada página se obtiene filtrando por los valores de la
+última fila vista según el Meta.ordering del modelo (con pk como desempate),
+por lo que el costo de una página es constante sin importar cuán profundo se
+navegue. Los cursores viajan en el query string y son estables frente a
+inserciones en otras partes de la lista.
+
+Mejores prácticas:
+- El orden se toma del Meta.ordering existente de cada modelo
+- Se pide una fila extra para saber si existe otra página
+- Un cursor inválido o manipulado vuelve a la primera página
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """Página de resultados con los query strings de navegación."""
+
+    def __init__(self, object_list, has_next, has_previous, next_querystring, previous_querystring):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_querystring = next_querystring
+        self.previous_querystring = previous_querystring
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pagina un queryset por los campos de su ordenamiento.
+
+    Los campos del ordenamiento no deben admitir NULL; el último siempre es la
+    pk para que la clave de cada fila sea única.
+    """
+
+    cursor_param = 'cursor'
+
+    def __init__(self, queryset, per_page=25, ordering=None):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.per_page = per_page
+        self.ordering = tuple(ordering or self.default_ordering(self.model))
+
+    @staticmethod
+    def default_ordering(model):
+        """Meta.ordering del modelo con la pk como desempate."""
+        ordering = list(model._meta.ordering)
+        if not any(name.lstrip('-') in ('pk', model._meta.pk.name) for name in ordering):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    # ----- Cursores -----
+
+    def _field(self, name):
+        if name == 'pk':
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+    def encode_cursor(self, obj, direction):
+        values = [self._field(name.lstrip('-')).value_to_string(obj) for name in self.ordering]
+        payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Devuelve (dirección, valores) o None si el cursor no es válido."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload['d'], payload['v']
+            if direction not in ('n', 'p') or len(raw_values) != len(self.ordering):
+                return None
+            values = [
+                self._field(name.lstrip('-')).to_python(raw)
+                for name, raw in zip(self.ordering, raw_values)
+            ]
+        except (ValueError, TypeError, KeyError, ValidationError):
+            return None
+        return direction, values
+
+    # ----- Filtro de búsqueda -----
+
+    def _seek_filter(self, values, forward):
+        """
+        Condición lexicográfica "fila posterior a la clave" según el orden:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip('-')
+            descending = name.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal_prefix & Q(**{f'{field}__{lookup}': value})
+            equal_prefix &= Q(**{field: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+
+    # ----- Página -----
+
+    def page_queryset(self, params):
+        """
+        Queryset (sin evaluar, con LIMIT per_page + 1) de la página indicada
+        por el cursor de `params`: (queryset, dirección, hacia_adelante).
+        Si no avanza hacia adelante las filas vienen en orden inverso.
+        """
+        decoded = self.decode_cursor(params.get(self.cursor_param, ''))
+        if decoded is None:
+            return self.queryset.order_by(*self.ordering)[:self.per_page + 1], None, True
+        direction, values = decoded
+        forward = direction == 'n'
+        ordering = self.ordering if forward else self._reversed_ordering()
+        queryset = self.queryset.filter(self._seek_filter(values, forward)).order_by(*ordering)
+        return queryset[:self.per_page + 1], direction, forward
+
+    def get_page(self, params):
+        """
+        Obtiene la página indicada por el cursor de `params` (request.GET).
+        Ejecuta una única consulta con LIMIT per_page + 1.
+        """
+        queryset, direction, forward = self.page_queryset(params)
+        rows = list(queryset)
+
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = has_more, direction is not None
+        else:
+            has_next, has_previous = True, has_more
+
+        next_qs = self._querystring(params, rows[-1], 'n') if has_next and rows else None
+        previous_qs = self._querystring(params, rows[0], 'p') if has_previous and rows else None
+        return KeysetPage(rows, has_next and bool(rows), has_previous and bool(rows), next_qs, previous_qs)
+
+    def _querystring(self, params, obj, direction):
+        query = params.copy()
+        query[self.cursor_param] = self.encode_cursor(obj, direction)
+        return query.urlencode()
@@ -0,0 +1,45 @@
+"""
+PostgreSQL en producción: pool de conexiones y lecturas en streaming.
+
+Con DATABASE_URL=postgresql://... las conexiones salen de un pool de psycopg
+(OPTIONS['pool']) en lugar de abrirse en cada petición, y los querysets que
+se recorren con iterator() (exportaciones, reindexado, listas de la API) usan
+un cursor del lado del servidor: la base envía las filas de a chunk_size y ni
+el servidor de aplicación ni psycopg arman el resultado completo en memoria.
+
+Fuera de una transacción Django declara esos cursores WITH HOLD, y
+PostgreSQL materializa el resultado completo al confirmar la declaración,
+antes de entregar la primera fila. streaming_reads() abre una transacción
+para los recorridos largos que no responden a una petición (comandos y
+trabajos en segundo plano): el cursor se lee a medida que se consume y todo
+el recorrido ve una misma foto de la base.
+
+Mejores prácticas:
+- Pool con CONN_MAX_AGE = 0: la conexión vuelve al pool al terminar
+- DISABLE_SERVER_SIDE_CURSORS detrás de pgbouncer en modo transacción
+- Índices parciales que excluyen las filas que ninguna consulta busca
+"""
+
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+def uses_server_side_cursors(using=DEFAULT_DB_ALIAS):
+    """True si iterator() lee con un cursor del lado del servidor."""
+    connection = connections[using]
+    return connection.vendor == 'postgresql' and not connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS')
+
+
+@contextmanager
+def streaming_reads(using=DEFAULT_DB_ALIAS):
+    """
+    Recorridos con iterator() dentro de una transacción cuando la base usa
+    cursores del lado del servidor. En SQLite no abre nada: con el perfil de
+    producción (BEGIN IMMEDIATE) tomaría el lock de escritura todo el recorrido.
+    """
+    if uses_server_side_cursors(using):
+        with transaction.atomic(using=using):
+            yield
+    else:
+        yield
@@ -0,0 +1,128 @@
+"""
+Planes de consulta declarados para las vistas del módulo de proyectos.
+
+Cada función devuelve el queryset que una vista (o un bloque de una vista)
+necesita, con las relaciones que usa su plantilla ya resueltas mediante
+select_related/prefetch_related. Así la cantidad de consultas de cada página
+es constante y no depende de la cantidad de filas que se muestran.
+
+Mejores prácticas:
+- Un único lugar donde se declara qué relaciones carga cada página
+- Las vistas no construyen querysets con relaciones implícitas
+- Los tests verifican un presupuesto de consultas por vista
+"""
+
+from django.db.models import Prefetch
+
+from .models import Project, Sprint, UserStory, Task
+
+
+def visible_projects(project_ids):
+    """
+    Proyectos visibles a partir de los ids resueltos por access.py, sin el
+    JOIN con team_members ni DISTINCT.
+    """
+    return Project.objects.filter(pk__in=list(project_ids))
+
+
+def project_list_queryset(project_ids):
+    """
+    Plan de project_list: una consulta con PO/SM unidos. Los contadores de
+    sprints e historias son campos desnormalizados (counters.py).
+    """
+    return visible_projects(project_ids).select_related('product_owner', 'scrum_master')
+
+
+def project_detail_queryset():
+    """
+    Plan de project_detail: proyecto con PO/SM unidos. Las secciones hijas se
+    consultan en forma perezosa para no pagarlas si vienen de la caché de
+    fragmentos.
+    """
+    return Project.objects.select_related('product_owner', 'scrum_master')
+
+
+def project_team_members(project):
+    """Miembros del equipo ordenados por nombre de usuario."""
+    return project.team_members.order_by('username')
+
+
+def project_recent_sprints(project, limit=5):
+    """Sprints recientes de un proyecto (sin relaciones adicionales)."""
+    return project.sprints.all()[:limit]
+
+
+def project_recent_stories(project, limit=10):
+    """Historias recientes de un proyecto con su asignado unido."""
+    return project.user_stories.select_related('assigned_to')[:limit]
+
+
+def sprint_list_queryset(project):
+    """Plan de sprint_list: los sprints del proyecto."""
+    return project.sprints.all()
+
+
+def sprint_detail_queryset():
+    """Plan de sprint_detail: sprint con su proyecto unido."""
+    return Sprint.objects.select_related('project')
+
+
+def sprint_stories(sprint):
+    """Historias de un sprint con su asignado unido."""
+    return sprint.user_stories.select_related('assigned_to')
+
+
+def sprint_board_stories(sprint, statuses=None):
+    """
+    Plan del tablero Kanban: historias del sprint con su asignado unido y sus
+    tareas (con asignado) en una segunda consulta. Dos consultas sin importar
+    cuántas historias o tareas tenga el sprint.
+    """
+    stories = sprint.user_stories.select_related('assigned_to').prefetch_related(
+        Prefetch('tasks', queryset=Task.objects.select_related('assigned_to'))
+    )
+    if statuses is not None:
+        stories = stories.filter(status__in=list(statuses))
+    return stories
+
+
+def user_story_list_queryset(project):
+    """
+    Plan de user_story_list: historias con sprint y asignado unidos.
+    """
+    return project.user_stories.select_related('sprint', 'assigned_to')
+
+
+def user_story_detail_queryset():
+    """
+    Plan de user_story_detail: historia con proyecto, sprint, asignado y
+    creador unidos en una sola consulta.
+    """
+    return UserStory.objects.select_related(
+        'project', 'sprint', 'assigned_to', 'created_by'
+    )
+
+
+def story_tasks(user_story):
+    """Tareas de una historia con su asignado unido."""
+    return user_story.tasks.select_related('assigned_to')
+
+
+def story_comments(user_story):
+    """Comentarios de una historia con su autor unido."""
+    return user_story.comments.select_related('author')
+
+
+def dashboard_projects(project_ids, limit=5):
+    """Proyectos del dashboard con PO/SM unidos (la plantilla compara roles)."""
+    return visible_projects(project_ids).select_related('product_owner', 'scrum_master')[:limit]
+
+
+def assigned_stories(user, limit=5):
+    """Historias asignadas al usuario con su proyecto unido."""
+    return UserStory.objects.filter(assigned_to=user).select_related('project')[:limit]
+
+
+def assigned_tasks(user, limit=5):
+    """Tareas asignadas al usuario con su historia unida."""
+    return Task.objects.filter(assigned_to=user).select_related('user_story')[:limit]
@@ -0,0 +1,84 @@
+"""
+Separación de lecturas y escrituras entre la base primaria y sus réplicas.
+
+Las escrituras van siempre a "default" (la primaria). Las lecturas van a una
+réplica (settings.DATABASE_REPLICAS) sólo dentro de una petición de lectura
+que ReplicaRoutingMiddleware habilitó; en cualquier otro contexto (comandos,
+worker de trabajos, señales fuera de una petición) se lee de la primaria.
+
+Lectura de lo propio (read-your-writes): después de una petición de escritura
+el middleware deja una cookie firmada que fija las lecturas de ese navegador
+a la primaria durante READ_YOUR_WRITES_SECONDS, así la redirección posterior
+a project_create, user_story_create o task_create muestra lo recién creado
+aunque la réplica todavía no lo haya recibido.
+
+Mejores prácticas:
+- Una réplica por petición: todas sus consultas ven el mismo estado
+- Lecturas dentro de una transacción abierta en la primaria
+- Los datos que llenan cachés compartidas se leen de la primaria (use_primary)
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Réplica elegida para la petición en curso (None = primaria)
+_read_alias = ContextVar('read_alias', default=None)
+
+# Apps cuyas lecturas pueden ir a una réplica; sesiones y usuarios se leen
+# siempre de la primaria (una sesión recién creada aún no está replicada)
+REPLICA_APPS = frozenset({'projects'})
+
+PIN_COOKIE = 'pin_primary'
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+@contextmanager
+def use_replica():
+    """Habilita las lecturas desde una réplica (elegida al azar) en el bloque."""
+    aliases = replicas()
+    token = _read_alias.set(random.choice(aliases) if aliases else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Fuerza las lecturas del bloque a la primaria."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Router de DATABASE_ROUTERS: escribe en la primaria y lee de la réplica habilitada."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label not in REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaria y réplicas tienen los mismos datos
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        return db not in replicas()
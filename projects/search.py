@@ -0,0 +1,205 @@
+"""
+Búsqueda de texto completo sobre historias, tareas y comentarios.
+
+SearchEntry guarda una fila por objeto indexado (título y cuerpo ya
+combinados) y la migración 0006 crea el índice invertido según el motor:
+
+- SQLite: tabla virtual FTS5 de contenido externo, sincronizada por triggers
+- PostgreSQL: columna tsvector generada (título con peso A, cuerpo con B) y
+  un índice GIN; configuración simple sobre el texto sin tildes (migración
+  0009), así ambos motores buscan igual: por prefijo y sin stemming
+
+Las señales (signals.py) actualizan la entrada del objeto en cada save/delete;
+las escrituras masivas (importación, dataset de benchmark) llaman a
+rebuild_index. Los resultados se ordenan por relevancia (bm25 / ts_rank) y se
+limitan a los proyectos que el usuario puede ver.
+
+Mejores prácticas:
+- Sin LIKE '%término%': el índice resuelve la búsqueda sin recorrer tablas
+- Una fila por objeto con upsert, sin lecturas previas
+- Filtro de acceso dentro de la misma consulta que rankea
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+from . import postgres
+from .models import UserStory, Task, Comment, SearchEntry
+
+# Resultados por búsqueda
+SEARCH_LIMIT = 50
+# Filas por lote al reconstruir el índice
+INDEX_BATCH_SIZE = 2000
+
+_TERMS = re.compile(r'\w+')
+
+# Tildes que la columna search_vector de PostgreSQL quita con translate()
+# (migración 0009); la consulta las quita igual
+ACCENTS = 'áàâäãåéèêëíìîïóòôöõúùûüñçý'
+UNACCENTED = 'aaaaaaeeeeiiiiooooouuuuncy'
+_UNACCENT = str.maketrans(ACCENTS, UNACCENTED)
+
+
+# ===== INDEXACIÓN =====
+
+def story_entry(story):
+    return SearchEntry(
+        kind='story', object_id=story.pk, project_id=story.project_id, user_story_id=story.pk,
+        title=story.title, body=f'{story.description}\n{story.acceptance_criteria}',
+    )
+
+
+def task_entry(task, project_id):
+    return SearchEntry(
+        kind='task', object_id=task.pk, project_id=project_id, user_story_id=task.user_story_id,
+        title=task.title, body=task.description,
+    )
+
+
+def comment_entry(comment, project_id):
+    return SearchEntry(
+        kind='comment', object_id=comment.pk, project_id=project_id,
+        user_story_id=comment.user_story_id, title='', body=comment.content,
+    )
+
+
+def save_entries(entries):
+    """Inserta o actualiza entradas por (kind, object_id) en una sola sentencia."""
+    SearchEntry.objects.bulk_create(
+        entries,
+        batch_size=INDEX_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['project', 'user_story', 'title', 'body'],
+    )
+
+
+def index_story(story):
+    save_entries([story_entry(story)])
+    # Tareas y comentarios heredan el proyecto de la historia
+    SearchEntry.objects.filter(user_story=story).exclude(project_id=story.project_id).update(
+        project_id=story.project_id
+    )
+
+
+def _story_project(story_id):
+    return UserStory.objects.filter(pk=story_id).values_list('project_id', flat=True).first()
+
+
+def index_task(task):
+    save_entries([task_entry(task, _story_project(task.user_story_id))])
+
+
+def index_comment(comment):
+    save_entries([comment_entry(comment, _story_project(comment.user_story_id))])
+
+
+def unindex(kind, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def _scoped(queryset, lookup, project_ids):
+    return queryset if project_ids is None else queryset.filter(**{lookup: project_ids})
+
+
+def rebuild_index(project_ids=None):
+    """
+    Reindexa todo (o sólo los proyectos indicados) después de escrituras que
+    no emiten señales, como bulk_create.
+    """
+    _scoped(SearchEntry.objects.all(), 'project_id__in', project_ids).delete()
+    stories = _scoped(UserStory.objects, 'project_id__in', project_ids).only(
+        'pk', 'project_id', 'title', 'description', 'acceptance_criteria'
+    )
+    tasks = _scoped(Task.objects, 'user_story__project_id__in', project_ids).only(
+        'pk', 'user_story_id', 'title', 'description', 'user_story__project_id'
+    ).select_related('user_story')
+    comments = _scoped(Comment.objects, 'user_story__project_id__in', project_ids).only(
+        'pk', 'user_story_id', 'content', 'user_story__project_id'
+    ).select_related('user_story')
+
+    def entries():
+        for story in stories.iterator(chunk_size=INDEX_BATCH_SIZE):
+            yield story_entry(story)
+        for task in tasks.iterator(chunk_size=INDEX_BATCH_SIZE):
+            yield task_entry(task, task.user_story.project_id)
+        for comment in comments.iterator(chunk_size=INDEX_BATCH_SIZE):
+            yield comment_entry(comment, comment.user_story.project_id)
+
+    with postgres.streaming_reads():
+        batch = []
+        for entry in entries():
+            batch.append(entry)
+            if len(batch) == INDEX_BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+# ===== CONSULTA =====
+
+def terms(query):
+    """Palabras de la búsqueda, en minúsculas y sin operadores."""
+    return _TERMS.findall(query.lower())
+
+
+_SELECT = (
+    'SELECT e.id, e.kind, e.object_id, e.project_id, e.user_story_id, e.title, e.body, '
+    'p.name AS project_name, {rank} AS score '
+    'FROM projects_searchentry e '
+    'INNER JOIN projects_project p ON p.id = e.project_id '
+    '{join} WHERE {match} AND e.project_id IN ({projects}) '
+    'ORDER BY score {direction}, e.id LIMIT %s'
+)
+
+
+def _sqlite_query(words):
+    # Cada término como prefijo entre comillas: sin sintaxis FTS5 del usuario
+    return _SELECT.format(
+        rank='bm25(projects_searchentry_fts, 10.0, 1.0)',
+        join='INNER JOIN projects_searchentry_fts ON projects_searchentry_fts.rowid = e.id',
+        match='projects_searchentry_fts MATCH %s',
+        projects='{projects}',
+        direction='ASC',
+    ), ' '.join(f'"{word}"*' for word in words)
+
+
+def _postgresql_query(words):
+    return _SELECT.format(
+        rank="ts_rank(e.search_vector, to_tsquery('simple', %s))",
+        join='',
+        match="e.search_vector @@ to_tsquery('simple', %s)",
+        projects='{projects}',
+        direction='DESC',
+    ), ' & '.join(f'{word.translate(_UNACCENT)}:*' for word in words)
+
+
+def search(query, project_ids, limit=SEARCH_LIMIT):
+    """
+    Entradas que contienen todas las palabras de `query`, de la más relevante
+    a la menos, dentro de `project_ids`. Cada resultado trae project_name.
+    """
+    words = terms(query)
+    project_ids = sorted(project_ids)
+    if not words or not project_ids:
+        return []
+
+    if connection.vendor == 'sqlite':
+        sql, match = _sqlite_query(words)
+        params = [match]
+    elif connection.vendor == 'postgresql':
+        sql, match = _postgresql_query(words)
+        params = [match, match]
+    else:
+        # Sin índice de texto completo: se conserva el orden por id
+        entries = SearchEntry.objects.filter(project_id__in=project_ids).select_related('project')
+        for word in words:
+            entries = entries.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        results = list(entries.order_by('pk')[:limit])
+        for entry in results:
+            entry.project_name = entry.project.name
+        return results
+
+    sql = sql.format(projects=', '.join(['%s'] * len(project_ids)))
+    return list(SearchEntry.objects.raw(sql, [*params, *project_ids, limit]))
@@ -0,0 +1,307 @@
+"""
+Señales del módulo de proyectos.
+
+Mantienen coherentes los datos derivados (el acceso cacheado de access.py,
+el usuario cacheado de auth.py, los contadores de counters.py, los snapshots de analytics.py y el índice de
+search.py) cuando cambian los modelos, y publican los eventos en vivo de
+events.py.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Project, Sprint, UserStory, Task, Comment
+from . import access, analytics, auth, counters, events, search
+
+
+# ===== USUARIO AUTENTICADO =====
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Contraseña, is_active y permisos de staff se leen del usuario cacheado
+    auth.invalidate_user(instance.pk)
+
+
+# Campos del usuario que muestran las páginas de proyectos
+USER_DISPLAY_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=get_user_model())
+def remember_user_names(sender, instance, update_fields=None, **kwargs):
+    # El login sólo guarda last_login: sin consulta extra
+    instance._previous_names = None
+    if update_fields is None or set(update_fields) & set(USER_DISPLAY_FIELDS):
+        instance._previous_names = _previous_values(sender, instance, *USER_DISPLAY_FIELDS)
+
+
+@receiver(post_save, sender=get_user_model())
+def touch_projects_of_renamed_user(sender, instance, **kwargs):
+    """
+    Los nombres de usuario no tienen versión propia: al cambiar, se adelantan
+    los proyectos en los que el usuario aparece (y con ellos el ETag de sus
+    páginas, ver conditional.py).
+    """
+    previous = getattr(instance, '_previous_names', None)
+    if previous is None or all(previous[name] == getattr(instance, name) for name in USER_DISPLAY_FIELDS):
+        return
+    project_ids = set(Project.objects.filter(
+        Q(product_owner=instance) | Q(scrum_master=instance) | Q(team_members=instance)
+    ).values_list('pk', flat=True))
+    project_ids.update(UserStory.objects.filter(
+        Q(assigned_to=instance) | Q(created_by=instance)
+    ).values_list('project_id', flat=True))
+    project_ids.update(Task.objects.filter(assigned_to=instance).values_list('user_story__project_id', flat=True))
+    project_ids.update(Comment.objects.filter(author=instance).values_list('user_story__project_id', flat=True))
+    counters.touch(Project.objects.filter(pk__in=project_ids))
+
+
+# ===== ACCESO A PROYECTOS =====
+
+@receiver(pre_save, sender=Project)
+def remember_project_roles(sender, instance, **kwargs):
+    """Guarda el PO/SM anteriores para invalidar también su acceso."""
+    instance._previous_roles = ()
+    if instance.pk:
+        instance._previous_roles = tuple(
+            Project.objects.filter(pk=instance.pk).values_list('product_owner_id', 'scrum_master_id').first() or ()
+        )
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_roles(sender, instance, **kwargs):
+    access.invalidate_users([
+        instance.product_owner_id,
+        instance.scrum_master_id,
+        *getattr(instance, '_previous_roles', ()),
+    ])
+
+
+@receiver(pre_delete, sender=Project)
+def invalidate_deleted_project(sender, instance, **kwargs):
+    member_ids = instance.team_members.values_list('pk', flat=True)
+    access.invalidate_users([instance.product_owner_id, instance.scrum_master_id, *member_ids])
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def invalidate_team_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Invalida a los usuarios agregados o quitados de un equipo y la versión de
+    contenido de los proyectos afectados.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # instance es el usuario; pk_set son proyectos
+        access.invalidate_users([instance.pk])
+        project_ids = pk_set if pk_set is not None else instance.projects.values_list('pk', flat=True)
+    else:
+        if action == 'pre_clear':
+            access.invalidate_users(instance.team_members.values_list('pk', flat=True))
+        else:
+            access.invalidate_users(pk_set or ())
+        project_ids = [instance.pk]
+    counters.touch(Project.objects.filter(pk__in=list(project_ids)))
+
+
+# ===== CONTADORES DESNORMALIZADOS =====
+
+def _previous_values(sender, instance, *fields):
+    """Valores guardados de la fila antes de este save (None si es nueva)."""
+    if instance.pk is None:
+        return None
+    return sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Sprint)
+def remember_sprint_project(sender, instance, **kwargs):
+    instance._previous_counters = _previous_values(sender, instance, 'project_id')
+
+
+@receiver(post_save, sender=Sprint)
+def count_sprint(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_counters', None)
+    delta = counters.CounterDelta()
+    if previous and previous['project_id'] != instance.project_id:
+        # Sólo se mueve el sprint: sus historias conservan su project_id, así
+        # que los totales de historias y tareas quedan en cada proyecto
+        delta.add(Project, previous['project_id'], {'sprint_count': 1}, sign=-1)
+        delta.add(Project, instance.project_id, {'sprint_count': 1})
+    elif previous is None:
+        delta.add(Project, instance.project_id, {'sprint_count': 1})
+    else:
+        delta.add(Project, instance.project_id)
+    delta.apply()
+
+
+@receiver(post_delete, sender=Sprint)
+def uncount_sprint(sender, instance, **kwargs):
+    delta = counters.CounterDelta()
+    delta.add(Project, instance.project_id, {'sprint_count': 1}, sign=-1)
+    delta.apply()
+
+
+@receiver(pre_save, sender=UserStory)
+def remember_story_counters(sender, instance, **kwargs):
+    instance._previous_counters = _previous_values(
+        sender, instance, 'project_id', 'sprint_id', 'status', 'story_points'
+    )
+
+
+@receiver(post_save, sender=UserStory)
+def count_story(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_counters', None)
+    delta = counters.CounterDelta()
+    if previous:
+        old = counters.story_contribution(previous['status'], previous['story_points'])
+        delta.add(Project, previous['project_id'], old, sign=-1)
+        delta.add(Sprint, previous['sprint_id'], old, sign=-1)
+    new = counters.story_contribution(instance.status, instance.story_points)
+    delta.add(Project, instance.project_id, new)
+    delta.add(Sprint, instance.sprint_id, new)
+
+    # Las tareas acompañan a la historia si cambia de sprint o de proyecto
+    if previous and (previous['sprint_id'], previous['project_id']) != (instance.sprint_id, instance.project_id):
+        tasks = counters.story_task_totals(instance.pk)
+        delta.add(Project, previous['project_id'], tasks, sign=-1)
+        delta.add(Sprint, previous['sprint_id'], tasks, sign=-1)
+        delta.add(Project, instance.project_id, tasks)
+        delta.add(Sprint, instance.sprint_id, tasks)
+    delta.apply()
+
+    tracked = ('sprint_id', 'status', 'story_points')
+    if previous is None or any(previous[name] != getattr(instance, name) for name in tracked):
+        analytics.record_snapshots([instance.sprint_id, previous and previous['sprint_id']])
+
+
+@receiver(post_delete, sender=UserStory)
+def uncount_story(sender, instance, **kwargs):
+    # Las tareas de la historia ya se restaron al borrarse en cascada
+    delta = counters.CounterDelta()
+    old = counters.story_contribution(instance.status, instance.story_points)
+    delta.add(Project, instance.project_id, old, sign=-1)
+    delta.add(Sprint, instance.sprint_id, old, sign=-1)
+    delta.apply()
+    analytics.record_snapshots([instance.sprint_id])
+
+
+def _story_parents(story_id):
+    return UserStory.objects.filter(pk=story_id).values('project_id', 'sprint_id').first()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_counters(sender, instance, **kwargs):
+    instance._previous_counters = _previous_values(sender, instance, 'user_story_id', 'status')
+
+
+@receiver(post_save, sender=Task)
+def count_task(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_counters', None)
+    delta = counters.CounterDelta()
+    old_sprint_id = None
+    if previous:
+        parents = _story_parents(previous['user_story_id'])
+        if parents:
+            old = counters.task_contribution(previous['status'])
+            delta.add(Project, parents['project_id'], old, sign=-1)
+            delta.add(Sprint, parents['sprint_id'], old, sign=-1)
+            old_sprint_id = parents['sprint_id']
+    parents = _story_parents(instance.user_story_id)
+    new = counters.task_contribution(instance.status)
+    delta.add(Project, parents['project_id'], new)
+    delta.add(Sprint, parents['sprint_id'], new)
+    delta.apply()
+
+    if previous is None or previous != {'user_story_id': instance.user_story_id, 'status': instance.status}:
+        analytics.record_snapshots([parents['sprint_id'], old_sprint_id])
+
+
+@receiver(post_delete, sender=Task)
+def uncount_task(sender, instance, **kwargs):
+    parents = _story_parents(instance.user_story_id)
+    if parents:
+        delta = counters.CounterDelta()
+        old = counters.task_contribution(instance.status)
+        delta.add(Project, parents['project_id'], old, sign=-1)
+        delta.add(Sprint, parents['sprint_id'], old, sign=-1)
+        delta.apply()
+        analytics.record_snapshots([parents['sprint_id']])
+
+
+# ===== ÍNDICE DE BÚSQUEDA =====
+
+# Campos de la historia que afectan a su entrada (o a la de sus hijos)
+STORY_INDEXED_FIELDS = frozenset({'title', 'description', 'acceptance_criteria', 'project', 'project_id'})
+
+
+@receiver(post_save, sender=UserStory)
+def index_story(sender, instance, update_fields=None, **kwargs):
+    # Un cambio de estado del tablero no toca el texto indexado
+    if update_fields is None or STORY_INDEXED_FIELDS & set(update_fields):
+        search.index_story(instance)
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, **kwargs):
+    search.index_task(instance)
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, **kwargs):
+    search.index_comment(instance)
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    search.unindex('task', instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    search.unindex('comment', instance.pk)
+
+
+# ===== EVENTOS EN VIVO =====
+
+@receiver(post_save, sender=Sprint)
+def publish_sprint(sender, instance, **kwargs):
+    events.sprint_changed(instance, 'saved')
+
+
+@receiver(post_delete, sender=Sprint)
+def publish_deleted_sprint(sender, instance, **kwargs):
+    events.sprint_changed(instance, 'deleted')
+
+
+@receiver(post_save, sender=UserStory)
+def publish_story(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_counters', None)
+    events.story_changed(instance, 'saved', previous and previous['sprint_id'])
+
+
+@receiver(post_delete, sender=UserStory)
+def publish_deleted_story(sender, instance, **kwargs):
+    events.story_changed(instance, 'deleted')
+
+
+@receiver(post_save, sender=Task)
+def publish_task(sender, instance, **kwargs):
+    parents = _story_parents(instance.user_story_id)
+    events.task_changed(instance, 'saved', parents and parents['sprint_id'])
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, **kwargs):
+    parents = _story_parents(instance.user_story_id)
+    events.task_changed(instance, 'deleted', parents and parents['sprint_id'])
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment(sender, instance, **kwargs):
+    events.comment_changed(instance, 'saved', instance.author.username)
+
+
+@receiver(post_delete, sender=Comment)
+def publish_deleted_comment(sender, instance, **kwargs):
+    events.comment_changed(instance, 'deleted', None)
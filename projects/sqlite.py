@@ -0,0 +1,76 @@
+"""
+SQLite en producción: escrituras serializadas y reintentos ante SQLITE_BUSY.
+
+SQLite admite un solo escritor a la vez. Con el perfil de producción
+(settings.DATABASE_PROFILE = 'production') la base trabaja en modo WAL, así
+los lectores no bloquean al escritor ni al revés, y las transacciones
+empiezan con BEGIN IMMEDIATE para tomar el lock de escritura al inicio (una
+transacción DEFERRED que lee y después escribe puede fallar con "database is
+locked" sin esperar el busy_timeout).
+
+Entre hilos del mismo proceso las escrituras se ordenan con un lock de Python
+(write_lock): esperar ahí es más barato y justo que el sondeo del
+busy_timeout. Entre procesos queda el busy_timeout y, si vence, un reintento
+con espera exponencial de la transacción completa (retry_on_busy).
+
+Mejores prácticas:
+- Pragmas aplicados al abrir cada conexión (OPTIONS['init_command'])
+- Conexiones persistentes con verificación de salud (CONN_MAX_AGE)
+- Sólo se reintenta una transacción completa, nunca una sentencia suelta
+"""
+
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+# Lock de escritura del proceso; reentrante para permitir anidar serialized()
+write_lock = threading.RLock()
+
+_BUSY_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def is_busy(exc):
+    """True si el error es SQLITE_BUSY/SQLITE_LOCKED (de Django o de sqlite3)."""
+    return isinstance(exc, (OperationalError, sqlite3.OperationalError)) and any(
+        message in str(exc) for message in _BUSY_MESSAGES
+    )
+
+
+def pragma_statements(pragmas):
+    """Sentencias PRAGMA para un diccionario {pragma: valor}."""
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def retry_on_busy(func, *args, attempts=None, backoff=None, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) y lo reintenta con espera exponencial (y
+    algo de azar) mientras SQLite responda busy. `func` debe ser una
+    transacción completa para que repetirla sea seguro.
+    """
+    attempts = settings.SQLITE_BUSY_RETRIES if attempts is None else attempts
+    backoff = settings.SQLITE_BUSY_BACKOFF if backoff is None else backoff
+    for attempt in range(attempts + 1):
+        try:
+            return func(*args, **kwargs)
+        except (OperationalError, sqlite3.OperationalError) as exc:
+            if attempt == attempts or not is_busy(exc):
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(1, 1.5))
+
+
+def serialized(func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) en una transacción con el lock de escritura
+    del proceso, reintentándola si otro proceso tiene la base ocupada. Dentro
+    de una transacción ya abierta no se reintenta: la de afuera quedó rota.
+    """
+    def attempt():
+        with write_lock, transaction.atomic(using=using):
+            return func(*args, **kwargs)
+
+    attempts = 0 if connections[using].in_atomic_block else None
+    return retry_on_busy(attempt, attempts=attempts)
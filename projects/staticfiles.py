@@ -0,0 +1,112 @@
+"""
+Pipeline de archivos estáticos: nombres con hash, paquetes CSS minificados y
+variantes precomprimidas.
+
+collectstatic con CompressedManifestStaticFilesStorage:
+1. Arma los paquetes de settings.STATIC_BUNDLES (fuentes concatenadas y
+   minificadas) y los agrega a los archivos recolectados.
+2. ManifestStaticFilesStorage copia cada archivo con el hash de su contenido
+   en el nombre (custom.css -> custom.3f2a9c.css) y reescribe las url() de
+   los CSS.
+3. Escribe junto a cada archivo con hash sus variantes .gz y, si está
+   instalado brotli, .br (sólo si son más chicas que el original).
+
+PrecompressedStaticMiddleware sirve después la variante que acepta el
+navegador con Cache-Control immutable de un año: un cambio de contenido es
+un nombre nuevo, así que el navegador nunca necesita revalidar.
+
+Mejores prácticas:
+- Compresión al desplegar (nivel máximo), nunca por petición
+- Paquetes declarados en settings y resueltos por {% css_bundle %}
+- Sin brotli sólo se generan las variantes .gz
+"""
+
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Extensiones que vale la pena precomprimir (las imágenes y fuentes ya lo están)
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.html')
+
+# Cadenas entre comillas: el minificador no las toca
+_CSS_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE = re.compile(r'\s+')
+# Sin espacio antes de ':' (en "a :hover" es significativo)
+_CSS_AROUND = re.compile(r'\s*([{};,>])\s*')
+_CSS_AFTER = re.compile(r':\s+')
+
+
+def minify_css(source):
+    """Quita comentarios y espacios innecesarios de un CSS."""
+    source = _CSS_COMMENT.sub('', source)
+    parts = _CSS_STRING.split(source)
+    for index in range(0, len(parts), 2):
+        part = _CSS_SPACE.sub(' ', parts[index])
+        part = _CSS_AROUND.sub(r'\1', part)
+        parts[index] = _CSS_AFTER.sub(':', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def compressed_variants(content):
+    """Pares (sufijo, contenido comprimido) de las codificaciones disponibles."""
+    # mtime=0: el mismo archivo produce siempre el mismo .gz
+    yield '.gz', gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress(content, quality=11)
+
+
+def immutable_names():
+    """Nombres con hash del manifiesto (vacío si el storage no tiene manifiesto)."""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage que además arma paquetes y escribe variantes .gz/.br."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name, sources in getattr(settings, 'STATIC_BUNDLES', {}).items():
+                self.build_bundle(name, sources, paths)
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            for name in sorted(set(self.hashed_files.values())):
+                if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                    self.compress(name)
+
+    def build_bundle(self, name, sources, paths):
+        """
+        Concatena y minifica las fuentes del paquete. Las url() relativas se
+        resuelven desde el paquete: las fuentes deben estar en su directorio.
+        """
+        chunks = []
+        for source in sources:
+            if source not in paths:
+                raise ImproperlyConfigured(f'STATIC_BUNDLES[{name!r}]: no se encontró {source!r}')
+            storage, path = paths[source]
+            with storage.open(path) as fh:
+                chunks.append(fh.read().decode('utf-8'))
+        self.replace(name, minify_css('\n'.join(chunks)).encode('utf-8'))
+        paths[name] = (self, name)
+
+    def compress(self, name):
+        with self.open(name) as fh:
+            content = fh.read()
+        for suffix, compressed in compressed_variants(content):
+            if len(compressed) < len(content):
+                self.replace(name + suffix, compressed)
+
+    def replace(self, name, content):
+        """Guarda `content` en `name` pisando el archivo anterior."""
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
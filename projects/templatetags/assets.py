@@ -0,0 +1,20 @@
+"""
+Etiquetas de los paquetes de estáticos declarados en settings.STATIC_BUNDLES.
+"""
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def css_bundle(name):
+    """
+    <link> del paquete CSS `name`: con STATIC_PIPELINE, el archivo minificado
+    con hash que arma collectstatic; sin él, un <link> por cada fuente.
+    """
+    sources = [name] if settings.STATIC_PIPELINE else settings.STATIC_BUNDLES[name]
+    return format_html_join('\n    ', '<link rel="stylesheet" href="{}">', ((static(path),) for path in sources))
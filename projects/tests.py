@@ -1,3 +1,1652 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, CommandError
+from django.db import OperationalError, connection, connections, router
+from django.http import HttpResponse, QueryDict
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+
+from .models import Project, Sprint, UserStory, Task, Comment, SprintSnapshot, SearchEntry, Job
+from .access import (
+    load_project_roles, ROLE_PRODUCT_OWNER, ROLE_SCRUM_MASTER, ROLE_TEAM_MEMBER,
+)
+from .analytics import record_snapshots, sprint_progress, project_velocity
+from .counters import rebuild
+from .instrumentation import RequestMetrics, fingerprint
+from .pagination import KeysetPaginator
+from . import auth, benchmarks, bulk, events, imports, jobs, postgres, queries, routers, search, sqlite, staticfiles, urls
+from .middleware import PrecompressedStaticMiddleware, ReplicaRoutingMiddleware, SQLiteWriteSerializationMiddleware
+from .routers import PrimaryReplicaRouter
+
+
+class ProjectsTestMixin:
+    """Datos mínimos compartidos por los tests del módulo de proyectos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='demo1234')
+        cls.master = User.objects.create_user('master', password='demo1234')
+        cls.dev = User.objects.create_user('dev', password='demo1234')
+        cls.outsider = User.objects.create_user('outsider', password='demo1234')
+        cls.project = Project.objects.create(
+            name='Proyecto',
+            description='Descripción',
+            start_date=date(2024, 1, 1),
+            product_owner=cls.owner,
+            scrum_master=cls.master,
+        )
+        cls.project.team_members.add(cls.dev)
+        cls.sprint = Sprint.objects.create(
+            project=cls.project,
+            name='Sprint 1',
+            goal='Objetivo',
+            number=1,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 14),
+        )
+        cls.story = cls.make_story()
+
+    def setUp(self):
+        # La caché no participa del rollback de cada test
+        cache.clear()
+
+    @classmethod
+    def make_story(cls, **kwargs):
+        defaults = {
+            'project': cls.project,
+            'sprint': cls.sprint,
+            'title': 'Historia',
+            'description': 'Como dev, quiero algo para algo',
+            'acceptance_criteria': 'Funciona',
+            'story_points': 3,
+            'assigned_to': cls.dev,
+            'created_by': cls.owner,
+        }
+        defaults.update(kwargs)
+        return UserStory.objects.create(**defaults)
+
+    def add_rows(self, count):
+        """Agrega historias con tareas y comentarios para medir el escalado."""
+        offset = UserStory.objects.count()
+        for i in range(offset, offset + count):
+            story = self.make_story(title=f'Historia {i}')
+            Task.objects.create(user_story=story, title=f'Tarea {i}', assigned_to=self.dev)
+            Task.objects.create(user_story=self.story, title=f'Tarea extra {i}', assigned_to=self.dev)
+            Comment.objects.create(user_story=self.story, author=self.dev, content=f'Comentario {i}')
+            member = User.objects.create_user(f'member{i}')
+            self.project.team_members.add(member)
+
+
+class QueryBudgetTests(ProjectsTestMixin, TestCase):
+    """
+    Cada vista de lectura tiene un presupuesto de consultas fijo que no
+    depende de la cantidad de filas mostradas.
+    """
+
+    # Incluye la sesión, el usuario autenticado que carga el middleware, la
+    # resolución del acceso a proyectos con la caché vacía y la consulta de
+    # validadores del GET condicional.
+    BUDGETS = {
+        'dashboard': 7,
+        'project_list': 5,
+        'project_detail': 9,
+        'sprint_list': 6,
+        'sprint_detail': 7,
+        'sprint_board': 7,
+        'user_story_list': 6,
+        'user_story_detail': 7,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+
+    def url_for(self, name):
+        if name in ('dashboard', 'project_list'):
+            return reverse(name)
+        if name in ('project_detail', 'sprint_list', 'user_story_list'):
+            return reverse(name, args=[self.project.pk])
+        if name in ('sprint_detail', 'sprint_board'):
+            return reverse(name, args=[self.sprint.pk])
+        return reverse(name, args=[self.story.pk])
+
+    def count_queries(self, name):
+        # Presupuesto en frío: incluye resolver el acceso del usuario
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url_for(name))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_views_stay_within_budget(self):
+        for name, budget in self.BUDGETS.items():
+            with self.subTest(view=name):
+                self.assertLessEqual(self.count_queries(name), budget)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(2)
+        before = {name: self.count_queries(name) for name in self.BUDGETS}
+        self.add_rows(10)
+        after = {name: self.count_queries(name) for name in self.BUDGETS}
+        self.assertEqual(before, after)
+
+
+# Sesión y usuario desde la caché (por defecto sólo con una caché compartida)
+CACHED_SESSIONS = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+    'AUTHENTICATION_BACKENDS': ['projects.auth.CachedModelBackend'],
+}
+
+
+@override_settings(**CACHED_SESSIONS)
+class SessionUserCacheTests(ProjectsTestMixin, TestCase):
+    """Con la caché caliente, una página no consulta django_session ni auth_user."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+
+    def page_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('project_list'))
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        cache.clear()
+        _, cold = self.page_queries()
+        response, warm = self.page_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'], self.dev)
+        per_request = [sql for sql in cold if 'django_session' in sql or 'FROM "auth_user" WHERE' in sql]
+        self.assertEqual(len(per_request), 2)
+        self.assertFalse([sql for sql in warm if sql in per_request])
+
+    def test_user_changes_invalidate_cached_user(self):
+        self.page_queries()
+        key = auth.CACHE_KEY.format(user_id=self.dev.pk)
+        self.assertIsNotNone(cache.get(key))
+
+        self.dev.first_name = 'Dev'
+        self.dev.save()
+        self.assertIsNone(cache.get(key))
+        response, _ = self.page_queries()
+        self.assertEqual(response.context['user'].first_name, 'Dev')
+
+        # Desactivar al usuario o cambiar su contraseña cierra la sesión
+        self.dev.is_active = False
+        self.dev.save()
+        response, _ = self.page_queries()
+        self.assertEqual(response.status_code, 302)
+
+        self.dev.is_active = True
+        self.dev.save()
+        self.client.force_login(self.dev)
+        self.page_queries()
+        self.dev.set_password('otra-clave-1234')
+        self.dev.save()
+        response, _ = self.page_queries()
+        self.assertEqual(response.status_code, 302)
+
+    def test_cached_user_has_no_password_hash(self):
+        self.page_queries()
+        cached = cache.get(auth.CACHE_KEY.format(user_id=self.dev.pk))
+        self.assertNotIn('password', cached['fields'])
+        self.assertNotIn(self.dev.password, repr(cached))
+
+        # La sesión sigue válida con el usuario reconstruido desde la caché
+        response, warm = self.page_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([sql for sql in warm if 'FROM "auth_user" WHERE' in sql])
+
+        # Cambiar la contraseña lee el hash real de la base y mantiene la sesión
+        user = auth.CachedModelBackend().get_user(self.dev.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('demo1234'))
+        user.set_password('otra-clave-1234')
+        user.save()
+        session = self.client.session
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        response, _ = self.page_queries()
+        self.assertEqual(response.status_code, 200)
+
+
+class KeysetPaginationTests(ProjectsTestMixin, TestCase):
+    """La paginación por cursor recorre cada fila una sola vez y en orden."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+        for i, priority in enumerate(['LOW', 'HIGH', 'MEDIUM'] * 4):
+            self.make_story(title=f'Historia {i}', priority=priority)
+
+    def test_walks_every_story_in_meta_ordering(self):
+        queryset = self.project.user_stories.all()
+        expected = list(queryset.order_by('-priority', '-created_at', '-pk'))
+        paginator = KeysetPaginator(queryset, per_page=5)
+
+        seen, params = [], QueryDict()
+        while True:
+            page = paginator.get_page(params)
+            seen.extend(page.object_list)
+            if not page.has_next:
+                break
+            params = QueryDict(page.next_querystring)
+        self.assertEqual(seen, expected)
+
+        # Volver hacia atrás desde la última página reproduce la anterior.
+        previous = paginator.get_page(QueryDict(page.previous_querystring))
+        self.assertEqual(previous.object_list, expected[5:10])
+        self.assertTrue(previous.has_next)
+
+    def test_cursor_keeps_filters_and_invalid_cursor_restarts(self):
+        url = reverse('user_story_list', args=[self.project.pk])
+        response = self.client.get(url, {'priority': 'HIGH'})
+        self.assertEqual(len(response.context['user_stories']), 4)
+
+        paginator = KeysetPaginator(self.project.user_stories.all(), per_page=2)
+        page = paginator.get_page(QueryDict('priority=HIGH'))
+        self.assertIn('priority=HIGH', page.next_querystring)
+
+        response = self.client.get(url, {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['page'].has_previous)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Los planes EXPLAIN verificados son de SQLite')
+class IndexUsageTests(ProjectsTestMixin, TestCase):
+    """Las consultas calientes usan índices y no ordenan en memoria."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        for line in plan.splitlines():
+            if ' SCAN ' in f' {line} ':
+                self.assertIn('USING', line, plan)
+
+    def test_hot_queries_use_indexes(self):
+        stories = self.project.user_stories.order_by('-priority', '-created_at', '-pk')
+        cases = [
+            (queries.user_story_list_queryset(self.project).order_by('-priority', '-created_at', '-pk'),
+             'story_project_order_idx'),
+            (stories.filter(status='TODO', priority='HIGH'), 'story_project_status_idx'),
+            (stories.exclude(status='DONE'), 'story_open_idx'),
+            (queries.sprint_stories(self.sprint), 'story_sprint_order_idx'),
+            (queries.assigned_stories(self.dev), 'story_assignee_order_idx'),
+            (queries.assigned_tasks(self.dev), 'task_assignee_status_idx'),
+            (queries.story_tasks(self.story), 'task_story_status_idx'),
+            (queries.story_comments(self.story), 'comment_story_created_idx'),
+            (Sprint.objects.filter(project=self.project).order_by('-number'), 'project_id_number'),
+            (Project.objects.order_by('-created_at', '-pk'), 'project_created_idx'),
+        ]
+        for queryset, index_name in cases:
+            with self.subTest(index=index_name):
+                self.assertUsesIndex(queryset, index_name)
+
+
+class ProjectAccessTests(ProjectsTestMixin, TestCase):
+    """El acceso se resuelve una vez, se cachea y se invalida al cambiar roles."""
+
+    def roles(self, user):
+        return load_project_roles(user.pk).get(self.project.pk, frozenset())
+
+    def test_roles_per_user(self):
+        self.assertEqual(self.roles(self.owner), {ROLE_PRODUCT_OWNER})
+        self.assertEqual(self.roles(self.master), {ROLE_SCRUM_MASTER})
+        self.assertEqual(self.roles(self.dev), {ROLE_TEAM_MEMBER})
+        self.assertEqual(self.roles(self.outsider), frozenset())
+
+    def test_cached_roles_skip_the_database(self):
+        self.roles(self.dev)
+        with self.assertNumQueries(0):
+            self.roles(self.dev)
+
+    def test_invalidated_on_membership_and_role_changes(self):
+        self.assertFalse(self.roles(self.outsider))
+        self.project.team_members.add(self.outsider)
+        self.assertEqual(self.roles(self.outsider), {ROLE_TEAM_MEMBER})
+
+        self.outsider.projects.remove(self.project)
+        self.assertFalse(self.roles(self.outsider))
+
+        self.roles(self.owner)
+        self.project.product_owner = self.outsider
+        self.project.save()
+        self.assertFalse(self.roles(self.owner))
+        self.assertEqual(self.roles(self.outsider), {ROLE_PRODUCT_OWNER})
+
+    def test_views_deny_users_outside_the_project(self):
+        self.client.force_login(self.outsider)
+        urls = [
+            reverse('project_detail', args=[self.project.pk]),
+            reverse('sprint_detail', args=[self.sprint.pk]),
+            reverse('user_story_list', args=[self.project.pk]),
+            reverse('user_story_detail', args=[self.story.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertRedirects(self.client.get(url), reverse('project_list'))
+
+    def test_only_managers_can_update_project(self):
+        self.client.force_login(self.dev)
+        url = reverse('project_update', args=[self.project.pk])
+        self.assertRedirects(self.client.get(url), reverse('project_detail', args=[self.project.pk]))
+        self.client.force_login(self.master)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class DenormalizedCounterTests(ProjectsTestMixin, TestCase):
+    """Los contadores se mantienen con cada cambio y coinciden con los reales."""
+
+    def assertCountersConsistent(self):
+        self.assertEqual(rebuild(verify_only=True), [])
+
+    def test_story_and_task_changes_update_counters(self):
+        self.assertCountersConsistent()
+        story = self.make_story(story_points=5)
+        task = Task.objects.create(user_story=story, title='Tarea')
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.story_count, self.project.story_points_total), (2, 8))
+        self.assertEqual(self.project.task_count, 1)
+
+        story.status = 'DONE'
+        story.save()
+        task.status = 'DONE'
+        task.save()
+        self.sprint.refresh_from_db()
+        self.assertEqual((self.sprint.story_done_count, self.sprint.story_points_done), (1, 5))
+        self.assertEqual(self.sprint.task_done_count, 1)
+        self.assertCountersConsistent()
+
+        # Mover la historia al backlog saca también sus tareas del sprint
+        story.sprint = None
+        story.save()
+        self.sprint.refresh_from_db()
+        self.assertEqual((self.sprint.story_count, self.sprint.task_count), (1, 0))
+        self.assertCountersConsistent()
+
+        story.delete()
+        Sprint.objects.create(
+            project=self.project, name='Sprint 2', goal='Objetivo', number=2,
+            start_date=date(2024, 1, 15), end_date=date(2024, 1, 28),
+        )
+        self.assertCountersConsistent()
+
+    def test_moving_sprint_keeps_story_totals_in_their_project(self):
+        other = Project.objects.create(
+            name='Otro', description='Descripción', start_date=date(2024, 1, 1),
+            product_owner=self.owner, scrum_master=self.master,
+        )
+        Task.objects.create(user_story=self.story, title='Tarea')
+        versions = dict(Project.objects.values_list('pk', 'content_version'))
+        self.sprint.project = other
+        self.sprint.save()
+        self.assertCountersConsistent()
+        self.project.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.project.sprint_count, other.sprint_count), (0, 1))
+        self.assertEqual((self.project.story_count, other.story_count), (1, 0))
+        # Las páginas de ambos proyectos muestran el cambio
+        self.assertGreater(self.project.content_version, versions[self.project.pk])
+        self.assertGreater(other.content_version, versions[other.pk])
+
+    def test_full_save_does_not_overwrite_counters(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        self.make_story()
+        stale.name = 'Renombrado'
+        stale.save()
+        self.assertCountersConsistent()
+
+    def test_command_verifies_and_repairs(self):
+        Project.objects.filter(pk=self.project.pk).update(story_count=99)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_counters', verify=True, stdout=StringIO())
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assertCountersConsistent()
+
+
+class SprintAnalyticsTests(ProjectsTestMixin, TestCase):
+    """Burndown y velocidad se leen de los snapshots diarios."""
+
+    def test_status_transition_records_snapshot(self):
+        self.story.status = 'DONE'
+        self.story.save()
+        snapshot = SprintSnapshot.objects.get(sprint=self.sprint)
+        self.assertEqual((snapshot.story_points_done, snapshot.story_points_remaining), (3, 0))
+
+    def test_burndown_carries_forward_missing_days(self):
+        self.make_story(story_points=5)
+        record_snapshots([self.sprint.pk], day=date(2024, 1, 1))
+        UserStory.objects.filter(pk=self.story.pk).update(status='DONE')
+        rebuild()
+        record_snapshots([self.sprint.pk], day=date(2024, 1, 4))
+
+        series = sprint_progress(self.sprint, today=date(2024, 1, 5))
+        self.assertEqual([day['remaining'] for day in series], [8, 8, 8, 5, 5])
+        self.assertEqual(series[0]['ideal'], 8)
+        self.assertEqual(series[-1]['done'], 3)
+
+    def test_velocity_forecast(self):
+        for number, velocity in ((2, 10), (3, 20), (4, 30)):
+            Sprint.objects.create(
+                project=self.project, name=f'Sprint {number}', goal='Objetivo', number=number,
+                status='COMPLETED', velocity=velocity,
+                start_date=date(2024, 1, 1), end_date=date(2024, 1, 14),
+            )
+        self.make_story(story_points=40)
+        self.project.refresh_from_db()
+
+        velocity = project_velocity(self.project)
+        self.assertEqual(velocity['series'], [(2, 10), (3, 20), (4, 30)])
+        self.assertEqual(velocity['average'], 20)
+        self.assertEqual(velocity['trend'], 10)
+        self.assertEqual(velocity['next_velocity'], 40)
+        self.assertEqual(velocity['sprints_left'], 3)
+
+
+class GenerateDatasetTests(TestCase):
+    """El generador crea el volumen pedido con contadores consistentes."""
+
+    def test_generates_requested_rows(self):
+        out = StringIO()
+        call_command(
+            'generate_dataset', projects=2, users=6, members=4, sprints=3,
+            stories_per_sprint=5, backlog_stories=4, tasks_per_story=2,
+            comments_per_story=1, batch_size=7, stdout=out,
+        )
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(Sprint.objects.count(), 6)
+        self.assertEqual(UserStory.objects.count(), 2 * (3 * 5 + 4))
+        self.assertEqual(Task.objects.count(), 2 * UserStory.objects.count())
+        self.assertEqual(rebuild(verify_only=True), [])
+        self.assertIn('filas/s', out.getvalue())
+
+    def test_same_seed_is_reproducible(self):
+        options = {'projects': 1, 'users': 4, 'members': 3, 'sprints': 2, 'stories_per_sprint': 4,
+                   'backlog_stories': 2, 'tasks_per_story': 1, 'stdout': StringIO()}
+        call_command('generate_dataset', **options)
+        first = list(UserStory.objects.order_by('pk').values_list('priority', 'status', 'story_points'))
+        call_command('generate_dataset', clean=True, **options)
+        second = list(UserStory.objects.order_by('pk').values_list('priority', 'status', 'story_points'))
+        self.assertEqual(first, second)
+
+
+class BenchmarkTests(ProjectsTestMixin, TestCase):
+    """El benchmark cubre todas las rutas con nombre y puede ejecutarse."""
+
+    def test_every_named_route_has_a_scenario(self):
+        routes = {pattern.name for pattern in urls.urlpatterns if pattern.name}
+        self.assertEqual(routes - {scenario.route for scenario in benchmarks.SCENARIOS}, set())
+
+    def test_run_reports_metrics_per_route(self):
+        Task.objects.create(user_story=self.story, title='Tarea')
+        Comment.objects.create(user_story=self.story, author=self.dev, content='Comentario')
+        results = benchmarks.run(repeat=1)
+        self.assertEqual(len(results), len(benchmarks.SCENARIOS))
+        for scenario in benchmarks.SCENARIOS:
+            with self.subTest(route=scenario.name):
+                # Un POST que vuelve a mostrar el formulario con errores no escribió
+                self.assertEqual(results[scenario.name]['status'], scenario.status)
+                self.assertGreater(results[scenario.name]['queries'], 0)
+
+    def test_concurrent_comparison_of_async_views(self):
+        # Como en `benchmark --concurrency`: después de la corrida secuencial
+        benchmarks.run(repeat=1, scenarios=[s for s in benchmarks.SCENARIOS if s.route == 'sprint_create'])
+        self.assertEqual(benchmarks.build_context()['sprint'], self.sprint)
+        results = benchmarks.run_concurrent(concurrency=3, total=6)
+        self.assertEqual(set(results), {route for pair in benchmarks.ASYNC_PAIRS for route in pair[:2]})
+        for name, row in results.items():
+            with self.subTest(route=name):
+                self.assertEqual(row['status'], 200)
+                self.assertGreater(row['requests_per_second'], 0)
+
+
+class RequestInstrumentationTests(ProjectsTestMixin, TestCase):
+    """El middleware expone métricas y registra las peticiones lentas."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('user_story_detail', args=[self.story.pk]))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'total;dur=[\d.]+')
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(timing, r'tpl;dur=[\d.]+')
+        with override_settings(SERVER_TIMING_HEADER=False):
+            response = self.client.get(reverse('user_story_detail', args=[self.story.pk]))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_fingerprint_groups_repeated_queries(self):
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            for story in UserStory.objects.all():
+                list(User.objects.filter(pk__in=[story.created_by_id, story.assigned_to_id]))
+            list(User.objects.filter(pk__in=[self.owner.pk]))
+        (sql, count), = metrics.duplicates()
+        self.assertEqual(count, 2)
+        self.assertIn('IN (...)', sql)
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)'), 'SELECT 1 FROM t WHERE id IN (...)')
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('projects.slow_requests', level='WARNING') as logs:
+            self.client.get(reverse('project_list'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'project_list')
+        self.assertGreater(record['queries'], 0)
+        self.assertIsNotNone(record['slowest_sql'])
+
+
+class FragmentCacheTests(ProjectsTestMixin, TestCase):
+    """Los fragmentos se sirven de la caché hasta que cambia la versión del objeto."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+
+    def render(self, name, pk):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name, args=[pk]))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode(), len(ctx)
+
+    def test_warm_project_detail_skips_section_queries(self):
+        _, cold = self.render('project_detail', self.project.pk)
+        _, warm = self.render('project_detail', self.project.pk)
+        self.assertLess(warm, cold)
+
+    def test_child_writes_bump_versions(self):
+        project_version = Project.objects.get(pk=self.project.pk).cache_version
+        sprint_version = Sprint.objects.get(pk=self.sprint.pk).cache_version
+        Task.objects.create(user_story=self.story, title='Tarea')
+        self.assertNotEqual(Project.objects.get(pk=self.project.pk).cache_version, project_version)
+        self.assertNotEqual(Sprint.objects.get(pk=self.sprint.pk).cache_version, sprint_version)
+
+    def test_story_change_refreshes_fragments(self):
+        self.render('project_detail', self.project.pk)
+        self.render('sprint_detail', self.sprint.pk)
+        self.make_story(title='Historia nueva')
+        content, _ = self.render('project_detail', self.project.pk)
+        self.assertIn('Historia nueva', content)
+        content, _ = self.render('sprint_detail', self.sprint.pk)
+        self.assertIn('Historia nueva', content)
+
+    def test_team_change_refreshes_member_list(self):
+        self.render('project_detail', self.project.pk)
+        self.project.team_members.add(self.outsider)
+        content, _ = self.render('project_detail', self.project.pk)
+        self.assertIn('outsider', content)
+
+
+@override_settings(**CACHED_SESSIONS)
+class ConditionalGetTests(ProjectsTestMixin, TestCase):
+    """Las vistas de lectura responden 304 con una consulta si nada cambió."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+        # La primera página fija la cookie CSRF, que forma parte del ETag
+        self.client.get(reverse('dashboard'))
+
+    def revalidate(self, url, response):
+        return self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+
+    def test_unchanged_pages_return_304(self):
+        urls = [
+            reverse('dashboard'),
+            reverse('project_list'),
+            reverse('project_detail', args=[self.project.pk]),
+            reverse('sprint_list', args=[self.project.pk]),
+            reverse('sprint_detail', args=[self.sprint.pk]),
+            reverse('user_story_list', args=[self.project.pk]),
+            reverse('user_story_detail', args=[self.story.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('private', response['Cache-Control'])
+                # Sólo la consulta de validadores: sesión, usuario y acceso
+                # salen de la caché
+                with self.assertNumQueries(1):
+                    self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+    def test_child_changes_invalidate(self):
+        url = reverse('user_story_detail', args=[self.story.pk])
+        response = self.client.get(url)
+        Comment.objects.create(user_story=self.story, author=self.dev, content='Nuevo')
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        url = reverse('project_detail', args=[self.project.pk])
+        response = self.client.get(url)
+        Task.objects.create(user_story=self.story, title='Tarea')
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_related_rows_invalidate(self):
+        url = reverse('user_story_detail', args=[self.story.pk])
+        response = self.client.get(url)
+        self.sprint.name = 'Sprint renombrado'
+        self.sprint.save()
+        response = self.assert_changed(url, response, 'Sprint renombrado')
+
+        self.owner.username = 'po_renombrado'
+        self.owner.save()
+        self.assert_changed(url, response, 'po_renombrado')
+
+        # Dashboard: el título de la historia de una tarea asignada
+        story = self.make_story(title='Historia ajena', assigned_to=self.owner)
+        Task.objects.create(user_story=story, title='Tarea propia', assigned_to=self.dev)
+        response = self.client.get(reverse('dashboard'))
+        story.title = 'Historia renombrada'
+        story.save()
+        self.assert_changed(reverse('dashboard'), response, 'Historia renombrada')
+
+    def assert_changed(self, url, response, text):
+        fresh = self.revalidate(url, response)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertContains(fresh, text)
+        return fresh
+
+    def test_login_does_not_touch_projects(self):
+        self.project.refresh_from_db()
+        version = self.project.content_version
+        with self.assertNumQueries(1):
+            self.dev.save(update_fields=['last_login'])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.content_version, version)
+
+    def test_etag_is_private_to_user_and_query(self):
+        url = reverse('user_story_list', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertNotEqual(self.client.get(url, {'status': 'DONE'})['ETag'], etag)
+        self.client.force_login(self.owner)
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_no_conditional_response_without_access(self):
+        self.client.force_login(self.outsider)
+        response = self.client.get(reverse('project_detail', args=[self.project.pk]))
+        self.assertRedirects(response, reverse('project_list'))
+
+
+class ApiTests(ProjectsTestMixin, TestCase):
+    """La API devuelve sólo lo pedido, sin N+1 y paginada por cursor."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+
+    def get_json(self, name, *args, **params):
+        response = self.client.get(reverse(name, args=args), params)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, json.loads(body)
+
+    def test_sparse_fieldsets(self):
+        _, data = self.get_json('api_project_detail', self.project.pk, fields='id,name')
+        self.assertEqual(data, {'id': self.project.pk, 'name': 'Proyecto'})
+        response, data = self.get_json('api_project_list', fields='id,nope')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nope', data['error'])
+
+    def test_expansion_does_not_query_per_row(self):
+        for i in range(3):
+            story = self.make_story(title=f'Historia {i}')
+            Task.objects.create(user_story=story, title='Tarea', assigned_to=self.dev)
+        url = reverse('api_story_list')
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'expand': 'assigned_to,sprint,tasks'})
+            results = json.loads(b''.join(response.streaming_content))['results']
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]['assigned_to']['username'], 'dev')
+        # En frío: usuario, acceso, historias con JOIN y prefetch de tareas
+        # (la consulta de la sesión depende de SESSION_ENGINE)
+        app_queries = [query for query in ctx.captured_queries if 'django_session' not in query['sql']]
+        self.assertEqual(len(app_queries), 4)
+
+        _, data = self.get_json('api_project_detail', self.project.pk, expand='team_members')
+        self.assertEqual(data['team_members'], [
+            {'id': self.dev.pk, 'username': 'dev', 'first_name': '', 'last_name': ''},
+        ])
+        self.assertEqual(data['product_owner'], self.owner.pk)
+
+    def test_keyset_pagination_walks_every_row(self):
+        for i in range(6):
+            self.make_story(title=f'Historia {i}')
+        seen, url = [], reverse('api_story_list') + '?fields=id&limit=3'
+        while url:
+            response = self.client.get(url)
+            data = json.loads(b''.join(response.streaming_content))
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(sorted(seen), sorted(UserStory.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_scoped_to_visible_projects(self):
+        self.client.force_login(self.outsider)
+        _, data = self.get_json('api_task_list')
+        self.assertEqual(data['results'], [])
+        response, _ = self.get_json('api_story_detail', self.story.pk)
+        self.assertEqual(response.status_code, 404)
+        self.client.logout()
+        response, _ = self.get_json('api_project_list')
+        self.assertEqual(response.status_code, 401)
+
+
+class BacklogExportTests(ProjectsTestMixin, TestCase):
+    """El backlog se exporta en streaming con sus conteos."""
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.create(user_story=self.story, title='Tarea', status='DONE')
+        Task.objects.create(user_story=self.story, title='Otra')
+        Comment.objects.create(user_story=self.story, author=self.dev, content='Comentario')
+        self.make_story(title='Sin sprint', sprint=None, assigned_to=None)
+
+    def test_csv_view_streams_rows_with_counts(self):
+        self.client.force_login(self.dev)
+        response = self.client.get(reverse('backlog_export', args=[self.project.pk]), {'format': 'csv'})
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 2)
+        row = next(row for row in rows if row['id'] == str(self.story.pk))
+        self.assertEqual((row['task_count'], row['task_done_count'], row['comment_count']), ('2', '1', '1'))
+        self.assertEqual((row['sprint_number'], row['assigned_to']), ('1', 'dev'))
+
+    def test_export_requires_access(self):
+        self.client.force_login(self.outsider)
+        response = self.client.get(reverse('backlog_export', args=[self.project.pk]))
+        self.assertRedirects(response, reverse('project_list'))
+
+    def test_command_writes_ndjson(self):
+        out = StringIO()
+        call_command('export_backlog', self.project.pk, format='ndjson', chunk_size=1, stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual({row['title'] for row in rows}, {'Historia', 'Sin sprint'})
+        backlog = next(row for row in rows if row['title'] == 'Sin sprint')
+        self.assertIsNone(backlog['sprint_number'])
+        self.assertEqual(backlog['task_count'], 0)
+
+
+class BacklogImportTests(ProjectsTestMixin, TestCase):
+    """La importación valida con las reglas de los forms y crea por lotes."""
+
+    CSV = (
+        'type,ref,story,story_id,title,description,acceptance_criteria,story_points,priority,status,'
+        'sprint,assigned_to,created_by,estimated_hours,author,content\n'
+        'story,A,,,Importada A,Como dev quiero A,Se ve A,5,HIGH,DONE,1,dev,,,,\n'
+        'story,B,,,Importada B,Como dev quiero B,Se ve B,3,,,,,master,,,\n'
+        'task,,A,,Tarea A,,,,,DONE,,dev,,2,,\n'
+        'comment,,B,,,,,,,,,,,,dev,Comentario B\n'
+        'task,,,{story},Tarea existente,,,,,,,,,1,,\n'
+        'story,C,,,,Sin título,X,3,,,,,,,,\n'
+        'story,D,,,Sprint inexistente,X,X,3,,,9,,,,,\n'
+        'story,E,,,Fuera del equipo,X,X,3,,,,outsider,,,,\n'
+        'task,,Z,,Historia desconocida,,,,,,,,,1,,\n'
+    )
+
+    def run_import(self, content, **kwargs):
+        from .imports import BacklogImporter, parse_csv
+        return BacklogImporter(self.project, self.owner, **kwargs).run(parse_csv(content.splitlines()))
+
+    def test_imports_valid_rows_and_reports_errors(self):
+        report = self.run_import(self.CSV.format(story=self.story.pk), batch_size=3)
+        self.assertEqual(report.created, {'UserStory': 2, 'Task': 2, 'Comment': 1})
+        self.assertEqual([line for line, _ in report.errors], [7, 8, 9, 10])
+        self.assertIn('title', report.errors[0][1])
+        self.assertIn('sprint', report.errors[1][1])
+        self.assertIn('miembro del equipo', report.errors[2][1])
+
+        story = UserStory.objects.get(title='Importada A')
+        self.assertEqual((story.sprint, story.assigned_to, story.created_by), (self.sprint, self.dev, self.owner))
+        self.assertEqual(story.tasks.get().status, 'DONE')
+        self.assertEqual(UserStory.objects.get(title='Importada B').priority, 'MEDIUM')
+        self.assertEqual(rebuild(verify_only=True), [])
+        self.sprint.refresh_from_db()
+        self.assertEqual(self.sprint.story_points_done, 5)
+
+    def test_dry_run_writes_nothing(self):
+        report = self.run_import(self.CSV.format(story=self.story.pk), dry_run=True)
+        self.assertEqual(report.created['UserStory'], 2)
+        self.assertEqual(UserStory.objects.count(), 1)
+
+    def test_one_lookup_per_batch(self):
+        rows = [self.CSV.splitlines()[0]] + [
+            f'story,R{i},,,Historia {i},Como dev quiero,Se ve,3,,,1,dev,master,,,' for i in range(30)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            self.run_import('\n'.join(rows), batch_size=10)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "projects_userstory"')]
+        self.assertEqual(len(inserts), 3)
+        # Sin los SAVEPOINT de streaming_reads() (sólo en PostgreSQL)
+        statements = [q for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))]
+        self.assertLessEqual(len(statements), 30)
+
+    def test_invalid_utf8_after_first_batch_keeps_imported_rows_consistent(self):
+        header = self.CSV.splitlines()[0]
+        # Un lote completo se importa antes de llegar a los bytes inválidos
+        rows = [
+            f'story,R{i},,,Historia {i},Como dev quiero,Se ve,3,,DONE,1,dev,master,,,'
+            for i in range(imports.BATCH_SIZE + 1)
+        ]
+        content = '\n'.join([header, *rows]).encode() + b'\nstory,X,,,Mal \xff,X,X,3,,,,,,,,\n'
+
+        self.client.force_login(self.owner)
+        url = reverse('backlog_import', args=[self.project.pk])
+        response = self.client.post(url, {'format': 'csv', 'file': SimpleUploadedFile('backlog.csv', content)})
+        self.assertFormError(response.context['form'], 'file', 'El archivo debe estar codificado en UTF-8.')
+        self.assertEqual(response.context['report'].created['UserStory'], imports.BATCH_SIZE)
+
+        call_command('runworker', '--once', '--processes', '0', stdout=StringIO())
+        self.assertEqual(rebuild(verify_only=True), [])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.story_count, imports.BATCH_SIZE + 1)
+        self.assertEqual(
+            SearchEntry.objects.filter(project=self.project, title__startswith='Historia ').count(), imports.BATCH_SIZE,
+        )
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as source:
+            source.write(content)
+        self.addCleanup(os.remove, source.name)
+        with self.assertRaises(CommandError):
+            call_command('import_backlog', self.project.pk, source.name, stdout=StringIO())
+        self.assertEqual(UserStory.objects.count(), 2 * imports.BATCH_SIZE + 1)
+        self.assertEqual(rebuild(verify_only=True), [])
+
+    def test_upload_view_and_command(self):
+        self.client.force_login(self.dev)
+        url = reverse('backlog_import', args=[self.project.pk])
+        self.assertRedirects(self.client.get(url), reverse('user_story_list', args=[self.project.pk]))
+
+        self.client.force_login(self.owner)
+        content = '{"title": "Desde NDJSON", "description": "Como PO", "acceptance_criteria": "OK"}\nno es json\n'
+        upload = SimpleUploadedFile('backlog.ndjson', content.encode())
+        content_version = self.project.content_version
+        response = self.client.post(url, {'format': 'ndjson', 'file': upload})
+        report = response.context['report']
+        self.assertEqual(report.created['UserStory'], 1)
+        self.assertEqual(report.errors[0][0], 2)
+        self.assertContains(response, f'trabajo #{report.refresh_job.pk}')
+
+        # La petición sólo adelanta versiones; el recálculo queda en la cola
+        self.project.refresh_from_db()
+        self.assertGreater(self.project.content_version, content_version)
+        self.assertNotEqual(rebuild(verify_only=True), [])
+        self.assertEqual(Job.objects.get().name, 'refresh_project')
+        call_command('runworker', '--once', '--processes', '0', stdout=StringIO())
+        self.assertEqual(Job.objects.get().status, 'DONE')
+        self.assertEqual(rebuild(verify_only=True), [])
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as source:
+            source.write(self.CSV.format(story=self.story.pk))
+        self.addCleanup(os.remove, source.name)
+        out = StringIO()
+        call_command('import_backlog', self.project.pk, source.name, stdout=out)
+        self.assertIn('UserStory: 2', out.getvalue())
+
+
+@skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Índice de texto completo de SQLite o PostgreSQL')
+class SearchTests(ProjectsTestMixin, TestCase):
+    """El índice se mantiene con señales y la búsqueda respeta el acceso."""
+
+    def results(self, query, project_ids=None):
+        ids = [self.project.pk] if project_ids is None else project_ids
+        return [(entry.kind, entry.object_id) for entry in search.search(query, ids)]
+
+    def test_ranks_title_matches_first_and_matches_prefixes(self):
+        body = self.make_story(title='Reporte', description='Exportar la facturación mensual')
+        title = self.make_story(title='Facturación electrónica', description='Como contador')
+        self.assertEqual(self.results('facturacion'), [('story', title.pk), ('story', body.pk)])
+        self.assertEqual(self.results('factura mensual'), [('story', body.pk)])
+        self.assertEqual(self.results('"OR" *'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        task = Task.objects.create(user_story=self.story, title='Migrar servidor', assigned_to=self.dev)
+        comment = Comment.objects.create(user_story=self.story, author=self.dev, content='Revisar migración')
+        self.assertEqual(self.results('migrar'), [('task', task.pk)])
+
+        task.title = 'Configurar servidor'
+        task.save()
+        self.assertEqual(self.results('migrar'), [])
+        self.assertEqual(self.results('servidor'), [('task', task.pk)])
+
+        comment.delete()
+        task.delete()
+        self.assertEqual(self.results('servidor revisar'), [])
+        self.story.delete()
+        self.assertFalse(SearchEntry.objects.exists())
+
+    def test_scoped_by_access_and_view(self):
+        other = Project.objects.create(
+            name='Otro', description='X', start_date=date(2024, 1, 1),
+            product_owner=self.outsider, scrum_master=self.outsider,
+        )
+        hidden = UserStory.objects.create(
+            project=other, title='Historia secreta', description='X', acceptance_criteria='X', created_by=self.outsider,
+        )
+        self.assertEqual(self.results('secreta'), [])
+        self.assertEqual(self.results('secreta', [other.pk]), [('story', hidden.pk)])
+
+        self.client.force_login(self.dev)
+        response = self.client.get(reverse('search'), {'q': 'historia'})
+        self.assertEqual([entry.object_id for entry in response.context['results']], [self.story.pk])
+        self.assertContains(response, self.project.name)
+
+    def test_rebuild_after_bulk_create(self):
+        UserStory.objects.bulk_create([UserStory(
+            project=self.project, title='Masiva', description='X', acceptance_criteria='X', created_by=self.owner,
+        )])
+        self.assertEqual(self.results('masiva'), [])
+        call_command('rebuild_search_index', '--project', self.project.pk, stdout=StringIO())
+        self.assertEqual(len(self.results('masiva')), 1)
+        self.assertEqual(SearchEntry.objects.count(), 2)
+
+
+class SprintBoardTests(ProjectsTestMixin, TestCase):
+    """El tablero agrupa por estado y mover una tarjeta recarga dos columnas."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+        self.done = self.make_story(title='Terminada', status='DONE', story_points=5)
+        Task.objects.create(user_story=self.done, title='Hecha', status='DONE', assigned_to=self.dev)
+        Task.objects.create(user_story=self.done, title='Pendiente', assigned_to=self.dev)
+
+    def test_groups_stories_by_status(self):
+        response = self.client.get(reverse('sprint_board', args=[self.sprint.pk]))
+        columns = {column.status: column for column in response.context['columns']}
+        self.assertEqual(list(columns), [status for status, _ in UserStory.STATUS_CHOICES])
+        self.assertEqual([story.pk for story in columns['BACKLOG'].stories], [self.story.pk])
+        self.assertEqual((columns['DONE'].points, columns['DONE'].stories[0].task_done), (5, 1))
+        self.assertEqual(columns['DONE'].stories[0].task_total, 2)
+
+    def test_move_updates_story_and_returns_changed_columns(self):
+        url = reverse('sprint_board_move', args=[self.sprint.pk])
+        response = self.client.post(url, {'story': self.story.pk, 'status': 'IN_PROGRESS'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['columns']), {'BACKLOG', 'IN_PROGRESS'})
+        self.assertIn(self.story.title, response.json()['columns']['IN_PROGRESS'])
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.status, 'IN_PROGRESS')
+
+        response = self.client.post(url, {'story': self.done.pk, 'status': 'TODO'})
+        self.sprint.refresh_from_db()
+        self.assertEqual(self.sprint.story_points_done, 0)
+        self.assertEqual(rebuild(verify_only=True), [])
+
+        self.assertEqual(self.client.post(url, {'story': self.story.pk, 'status': 'NOPE'}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.client.force_login(self.outsider)
+        self.assertEqual(self.client.post(url, {'story': self.story.pk, 'status': 'DONE'}).status_code, 403)
+
+
+class RecordingBroker(events.Broker):
+    """Broker de prueba: guarda (canal, evento) en lugar de repartirlos."""
+
+    published = []
+
+    def publish(self, channel, event):
+        self.published.append((channel, event))
+
+
+class LiveEventTests(ProjectsTestMixin, TestCase):
+    """Las señales publican eventos compactos y el stream SSE los entrega."""
+
+    @override_settings(EVENT_BROKER='projects.tests.RecordingBroker')
+    def test_saves_publish_after_commit(self):
+        RecordingBroker.published = []
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(user_story=self.story, title='Nueva', assigned_to=self.dev)
+            self.assertEqual(RecordingBroker.published, [])
+        channels = [channel for channel, _ in RecordingBroker.published]
+        self.assertEqual(channels, [f'story:{self.story.pk}', f'sprint:{self.sprint.pk}'])
+        self.assertEqual(RecordingBroker.published[0][1]['model'], 'task')
+        self.assertEqual(RecordingBroker.published[0][1]['pk'], task.pk)
+
+        RecordingBroker.published = []
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user_story=self.story, author=self.dev, content='Hola')
+        [(channel, event)] = RecordingBroker.published
+        self.assertEqual((channel, event['author'], event['content']), (f'story:{self.story.pk}', 'dev', 'Hola'))
+
+    def test_broker_delivers_only_to_subscribed_channels(self):
+        broker = events.InProcessBroker()
+
+        async def receive():
+            subscription = broker.subscribe(['story:1'])
+            broker.publish('story:2', {'id': 1})
+            await asyncio.to_thread(broker.publish, 'story:1', {'id': 2})
+            event = await subscription.get(1)
+            subscription.close()
+            return event, broker.subscriber_count('story:1')
+
+        self.assertEqual(asyncio.run(receive()), ({'id': 2}, 0))
+
+    @override_settings(EVENT_STREAM_MAX_SECONDS=2, EVENT_STREAM_HEARTBEAT=1)
+    async def test_stream_view(self):
+        url = reverse('user_story_events', args=[self.story.pk])
+        await self.async_client.aforce_login(self.outsider)
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+        await self.async_client.aforce_login(self.dev)
+        response = await self.async_client.get(url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertIn(b'retry:', await anext(chunks))
+        events.get_broker().publish(f'story:{self.story.pk}', {'id': 7, 'model': 'story', 'pk': self.story.pk})
+        self.assertTrue((await anext(chunks)).startswith(b'id: 7\nevent: change\ndata: {'))
+
+
+class AsyncViewTests(ProjectsTestMixin, TestCase):
+    """Las versiones asíncronas muestran lo mismo que las síncronas."""
+
+    # (vista síncrona, vista asíncrona, objetos de la URL, listas del contexto)
+    PAGES = [
+        ('dashboard', 'dashboard_async', [], ['user_projects', 'assigned_stories', 'assigned_tasks']),
+        ('project_detail', 'project_detail_async', ['project'], ['team_members', 'sprints', 'user_stories']),
+        ('user_story_detail', 'user_story_detail_async', ['story'], ['tasks', 'comments']),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.create(user_story=self.story, title='Tarea asíncrona', assigned_to=self.dev)
+        Comment.objects.create(user_story=self.story, author=self.dev, content='Comentario asíncrono')
+
+    async def test_same_context_as_sync_views(self):
+        await self.async_client.aforce_login(self.dev)
+        for sync_name, async_name, keys, lists in self.PAGES:
+            args = [getattr(self, key).pk for key in keys]
+            with self.subTest(view=async_name):
+                await cache.aclear()
+                expected = await self.async_client.get(reverse(sync_name, args=args))
+                await cache.aclear()
+                response = await self.async_client.get(reverse(async_name, args=args))
+                self.assertEqual(response.status_code, 200)
+                self.assertTemplateUsed(response, expected.templates[0].name)
+                for name in lists:
+                    self.assertEqual(list(response.context[name]), list(expected.context[name]))
+                    self.assertTrue(response.context[name])
+
+    async def test_conditional_get_access_and_comments(self):
+        await self.async_client.aforce_login(self.dev)
+        url = reverse('user_story_detail_async', args=[self.story.pk])
+        await self.async_client.get(reverse('dashboard_async'))
+        response = await self.async_client.get(url)
+        cached = await self.async_client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+        response = await self.async_client.post(url, {'content': 'Desde ASGI'})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertTrue(await Comment.objects.filter(content='Desde ASGI', author=self.dev).aexists())
+
+        await self.async_client.aforce_login(self.outsider)
+        response = await self.async_client.get(reverse('project_detail_async', args=[self.project.pk]))
+        self.assertRedirects(response, reverse('project_list'), fetch_redirect_response=False)
+
+
+FLAKY_CALLS = []
+
+
+@jobs.register('test_flaky')
+def flaky_job(failures):
+    """Trabajo de prueba: falla las primeras `failures` veces."""
+    FLAKY_CALLS.append(failures)
+    if len(FLAKY_CALLS) <= failures:
+        raise RuntimeError('falla de prueba')
+    return {'calls': len(FLAKY_CALLS)}
+
+
+class JobQueueTests(ProjectsTestMixin, TestCase):
+    """La cola respeta prioridades, reintenta y el worker ejecuta trabajos."""
+
+    def setUp(self):
+        super().setUp()
+        FLAKY_CALLS.clear()
+
+    def test_claim_by_priority_without_duplicates(self):
+        low = jobs.enqueue('rebuild_counters')
+        high = jobs.enqueue('rebuild_counters', priority=10)
+        jobs.enqueue('rebuild_counters', priority=20, run_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual(jobs.claim('a'), [high])
+        self.assertEqual(jobs.claim('b', limit=5), [low])
+        self.assertEqual(jobs.claim('c', limit=5), [])
+        low.refresh_from_db()
+        self.assertEqual((low.status, low.attempts), ('RUNNING', 1))
+        with self.assertRaises(jobs.UnknownJob):
+            jobs.enqueue('no_existe')
+
+    def test_retries_with_backoff_then_fails(self):
+        job = jobs.enqueue('test_flaky', failures=1)
+        [claimed] = jobs.claim('w')
+        self.assertFalse(jobs.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'QUEUED')
+        self.assertIn('falla de prueba', job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.assertTrue(jobs.run(jobs.claim('w')[0]))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), ('DONE', {'calls': 2}))
+
+        doomed = jobs.enqueue('test_flaky', failures=5, max_attempts=1)
+        self.assertFalse(jobs.run(jobs.claim('w')[0]))
+        doomed.refresh_from_db()
+        self.assertEqual(doomed.status, 'FAILED')
+
+    def test_requeue_stale_jobs(self):
+        job = jobs.enqueue('rebuild_counters')
+        jobs.claim('w')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.requeue_stale(timeout=3600), 1)
+        self.assertEqual(jobs.claim('w'), [job])
+
+    def test_heartbeat_keeps_running_job_locked(self):
+        job = jobs.enqueue('rebuild_counters')
+        [claimed] = jobs.claim('w')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.heartbeat(claimed), 1)
+        self.assertEqual(jobs.requeue_stale(timeout=3600), 0)
+
+    def test_requeued_job_ignores_result_of_previous_worker(self):
+        job = jobs.enqueue('test_flaky', failures=0)
+        [first] = jobs.claim('a')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.requeue_stale(timeout=3600), 1)
+        # El mismo worker vuelve a tomarlo: cada toma lleva su propio token
+        [second] = jobs.claim('a')
+        self.assertNotEqual(second.locked_by, first.locked_by)
+
+        self.assertEqual(jobs.heartbeat(first), 0)
+        jobs.run(first)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ('RUNNING', second.locked_by))
+        self.assertTrue(jobs.run(second))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01, JOB_LOCK_TIMEOUT=60)
+    def test_running_worker_requeues_jobs_of_a_dead_worker(self):
+        orphan = jobs.enqueue('rebuild_counters')
+        jobs.claim('muerto')
+        jobs.enqueue('test_flaky', failures=0)
+
+        def expire_orphan(**kwargs):
+            # Mientras este worker trabaja, el latido del otro vence
+            Job.objects.filter(pk=orphan.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+            time.sleep(0.02)
+            return flaky_job(**kwargs)
+
+        out = StringIO()
+        with mock.patch.object(jobs, 'heartbeat'), mock.patch.dict(jobs._registry, test_flaky=expire_orphan):
+            call_command('runworker', '--once', '--processes', '0', stdout=out)
+        orphan.refresh_from_db()
+        self.assertEqual((orphan.status, orphan.attempts), ('DONE', 2))
+        self.assertIn('1 trabajos abandonados devueltos a la cola', out.getvalue())
+
+    @override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+    def test_run_beats_while_the_job_runs(self):
+        jobs.enqueue('test_flaky', failures=0)
+        [claimed] = jobs.claim('w')
+        with mock.patch.object(jobs, 'heartbeat') as beat, mock.patch.dict(
+            jobs._registry, test_flaky=lambda **kwargs: time.sleep(0.1) or flaky_job(**kwargs),
+        ):
+            self.assertTrue(jobs.run(claimed))
+        self.assertGreater(beat.call_count, 0)
+        beat.assert_called_with(claimed)
+
+    def test_runworker_runs_background_export(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(JOB_OUTPUT_DIR=directory):
+            call_command('export_backlog', self.project.pk, '--background', stderr=StringIO())
+            job = Job.objects.get()
+            self.assertEqual((job.name, job.status), ('export_backlog', 'QUEUED'))
+            call_command('runworker', '--once', '--processes', '0', stdout=StringIO())
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'DONE')
+            with open(job.result['path'], encoding='utf-8') as exported:
+                self.assertIn(self.story.title, exported.read())
+
+
+class BulkEditTests(ProjectsTestMixin, TestCase):
+    """La edición en bloque aplica un UPDATE validado y mantiene los derivados."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.dev)
+        self.other = Project.objects.create(
+            name='Otro', description='Otro', start_date=date(2024, 1, 1),
+            product_owner=self.outsider, scrum_master=self.outsider,
+        )
+        self.foreign_story = self.make_story(project=self.other, sprint=None, assigned_to=None)
+
+    def post_stories(self, stories, **data):
+        url = reverse('user_story_bulk_update', args=[self.project.pk])
+        return self.client.post(url, {'stories': [story.pk for story in stories], **data})
+
+    def test_moves_and_updates_stories_keeping_counters(self):
+        second = self.make_story(title='Segunda', sprint=None)
+        Task.objects.create(user_story=self.story, title='Tarea', status='DONE')
+
+        response = self.post_stories(
+            [self.story, second, self.foreign_story], sprint=self.sprint.pk, status='DONE', priority='HIGH',
+        )
+        self.assertRedirects(response, reverse('user_story_list', args=[self.project.pk]))
+        self.assertEqual(
+            set(UserStory.objects.filter(project=self.project).values_list('sprint', 'status', 'priority')),
+            {(self.sprint.pk, 'DONE', 'HIGH')},
+        )
+        self.foreign_story.refresh_from_db()
+        self.assertEqual(self.foreign_story.status, 'BACKLOG')
+        self.assertEqual(rebuild(verify_only=True), [])
+        self.assertTrue(SprintSnapshot.objects.filter(sprint=self.sprint, story_done_count=2).exists())
+
+        self.post_stories([self.story, second], sprint='none', assigned_to='none', story_points=5)
+        self.assertEqual(
+            set(UserStory.objects.filter(project=self.project).values_list('sprint', 'assigned_to', 'story_points')),
+            {(None, None, 5)},
+        )
+        self.assertEqual(rebuild(verify_only=True), [])
+
+    def test_query_count_does_not_grow_with_selection(self):
+        def count(stories):
+            with CaptureQueriesContext(connection) as ctx:
+                self.post_stories(stories, status='IN_PROGRESS', priority='LOW')
+            return len(ctx.captured_queries)
+
+        few = [self.make_story(title=f'Pocas {i}') for i in range(2)]
+        many = [self.make_story(title=f'Muchas {i}') for i in range(12)]
+        # La primera petición resuelve el acceso del usuario
+        count([self.story])
+        self.assertEqual(count(few), count(many))
+
+    def test_rejects_invalid_changes(self):
+        foreign_sprint = Sprint.objects.create(
+            project=self.other, name='Ajeno', goal='', number=1,
+            start_date=date(2024, 1, 1), end_date=date(2024, 1, 14),
+        )
+        stories = UserStory.objects.filter(pk=self.story.pk)
+        for changes in ({'sprint_id': foreign_sprint.pk}, {'assigned_to_id': self.outsider.pk},
+                        {'story_points': 500}, {'status': 'NOPE'}, {'title': 'x'}):
+            with self.subTest(changes=changes), self.assertRaises(ValidationError):
+                bulk.update_stories(stories, **changes)
+
+        response = self.post_stories([self.story], sprint=foreign_sprint.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.sprint_id, self.sprint.pk)
+
+    def test_requires_project_access(self):
+        self.client.force_login(self.outsider)
+        response = self.post_stories([self.story], status='DONE')
+        self.assertRedirects(response, reverse('project_list'))
+        self.story.refresh_from_db()
+        self.assertNotEqual(self.story.status, 'DONE')
+
+    def test_get_lists_selection(self):
+        url = reverse('user_story_bulk_update', args=[self.project.pk])
+        response = self.client.get(url, {'stories': [self.story.pk, self.foreign_story.pk]})
+        self.assertEqual(response.context['selected'], [self.story])
+
+    def test_updates_tasks(self):
+        tasks = [Task.objects.create(user_story=self.story, title=f'Tarea {i}') for i in range(3)]
+        url = reverse('task_bulk_update', args=[self.project.pk])
+        next_url = reverse('user_story_detail', args=[self.story.pk])
+        response = self.client.post(url, {
+            'tasks': [task.pk for task in tasks], 'status': 'DONE', 'assigned_to': self.dev.pk,
+            'estimated_hours': '1.5', 'next': next_url,
+        })
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        self.assertEqual(
+            set(Task.objects.values_list('status', 'assigned_to', 'estimated_hours')),
+            {('DONE', self.dev.pk, Decimal('1.5'))},
+        )
+        self.assertEqual(rebuild(verify_only=True), [])
+        self.sprint.refresh_from_db()
+        self.assertEqual(self.sprint.task_done_count, 3)
+
+    def test_admin_actions(self):
+        admin_user = User.objects.create_superuser('admin', password='demo1234')
+        self.client.force_login(admin_user)
+        url = reverse('admin:projects_userstory_changelist')
+        self.client.post(url, {
+            'action': 'move_to_sprint', 'value': '', '_selected_action': [self.story.pk],
+        })
+        self.story.refresh_from_db()
+        self.assertIsNone(self.story.sprint_id)
+
+        response = self.client.post(url, {
+            'action': 'reassign', 'value': 'outsider', '_selected_action': [self.story.pk],
+        }, follow=True)
+        self.assertContains(response, 'no es miembro del equipo')
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.assigned_to, self.dev)
+        self.assertEqual(rebuild(verify_only=True), [])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Perfil de producción de SQLite')
+class SQLiteProfileTests(ProjectsTestMixin, TestCase):
+    """Perfil de producción de SQLite: pragmas, reintentos y escrituras serializadas."""
+
+    def test_production_options_apply_pragmas(self):
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'production.sqlite3'),
+                'OPTIONS': settings.SQLITE_PRODUCTION_OPTIONS,
+            })
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {}
+                    for name in ('journal_mode', 'busy_timeout', 'synchronous', 'temp_store'):
+                        cursor.execute(f'PRAGMA {name}')
+                        values[name] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+        self.assertEqual(values, {
+            'journal_mode': 'wal', 'busy_timeout': settings.SQLITE_BUSY_TIMEOUT_MS, 'synchronous': 1, 'temp_store': 2,
+        })
+        self.assertEqual(wrapper.transaction_mode, 'IMMEDIATE')
+
+    def test_retry_on_busy(self):
+        calls = []
+
+        def flaky(failures, error='database is locked'):
+            calls.append(1)
+            if len(calls) <= failures:
+                raise OperationalError(error)
+            return 'ok'
+
+        self.assertEqual(sqlite.retry_on_busy(flaky, 2, attempts=3, backoff=0), 'ok')
+        self.assertEqual(len(calls), 3)
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            sqlite.retry_on_busy(flaky, 5, attempts=2, backoff=0)
+        self.assertEqual(len(calls), 3)
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            sqlite.retry_on_busy(flaky, 1, error='no such table', attempts=3, backoff=0)
+        self.assertEqual(len(calls), 1)
+
+    def test_middleware_serializes_unsafe_requests(self):
+        with override_settings(SQLITE_SERIALIZE_WRITES=False), self.assertRaises(MiddlewareNotUsed):
+            SQLiteWriteSerializationMiddleware(lambda request: None)
+
+        def lock_is_held(request):
+            # Otro hilo no puede tomar el lock mientras se atiende la escritura
+            result = []
+
+            def try_lock():
+                result.append(sqlite.write_lock.acquire(blocking=False))
+                if result[0]:
+                    sqlite.write_lock.release()
+
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return HttpResponse(str(not result[0]))
+
+        with override_settings(SQLITE_SERIALIZE_WRITES=True):
+            middleware = SQLiteWriteSerializationMiddleware(lambda request: None)
+        factory = RequestFactory()
+        self.assertEqual(middleware.process_view(factory.post('/'), lock_is_held, (), {}).content, b'True')
+        self.assertIsNone(middleware.process_view(factory.get('/'), lock_is_held, (), {}))
+
+
+BUSY_VIEW_CALLS = []
+
+
+def busy_write_view(request, failures):
+    """Escribe un Job y falla con "database is locked" las primeras `failures` veces."""
+    BUSY_VIEW_CALLS.append(request.method)
+    jobs.enqueue('rebuild_counters')
+    if len(BUSY_VIEW_CALLS) <= failures:
+        raise OperationalError('database is locked')
+    return HttpResponse('ok')
+
+
+class BusyWriteURLConf:
+    urlpatterns = [path('busy/<int:failures>/', busy_write_view)]
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Escrituras serializadas de SQLite')
+@override_settings(
+    ROOT_URLCONF=BusyWriteURLConf, SQLITE_SERIALIZE_WRITES=True, SQLITE_BUSY_RETRIES=2, SQLITE_BUSY_BACKOFF=0,
+)
+class SQLiteWriteSerializationTests(TransactionTestCase):
+    """Con la cadena completa de middlewares, un busy deshace la vista y la reintenta."""
+
+    def setUp(self):
+        BUSY_VIEW_CALLS.clear()
+
+    def test_busy_view_is_rolled_back_and_retried(self):
+        response = self.client.post('/busy/1/')
+        self.assertEqual((response.status_code, response.content), (200, b'ok'))
+        self.assertEqual(BUSY_VIEW_CALLS, ['POST', 'POST'])
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_exhausted_retries_roll_back_every_attempt(self):
+        self.client.raise_request_exception = False
+        self.assertEqual(self.client.post('/busy/9/').status_code, 500)
+        self.assertEqual(len(BUSY_VIEW_CALLS), 3)
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_safe_requests_are_not_wrapped(self):
+        self.client.raise_request_exception = False
+        self.assertEqual(self.client.get('/busy/1/').status_code, 500)
+        self.assertEqual(BUSY_VIEW_CALLS, ['GET'])
+        self.assertEqual(Job.objects.count(), 1)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Benchmark de concurrencia de SQLite')
+class SQLiteConcurrencyBenchmarkTests(ProjectsTestMixin, TransactionTestCase):
+    """El benchmark copia la base con la API de backup: los datos deben estar confirmados."""
+
+    def setUp(self):
+        super().setUp()
+        self.setUpTestData()
+
+    def test_concurrency_benchmark(self):
+        results = benchmarks.run_sqlite_concurrency(readers=2, writers=1, seconds=0.2)
+        self.assertEqual(set(results), set(benchmarks.SQLITE_PROFILES))
+        self.assertGreater(results['production']['reads_per_second'], 0)
+        self.assertGreater(results['production']['writes_per_second'], 0)
+        self.assertEqual(results['production']['busy_errors'], 0)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRoutingTests(SimpleTestCase):
+    """Lecturas de páginas GET a la réplica; escrituras y lo recién escrito a la primaria."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_router_reads_from_replica_only_when_enabled(self):
+        self.assertEqual(self.router.db_for_read(Project), 'default')
+        with routers.use_replica():
+            self.assertEqual(self.router.db_for_read(Project), 'replica1')
+            self.assertEqual(self.router.db_for_read(User), 'default')
+            self.assertEqual(self.router.db_for_write(Project), 'default')
+            with routers.use_primary():
+                self.assertEqual(self.router.db_for_read(Project), 'default')
+            with mock.patch.object(connections['default'], 'in_atomic_block', True):
+                self.assertEqual(self.router.db_for_read(Project), 'default')
+        self.assertFalse(self.router.allow_migrate('replica1', 'projects'))
+        self.assertTrue(self.router.allow_migrate('default', 'projects'))
+
+    def test_middleware_pins_reads_after_a_write(self):
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse(router.db_for_read(Project)))
+        factory = RequestFactory()
+        self.assertEqual(middleware(factory.get('/')).content, b'replica1')
+
+        response = middleware(factory.post('/'))
+        self.assertEqual(response.content, b'default')
+        pin = response.cookies[routers.PIN_COOKIE]
+        self.assertEqual(pin['max-age'], settings.READ_YOUR_WRITES_SECONDS)
+
+        factory.cookies[routers.PIN_COOKIE] = pin.value
+        self.assertEqual(middleware(factory.get('/')).content, b'default')
+        factory.cookies[routers.PIN_COOKIE] = 'falsificada'
+        self.assertEqual(middleware(factory.get('/')).content, b'replica1')
+        with override_settings(READ_YOUR_WRITES_SECONDS=0):
+            factory.cookies[routers.PIN_COOKIE] = pin.value
+            time.sleep(1)
+            self.assertEqual(middleware(factory.get('/')).content, b'replica1')
+
+    def test_middleware_disabled_without_replicas(self):
+        with override_settings(DATABASE_REPLICAS=[]), self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: None)
+
+
+class PostgreSQLTests(ProjectsTestMixin, TestCase):
+    """Lecturas en streaming e índices parciales (los planes se verifican en PostgreSQL)."""
+
+    def test_streaming_reads_opens_transaction_only_with_server_side_cursors(self):
+        depth = len(connection.savepoint_ids)
+        with postgres.streaming_reads():
+            inner = len(connection.savepoint_ids)
+        self.assertEqual(inner - depth, int(postgres.uses_server_side_cursors()))
+        self.assertEqual(postgres.uses_server_side_cursors(), connection.vendor == 'postgresql')
+
+    @skipUnless(connection.vendor == 'postgresql', 'Pool de conexiones de PostgreSQL')
+    def test_pool_disables_persistent_connections(self):
+        if 'pool' in connection.settings_dict['OPTIONS']:
+            self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Los planes EXPLAIN verificados son de PostgreSQL')
+    def test_hot_queries_use_partial_indexes(self):
+        with connection.cursor() as cursor:
+            # Con pocas filas el planificador prefiere recorrer la tabla
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        cases = [
+            (queries.sprint_stories(self.sprint), 'story_sprint_order_idx'),
+            (queries.assigned_stories(self.dev), 'story_assignee_order_idx'),
+            (queries.assigned_tasks(self.dev), 'task_assignee_status_idx'),
+        ]
+        for queryset, index_name in cases:
+            with self.subTest(index=index_name):
+                self.assertIn(index_name, queryset.explain())
+
+
+class StaticPipelineTests(SimpleTestCase):
+    """collectstatic arma el paquete CSS con hash y sus variantes; el middleware las sirve."""
+
+    PIPELINE_STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'projects.staticfiles.CompressedManifestStaticFilesStorage'},
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        pipeline = override_settings(STATIC_PIPELINE=True, STATIC_ROOT=directory.name, STORAGES=self.PIPELINE_STORAGES)
+        pipeline.enable()
+        self.addCleanup(pipeline.disable)
+        self.root = directory.name
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_minify_css(self):
+        source = '/* comentario */\na :hover ,  b > i {\n  content: "a ,  b" ;\n  color : red;\n}\n'
+        self.assertEqual(staticfiles.minify_css(source), 'a :hover,b>i{content:"a ,  b";color :red}')
+
+    def test_collectstatic_writes_hashed_bundle_and_variants(self):
+        bundle = staticfiles.staticfiles_storage.stored_name('css/base.min.css')
+        self.assertRegex(bundle, r'^css/base\.min\.[0-9a-f]{12}\.css$')
+        with open(os.path.join(self.root, bundle), 'rb') as fh:
+            content = fh.read()
+        with open(os.path.join(settings.BASE_DIR, 'static', 'css', 'custom.css')) as fh:
+            self.assertEqual(content.decode(), staticfiles.minify_css(fh.read()))
+        with open(os.path.join(self.root, bundle + '.gz'), 'rb') as fh:
+            self.assertEqual(gzip.decompress(fh.read()), content)
+        self.assertEqual(os.path.exists(os.path.join(self.root, bundle + '.br')), staticfiles.brotli is not None)
+
+        html = Template("{% load assets %}{% css_bundle 'css/base.min.css' %}").render(Context())
+        self.assertEqual(html, f'<link rel="stylesheet" href="/static/{bundle}">')
+        with self.settings(STATIC_PIPELINE=False):
+            html = Template("{% load assets %}{% css_bundle 'css/base.min.css' %}").render(Context())
+        self.assertIn('css/custom.', html)
+
+    def serve(self, middleware, path, **headers):
+        response = middleware(RequestFactory().get(path, headers=headers))
+        self.addCleanup(response.close)
+        return response
+
+    def test_middleware_serves_precompressed_variants(self):
+        middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse(status=404))
+        factory = RequestFactory()
+        bundle = staticfiles.staticfiles_storage.stored_name('css/base.min.css')
+
+        response = self.serve(middleware, f'/static/{bundle}', **{'Accept-Encoding': 'gzip, deflate'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertFalse(response.has_header('Content-Disposition'))
+        plain = self.serve(middleware, f'/static/{bundle}')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertNotEqual(plain['ETag'], response['ETag'])
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)), b''.join(plain.streaming_content),
+        )
+
+        unhashed = self.serve(middleware, '/static/css/custom.css')
+        self.assertEqual(unhashed['Cache-Control'], 'public, max-age=300')
+        self.assertEqual(middleware(factory.get('/static/../manage.py')).status_code, 404)
+        self.assertEqual(middleware(factory.get('/static/css/nada.css')).status_code, 404)
+        with override_settings(STATIC_PIPELINE=False), self.assertRaises(MiddlewareNotUsed):
+            PrecompressedStaticMiddleware(lambda request: None)
+
+    def test_middleware_revalidates_with_etag_and_last_modified(self):
+        middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse(status=404))
+        response = self.serve(middleware, '/static/css/custom.css', **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+
+        by_etag = self.serve(
+            middleware, '/static/css/custom.css', **{'Accept-Encoding': 'gzip', 'If-None-Match': response['ETag']},
+        )
+        self.assertEqual((by_etag.status_code, by_etag.content), (304, b''))
+        self.assertEqual(by_etag['ETag'], response['ETag'])
+        self.assertEqual(by_etag['Cache-Control'], 'public, max-age=300')
+        by_date = self.serve(middleware, '/static/css/custom.css', **{'If-Modified-Since': response['Last-Modified']})
+        self.assertEqual(by_date.status_code, 304)
+
+        # El ETag de la variante .gz no vale para el archivo sin comprimir
+        bundle = '/static/' + staticfiles.staticfiles_storage.stored_name('css/base.min.css')
+        gzipped = self.serve(middleware, bundle, **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(self.serve(middleware, bundle, **{'If-None-Match': gzipped['ETag']}).status_code, 200)
+        self.assertEqual(
+            self.serve(middleware, bundle, **{'Accept-Encoding': 'gzip', 'If-None-Match': gzipped['ETag']}).status_code,
+            304,
+        )
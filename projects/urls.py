@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 # URLs del modulo de proyectos
 # Mejores practicas:
@@ -11,6 +11,14 @@ urlpatterns = [
     # Dashboard
     path('', views.dashboard, name='dashboard'),
 
+    # Versiones asíncronas (ASGI) de las páginas con consultas independientes
+    path('async/', views.dashboard_async, name='dashboard_async'),
+    path('async/projects/<int:pk>/', views.project_detail_async, name='project_detail_async'),
+    path('async/stories/<int:pk>/', views.user_story_detail_async, name='user_story_detail_async'),
+
+    # Búsqueda
+    path('search/', views.search_view, name='search'),
+
     # Proyectos
     path('projects/', views.project_list, name='project_list'),
     path('projects/create/', views.project_create, name='project_create'),
@@ -21,14 +29,34 @@ urlpatterns = [
     path('projects/<int:project_pk>/sprints/', views.sprint_list, name='sprint_list'),
     path('projects/<int:project_pk>/sprints/create/', views.sprint_create, name='sprint_create'),
     path('sprints/<int:pk>/', views.sprint_detail, name='sprint_detail'),
+    path('sprints/<int:pk>/board/', views.sprint_board, name='sprint_board'),
+    path('sprints/<int:pk>/board/move/', views.sprint_board_move, name='sprint_board_move'),
+    path('sprints/<int:pk>/events/', views.sprint_events, name='sprint_events'),
 
     # User Stories
     path('projects/<int:project_pk>/stories/', views.user_story_list, name='user_story_list'),
     path('projects/<int:project_pk>/stories/create/', views.user_story_create, name='user_story_create'),
+    path('projects/<int:project_pk>/stories/export/', views.backlog_export, name='backlog_export'),
+    path('projects/<int:project_pk>/stories/import/', views.backlog_import, name='backlog_import'),
+    path('projects/<int:project_pk>/stories/bulk/', views.user_story_bulk_update, name='user_story_bulk_update'),
     path('stories/<int:pk>/', views.user_story_detail, name='user_story_detail'),
     path('stories/<int:pk>/update/', views.user_story_update, name='user_story_update'),
+    path('stories/<int:pk>/events/', views.user_story_events, name='user_story_events'),
 
     # Tasks
     path('stories/<int:user_story_pk>/tasks/create/', views.task_create, name='task_create'),
     path('tasks/<int:pk>/update/', views.task_update, name='task_update'),
+    path('projects/<int:project_pk>/tasks/bulk/', views.task_bulk_update, name='task_bulk_update'),
+
+    # API JSON de solo lectura (v1)
+    path('api/v1/projects/', api.resource_list(api.PROJECTS), name='api_project_list'),
+    path('api/v1/projects/<int:pk>/', api.resource_detail(api.PROJECTS), name='api_project_detail'),
+    path('api/v1/sprints/', api.resource_list(api.SPRINTS), name='api_sprint_list'),
+    path('api/v1/sprints/<int:pk>/', api.resource_detail(api.SPRINTS), name='api_sprint_detail'),
+    path('api/v1/stories/', api.resource_list(api.STORIES), name='api_story_list'),
+    path('api/v1/stories/<int:pk>/', api.resource_detail(api.STORIES), name='api_story_detail'),
+    path('api/v1/tasks/', api.resource_list(api.TASKS), name='api_task_list'),
+    path('api/v1/tasks/<int:pk>/', api.resource_detail(api.TASKS), name='api_task_detail'),
+    path('api/v1/comments/', api.resource_list(api.COMMENTS), name='api_comment_list'),
+    path('api/v1/comments/<int:pk>/', api.resource_detail(api.COMMENTS), name='api_comment_detail'),
 ]
@@ -1,58 +1,95 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import codecs
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
-from .models import Project, Sprint, UserStory, Task, Comment
-from .forms import ProjectForm, SprintForm, UserStoryForm, TaskForm, CommentForm
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import ValidationError
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+from .models import Project, Sprint, UserStory, Task
+from .forms import (
+    ProjectForm, SprintForm, UserStoryForm, TaskForm, CommentForm, BacklogImportForm, UserStoryBulkForm, TaskBulkForm,
+)
+from .access import get_project_access
+from .analytics import sprint_progress, project_velocity
+from .conditional import (
+    conditional_page, dashboard_state, project_list_state, project_state, sprint_state, user_story_state,
+)
+from .pagination import KeysetPaginator
+from . import board, bulk, events, exports, imports, queries, search
+
+# Filas por página en las listas paginadas por cursor
+PAGE_SIZE = 25
+
+
+def _access_denied(request, message='No tienes permiso para ver este proyecto.'):
+    """Respuesta estándar cuando el usuario no tiene acceso al proyecto."""
+    messages.error(request, message)
+    return redirect('project_list')
+
+
+def _can_view(request, project_id):
+    """Acceso de lectura; False si el objeto no existe (project_id None)."""
+    return project_id is not None and get_project_access(request).can_view(project_id)
 
 
 # ===== VISTAS DE PROYECTO =====
 
 @login_required
+@conditional_page(project_list_state)
 def project_list(request):
     """
     Lista todos los proyectos donde el usuario es miembro, product owner o scrum master.
     Mejores prácticas:
     - Uso de Q objects para queries complejas
-    - Anotaciones para información agregada
+    - Contadores desnormalizados en lugar de agregar en cada petición
+    - Plan de consultas declarado en queries.py (sin N+1)
+    - Paginación por cursor de costo constante
+    - Acceso resuelto una vez por petición (access.py)
+    - GET condicional: 304 sin renderizar si nada cambió (conditional.py)
     - Decorador login_required
     """
-    projects = Project.objects.filter(
-        Q(team_members=request.user) |
-        Q(product_owner=request.user) |
-        Q(scrum_master=request.user)
-    ).distinct().annotate(
-        story_count=Count('user_stories', distinct=True),
-        sprint_count=Count('sprints', distinct=True)
-    )
+    access = get_project_access(request)
+    page = KeysetPaginator(queries.project_list_queryset(access.project_ids), PAGE_SIZE).get_page(request.GET)
 
     context = {
-        'projects': projects,
+        'projects': page.object_list,
+        'page': page,
     }
     return render(request, 'projects/project_list.html', context)
 
 
 @login_required
+@conditional_page(project_state)
 def project_detail(request, pk):
     """
     Muestra el detalle de un proyecto específico.
     """
-    project = get_object_or_404(Project, pk=pk)
-
     # Verificar que el usuario tenga acceso al proyecto
-    if not (request.user in project.team_members.all() or
-            request.user == project.product_owner or
-            request.user == project.scrum_master):
-        messages.error(request, 'No tienes permiso para ver este proyecto.')
-        return redirect('project_list')
+    if not get_project_access(request).can_view(pk):
+        return _access_denied(request)
+
+    project = get_object_or_404(queries.project_detail_queryset(), pk=pk)
 
-    sprints = project.sprints.all()[:5]
-    user_stories = project.user_stories.all()[:10]
+    sprints = queries.project_recent_sprints(project)
+    user_stories = queries.project_recent_stories(project)
 
+    # Querysets y analítica perezosos: sólo se consultan si el fragmento
+    # correspondiente no está en caché
     context = {
         'project': project,
+        'team_members': queries.project_team_members(project),
         'sprints': sprints,
         'user_stories': user_stories,
+        'velocity': SimpleLazyObject(lambda: project_velocity(project)),
     }
     return render(request, 'projects/project_detail.html', context)
 
@@ -88,9 +125,12 @@ def project_update(request, pk):
     Actualiza un proyecto existente.
     """
     project = get_object_or_404(Project, pk=pk)
+    access = get_project_access(request)
 
     # Solo el product owner o scrum master pueden editar
-    if request.user != project.product_owner and request.user != project.scrum_master:
+    if not access.can_manage(pk):
+        if not access.can_view(pk):
+            return _access_denied(request)
         messages.error(request, 'No tienes permiso para editar este proyecto.')
         return redirect('project_detail', pk=pk)
 
@@ -114,41 +154,108 @@ def project_update(request, pk):
 # ===== VISTAS DE SPRINT =====
 
 @login_required
+@conditional_page(project_state)
 def sprint_list(request, project_pk):
     """
     Lista todos los sprints de un proyecto.
     """
     project = get_object_or_404(Project, pk=project_pk)
-    sprints = project.sprints.all()
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
+    page = KeysetPaginator(queries.sprint_list_queryset(project), PAGE_SIZE).get_page(request.GET)
 
     context = {
         'project': project,
-        'sprints': sprints,
+        'sprints': page.object_list,
+        'page': page,
     }
     return render(request, 'projects/sprint_list.html', context)
 
 
 @login_required
+@conditional_page(sprint_state)
 def sprint_detail(request, pk):
     """
     Muestra el detalle de un sprint específico.
     """
-    sprint = get_object_or_404(Sprint, pk=pk)
-    user_stories = sprint.user_stories.all()
+    sprint = get_object_or_404(queries.sprint_detail_queryset(), pk=pk)
+    if not get_project_access(request).can_view(sprint.project_id):
+        return _access_denied(request)
+    user_stories = queries.sprint_stories(sprint)
 
     context = {
         'sprint': sprint,
         'user_stories': user_stories,
+        'progress': SimpleLazyObject(lambda: sprint_progress(sprint)),
     }
     return render(request, 'projects/sprint_detail.html', context)
 
 
+@login_required
+@conditional_page(sprint_state)
+def sprint_board(request, pk):
+    """
+    Tablero Kanban del sprint: una columna por estado de historia.
+    Mejores prácticas:
+    - Plan fijo de consultas: historias y tareas en dos consultas (board.py)
+    - Columnas armadas en una sola pasada
+    - GET condicional como el detalle del sprint
+    """
+    sprint = get_object_or_404(queries.sprint_detail_queryset(), pk=pk)
+    if not get_project_access(request).can_view(sprint.project_id):
+        return _access_denied(request)
+
+    context = {
+        'sprint': sprint,
+        'columns': board.load_board(sprint),
+    }
+    return render(request, 'projects/sprint_board.html', context)
+
+
+@login_required
+@require_POST
+def sprint_board_move(request, pk):
+    """
+    Mueve una historia del tablero a otro estado (arrastrar y soltar).
+    Responde JSON con el HTML de las columnas de origen y destino, las únicas
+    que cambian.
+    """
+    sprint = get_object_or_404(Sprint, pk=pk)
+    if not get_project_access(request).can_view(sprint.project_id):
+        return JsonResponse({'error': 'No tienes permiso para ver este proyecto.'}, status=403)
+
+    story_pk = request.POST.get('story', '')
+    status = request.POST.get('status')
+    if not story_pk.isdigit() or status not in dict(UserStory.STATUS_CHOICES):
+        return JsonResponse({'error': 'Historia o estado inválido.'}, status=400)
+    story = get_object_or_404(UserStory, pk=story_pk, sprint=sprint)
+
+    previous = story.status
+    if status != previous:
+        story.status = status
+        story.save(update_fields=['status', 'updated_at'])
+
+    columns = board.load_board(sprint, statuses={previous, status})
+    return JsonResponse({
+        'story': story.pk,
+        'status': status,
+        'columns': {
+            column.status: render_to_string(
+                'projects/_board_column.html', {'column': column, 'sprint': sprint}, request
+            )
+            for column in columns
+        },
+    })
+
+
 @login_required
 def sprint_create(request, project_pk):
     """
     Crea un nuevo sprint para un proyecto.
     """
     project = get_object_or_404(Project, pk=project_pk)
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
 
     if request.method == 'POST':
         form = SprintForm(request.POST, project=project)
@@ -172,12 +279,15 @@ def sprint_create(request, project_pk):
 # ===== VISTAS DE USER STORY =====
 
 @login_required
+@conditional_page(project_state)
 def user_story_list(request, project_pk):
     """
     Lista todas las historias de usuario de un proyecto.
     """
     project = get_object_or_404(Project, pk=project_pk)
-    user_stories = project.user_stories.all()
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
+    user_stories = queries.user_story_list_queryset(project)
 
     # Filtros opcionales
     status = request.GET.get('status')
@@ -188,21 +298,93 @@ def user_story_list(request, project_pk):
     if priority:
         user_stories = user_stories.filter(priority=priority)
 
+    page = KeysetPaginator(user_stories, PAGE_SIZE).get_page(request.GET)
+
     context = {
         'project': project,
-        'user_stories': user_stories,
+        'user_stories': page.object_list,
+        'page': page,
     }
     return render(request, 'projects/user_story_list.html', context)
 
 
 @login_required
+def backlog_export(request, project_pk):
+    """
+    Descarga el backlog completo del proyecto en CSV o NDJSON (?format=).
+    Mejores prácticas:
+    - StreamingHttpResponse: memoria constante sin importar el tamaño
+    - Lectura por lotes con iterator(chunk_size) (exports.py)
+    """
+    project = get_object_or_404(Project, pk=project_pk)
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.FORMATS:
+        return HttpResponseBadRequest('Formato no soportado.')
+
+    content_type, _ = exports.FORMATS[export_format]
+    response = StreamingHttpResponse(exports.export_backlog(project, export_format), content_type=content_type)
+    filename = f'backlog-{project.pk}-{timezone.localdate():%Y%m%d}.{export_format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+def backlog_import(request, project_pk):
+    """
+    Importa historias, tareas y comentarios desde un archivo CSV o NDJSON.
+    Mejores prácticas:
+    - El archivo se procesa en streaming y por lotes (imports.py)
+    - Validación con las reglas de los forms existentes
+    - Contadores, snapshots e índice se recalculan en la cola (runworker)
+    - Reporte de filas por segundo y errores por fila
+    """
+    project = get_object_or_404(Project, pk=project_pk)
+    access = get_project_access(request)
+    if not access.can_manage(project.pk):
+        if not access.can_view(project.pk):
+            return _access_denied(request)
+        messages.error(request, 'Sólo el Product Owner o el Scrum Master pueden importar historias.')
+        return redirect('user_story_list', project_pk=project.pk)
+
+    report = None
+    if request.method == 'POST':
+        form = BacklogImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = codecs.iterdecode(form.cleaned_data['file'], 'utf-8-sig')
+            records = imports.PARSERS[form.cleaned_data['format']](lines)
+            importer = imports.BacklogImporter(
+                project, request.user, dry_run=form.cleaned_data['dry_run'], background=True,
+            )
+            try:
+                report = importer.run(records)
+            except UnicodeDecodeError:
+                form.add_error('file', 'El archivo debe estar codificado en UTF-8.')
+                # Los lotes anteriores al error ya se importaron
+                report = importer.report if sum(importer.report.created.values()) else None
+    else:
+        form = BacklogImportForm()
+
+    context = {
+        'form': form,
+        'project': project,
+        'report': report,
+    }
+    return render(request, 'projects/backlog_import.html', context)
+
+
+@login_required
+@conditional_page(user_story_state)
 def user_story_detail(request, pk):
     """
     Muestra el detalle de una historia de usuario.
     """
-    user_story = get_object_or_404(UserStory, pk=pk)
-    tasks = user_story.tasks.all()
-    comments = user_story.comments.all()
+    user_story = get_object_or_404(queries.user_story_detail_queryset(), pk=pk)
+    if not get_project_access(request).can_view(user_story.project_id):
+        return _access_denied(request)
+    tasks = queries.story_tasks(user_story)
+    comments = queries.story_comments(user_story)
 
     if request.method == 'POST':
         comment_form = CommentForm(request.POST)
@@ -231,6 +413,8 @@ def user_story_create(request, project_pk):
     Crea una nueva historia de usuario.
     """
     project = get_object_or_404(Project, pk=project_pk)
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
 
     if request.method == 'POST':
         form = UserStoryForm(request.POST, project=project)
@@ -257,7 +441,9 @@ def user_story_update(request, pk):
     """
     Actualiza una historia de usuario existente.
     """
-    user_story = get_object_or_404(UserStory, pk=pk)
+    user_story = get_object_or_404(UserStory.objects.select_related('project'), pk=pk)
+    if not get_project_access(request).can_view(user_story.project_id):
+        return _access_denied(request)
 
     if request.method == 'POST':
         form = UserStoryForm(request.POST, instance=user_story, project=user_story.project)
@@ -283,7 +469,9 @@ def task_create(request, user_story_pk):
     """
     Crea una nueva tarea para una historia de usuario.
     """
-    user_story = get_object_or_404(UserStory, pk=user_story_pk)
+    user_story = get_object_or_404(UserStory.objects.select_related('project'), pk=user_story_pk)
+    if not get_project_access(request).can_view(user_story.project_id):
+        return _access_denied(request)
 
     if request.method == 'POST':
         form = TaskForm(request.POST, user_story=user_story)
@@ -309,7 +497,9 @@ def task_update(request, pk):
     """
     Actualiza una tarea existente.
     """
-    task = get_object_or_404(Task, pk=pk)
+    task = get_object_or_404(Task.objects.select_related('user_story__project'), pk=pk)
+    if not get_project_access(request).can_view(task.user_story.project_id):
+        return _access_denied(request)
 
     if request.method == 'POST':
         form = TaskForm(request.POST, instance=task, user_story=task.user_story)
@@ -328,21 +518,101 @@ def task_update(request, pk):
     return render(request, 'projects/task_form.html', context)
 
 
+# ===== EDICIÓN EN BLOQUE =====
+
+def _selected_ids(request, name):
+    """Ids marcados en la lista (GET) o reenviados por el formulario (POST)."""
+    data = request.POST if request.method == 'POST' else request.GET
+    return [pk for pk in data.getlist(name) if pk.isdigit()]
+
+
+def _bulk_update(request, project, objects, form_class, update, title, default_url):
+    """
+    Muestra el formulario de cambios para los objetos seleccionados y, en el
+    POST, los aplica con un único UPDATE (bulk.py). `objects` ya viene
+    filtrado por proyecto: el permiso se verifica una vez para todo el lote.
+    """
+    next_url = request.POST.get('next') or request.GET.get('next')
+    if not url_has_allowed_host_and_scheme(next_url, {request.get_host()}, request.is_secure()):
+        next_url = default_url
+
+    if request.method == 'POST':
+        form = form_class(request.POST, project=project)
+        if form.is_valid():
+            try:
+                count = update(objects, **form.changes())
+            except ValidationError as exc:
+                form.add_error(None, exc)
+            else:
+                messages.success(request, f'{count} elementos actualizados.')
+                return redirect(next_url)
+    else:
+        form = form_class(project=project)
+
+    selected = list(objects.only('pk', 'title'))
+    if not selected:
+        messages.warning(request, 'No seleccionaste ningún elemento.')
+        return redirect(next_url)
+
+    context = {
+        'form': form,
+        'project': project,
+        'selected': selected,
+        'field_name': 'stories' if form_class is UserStoryBulkForm else 'tasks',
+        'next_url': next_url,
+        'title': title,
+    }
+    return render(request, 'projects/bulk_update.html', context)
+
+
+@login_required
+def user_story_bulk_update(request, project_pk):
+    """
+    Mueve a un sprint, cambia estado/prioridad, reasigna o reestima varias
+    historias del proyecto a la vez.
+    Mejores prácticas:
+    - Un UPDATE validado por lote en lugar de un formulario por historia
+    - Permiso verificado una vez por proyecto
+    - Opciones de sprint y equipo cargadas una sola vez
+    """
+    project = get_object_or_404(Project, pk=project_pk)
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
+
+    stories = UserStory.objects.filter(project=project, pk__in=_selected_ids(request, 'stories'))
+    return _bulk_update(
+        request, project, stories, UserStoryBulkForm, bulk.update_stories,
+        'Editar historias en bloque', reverse('user_story_list', args=[project.pk]),
+    )
+
+
+@login_required
+def task_bulk_update(request, project_pk):
+    """
+    Cambia estado, reasigna o reestima varias tareas del proyecto a la vez.
+    """
+    project = get_object_or_404(Project, pk=project_pk)
+    if not get_project_access(request).can_view(project.pk):
+        return _access_denied(request)
+
+    tasks = Task.objects.filter(user_story__project=project, pk__in=_selected_ids(request, 'tasks'))
+    return _bulk_update(
+        request, project, tasks, TaskBulkForm, bulk.update_tasks,
+        'Editar tareas en bloque', reverse('project_detail', args=[project.pk]),
+    )
+
+
 # ===== VISTAS ADICIONALES =====
 
 @login_required
+@conditional_page(dashboard_state)
 def dashboard(request):
     """
     Dashboard principal con resumen de proyectos y tareas del usuario.
     """
-    user_projects = Project.objects.filter(
-        Q(team_members=request.user) |
-        Q(product_owner=request.user) |
-        Q(scrum_master=request.user)
-    ).distinct()[:5]
-
-    assigned_stories = UserStory.objects.filter(assigned_to=request.user)[:5]
-    assigned_tasks = Task.objects.filter(assigned_to=request.user)[:5]
+    user_projects = queries.dashboard_projects(get_project_access(request).project_ids)
+    assigned_stories = queries.assigned_stories(request.user)
+    assigned_tasks = queries.assigned_tasks(request.user)
 
     context = {
         'user_projects': user_projects,
@@ -350,3 +620,167 @@ def dashboard(request):
         'assigned_tasks': assigned_tasks,
     }
     return render(request, 'projects/dashboard.html', context)
+
+
+@login_required
+def search_view(request):
+    """
+    Búsqueda de texto completo en historias, tareas y comentarios.
+    Mejores prácticas:
+    - Índice invertido del motor (FTS5 / tsvector), sin LIKE '%término%'
+    - Resultados ordenados por relevancia
+    - Sólo proyectos a los que el usuario tiene acceso (access.py)
+    """
+    query = request.GET.get('q', '').strip()
+    results = search.search(query, get_project_access(request).project_ids) if query else []
+
+    context = {
+        'query': query,
+        'results': results,
+    }
+    return render(request, 'projects/search.html', context)
+
+
+# ===== VISTAS ASÍNCRONAS =====
+#
+# Versiones para ASGI: mientras la base responde, el event loop atiende otras
+# peticiones (streams SSE, p. ej.) en lugar de quedar bloqueado. Las
+# consultas no corren en paralelo: el ORM asíncrono ejecuta cada una con
+# sync_to_async(thread_sensitive=True), en un único hilo compartido, así que
+# se esperan de a una. La plantilla se renderiza en ese hilo con todos los
+# datos ya cargados.
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def _render(request, template_name, context):
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@login_required
+@conditional_page(dashboard_state)
+async def dashboard_async(request):
+    """
+    Dashboard (proyectos, historias y tareas asignadas) para ASGI.
+    Mejores prácticas:
+    - ORM asíncrono: la espera de la base no bloquea el event loop
+    - Mismo plan de consultas que la versión síncrona (queries.py)
+    """
+    user = await request.auser()
+    access = await sync_to_async(get_project_access)(request)
+    user_projects = await _alist(queries.dashboard_projects(access.project_ids))
+    assigned_stories = await _alist(queries.assigned_stories(user))
+    assigned_tasks = await _alist(queries.assigned_tasks(user))
+
+    context = {
+        'user_projects': user_projects,
+        'assigned_stories': assigned_stories,
+        'assigned_tasks': assigned_tasks,
+    }
+    return await _render(request, 'projects/dashboard.html', context)
+
+
+@login_required
+@conditional_page(project_state)
+async def project_detail_async(request, pk):
+    """
+    Detalle de proyecto con miembros, sprints, historias y velocidad para
+    ASGI. Las secciones que ya están en la caché de fragmentos no se
+    consultan.
+    """
+    if not await sync_to_async(_can_view)(request, pk):
+        return _access_denied(request)
+
+    project = await aget_object_or_404(queries.project_detail_queryset(), pk=pk)
+    version = [project.pk, project.cache_version]
+    members_key = make_template_fragment_key('project_members', version)
+    sections_key = make_template_fragment_key('project_sections', version)
+    cached = await cache.aget_many([members_key, sections_key])
+
+    loads = {}
+    if members_key not in cached:
+        loads['team_members'] = _alist(queries.project_team_members(project))
+    if sections_key not in cached:
+        loads['sprints'] = _alist(queries.project_recent_sprints(project))
+        loads['user_stories'] = _alist(queries.project_recent_stories(project))
+        loads['velocity'] = sync_to_async(project_velocity)(project)
+    results = [await load for load in loads.values()]
+
+    # Si un fragmento expira entre la verificación y el render, la plantilla
+    # usa los querysets perezosos de la versión síncrona (en el hilo de render)
+    context = {
+        'project': project,
+        'team_members': queries.project_team_members(project),
+        'sprints': queries.project_recent_sprints(project),
+        'user_stories': queries.project_recent_stories(project),
+        'velocity': SimpleLazyObject(lambda: project_velocity(project)),
+        **dict(zip(loads, results)),
+    }
+    return await _render(request, 'projects/project_detail.html', context)
+
+
+@login_required
+@conditional_page(user_story_state)
+async def user_story_detail_async(request, pk):
+    """Detalle de historia con tareas y comentarios para ASGI."""
+    user_story = await aget_object_or_404(queries.user_story_detail_queryset(), pk=pk)
+    if not await sync_to_async(_can_view)(request, user_story.project_id):
+        return _access_denied(request)
+
+    if request.method == 'POST':
+        comment_form = CommentForm(request.POST)
+        if comment_form.is_valid():
+            comment = comment_form.save(commit=False)
+            comment.user_story = user_story
+            comment.author = await request.auser()
+            await comment.asave()
+            messages.success(request, 'Comentario agregado.')
+            return redirect('user_story_detail_async', pk=pk)
+    else:
+        comment_form = CommentForm()
+
+    tasks = await _alist(queries.story_tasks(user_story))
+    comments = await _alist(queries.story_comments(user_story))
+
+    context = {
+        'user_story': user_story,
+        'tasks': tasks,
+        'comments': comments,
+        'comment_form': comment_form,
+    }
+    return await _render(request, 'projects/user_story_detail.html', context)
+
+
+# ===== EVENTOS EN VIVO =====
+
+def _event_stream_response(channels):
+    response = StreamingHttpResponse(events.stream(channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Evita que un proxy (nginx) acumule el stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+async def sprint_events(request, pk):
+    """
+    Stream SSE con los cambios del sprint, sus historias y tareas.
+    Mejores prácticas:
+    - Vista asíncrona: una conexión abierta no ocupa un hilo del servidor
+    - Eventos compactos publicados por señales (events.py)
+    - Acceso verificado antes de suscribirse
+    """
+    project_id = await Sprint.objects.filter(pk=pk).values_list('project_id', flat=True).afirst()
+    if not await sync_to_async(_can_view)(request, project_id):
+        return HttpResponseForbidden()
+    return _event_stream_response([events.sprint_channel(pk)])
+
+
+@login_required
+async def user_story_events(request, pk):
+    """Stream SSE con los cambios de la historia, sus tareas y comentarios."""
+    project_id = await UserStory.objects.filter(pk=pk).values_list('project_id', flat=True).afirst()
+    if not await sync_to_async(_can_view)(request, project_id):
+        return HttpResponseForbidden()
+    return _event_stream_response([events.story_channel(pk)])
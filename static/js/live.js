@@ -0,0 +1,77 @@
+/*
+ * Actualizaciones en vivo (Server-Sent Events, ver projects/events.py).
+ *
+ * Un elemento con data-live-url abre el stream y cada evento "change" se
+ * aplica sobre los elementos marcados con data-live="<modelo>-<pk>":
+ * - data-live-field="<campo>": se reemplaza el texto (status muestra
+ *   status_display y cambia la clase bg-<estado> del badge)
+ * - action "deleted": se quita el elemento (también si el evento sale del
+ *   alcance de la página, data-live-scope="<campo>:<valor>", p. ej. una
+ *   historia que pasa a otro sprint)
+ * Los objetos nuevos se agregan a data-live-list="<modelo>" con la plantilla
+ * <template data-live-template="<modelo>">; si la página no tiene dónde
+ * mostrarlos se muestra el aviso data-live-notice.
+ * Después se emite "live:change" sobre el elemento raíz para que cada página
+ * agregue su propio comportamiento.
+ */
+(function () {
+    function fill(element, event) {
+        element.querySelectorAll('[data-live-field]').forEach((field) => {
+            const name = field.dataset.liveField;
+            if (!(name in event)) {
+                return;
+            }
+            if (name === 'status') {
+                field.textContent = event.status_display;
+                field.className = field.className.replace(/\bbg-[A-Z_]+\b/, `bg-${event.status}`);
+            } else if (name === 'created_at') {
+                field.textContent = new Date(event.created_at).toLocaleString();
+            } else {
+                field.textContent = event[name] === null ? '-' : event[name];
+            }
+        });
+    }
+
+    function outOfScope(root, event) {
+        const [field, value] = (root.dataset.liveScope || '').split(':');
+        return Boolean(field) && field in event && String(event[field]) !== value;
+    }
+
+    function apply(root, event) {
+        const key = `${event.model}-${event.pk}`;
+        const elements = root.querySelectorAll(`[data-live="${key}"]`);
+        if (event.action === 'deleted' || outOfScope(root, event)) {
+            elements.forEach((element) => element.remove());
+            return true;
+        }
+        elements.forEach((element) => fill(element, event));
+        if (elements.length) {
+            return true;
+        }
+
+        const list = root.querySelector(`[data-live-list="${event.model}"]`);
+        const template = root.querySelector(`template[data-live-template="${event.model}"]`);
+        if (!list || !template) {
+            return false;
+        }
+        const element = template.content.firstElementChild.cloneNode(true);
+        element.dataset.live = key;
+        fill(element, event);
+        list.append(element);
+        return true;
+    }
+
+    document.querySelectorAll('[data-live-url]').forEach((root) => {
+        const source = new EventSource(root.dataset.liveUrl);
+        source.addEventListener('change', (message) => {
+            const event = JSON.parse(message.data);
+            if (!apply(root, event)) {
+                const notice = root.querySelector('[data-live-notice]');
+                if (notice) {
+                    notice.classList.remove('d-none');
+                }
+            }
+            root.dispatchEvent(new CustomEvent('live:change', {detail: event}));
+        });
+    });
+})();